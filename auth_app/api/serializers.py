@@ -1,9 +1,17 @@
 """Serializers for user registration and JWT-based authentication."""
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import update_last_login
 from rest_framework import serializers
 from rest_framework.exceptions import AuthenticationFailed
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from auth_app.utils.token_blacklist import FilteredRefreshToken
 
 User = get_user_model()
 
@@ -54,7 +62,12 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     email = serializers.EmailField(required=False)
 
     def validate(self, attrs):
-        """Validate user credentials and build token payload."""
+        """Validate user credentials and build token payload.
+
+        The password is hashed once: check_password verifies it (and
+        rehashes it if the hasher settings changed), then the tokens are
+        issued without authenticating a second time.
+        """
         username = attrs.get("username")
         email = attrs.get("email")
         password = attrs.get("password")
@@ -62,11 +75,26 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             msg = "Email/username and password are required."
             raise serializers.ValidationError(msg)
         user = self._get_user(email=email, username=username)
-        if not user or not user.check_password(password):
+        if user is None:
+            # Hash anyway so unknown users take as long as wrong passwords.
+            make_password(password)
             raise AuthenticationFailed("Invalid email or password.")
-        data = super().validate({"username": user.username, "password": password})
-        data["user"] = {"id": user.pk, "username": user.username, "email": user.email}
-        return data
+        if not user.check_password(password):
+            raise AuthenticationFailed("Invalid email or password.")
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"],
+                "no_active_account",
+            )
+        self.user = user
+        refresh = self.get_token(user)
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return {
+            "refresh": str(refresh),
+            "access": str(refresh.access_token),
+            "user": {"id": user.pk, "username": user.username, "email": user.email},
+        }
 
     def _get_user(self, *, email=None, username=None):
         """Return a user instance for the given identity or None."""
@@ -74,4 +102,10 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         try:
             return User.objects.get(**lookup)
         except User.DoesNotExist:
-            return None
\ No newline at end of file
+            return None
+
+
+class CookieTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh serializer whose blacklist check goes through the bloom filter."""
+
+    token_class = FilteredRefreshToken
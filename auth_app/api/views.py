@@ -11,7 +11,11 @@ from auth_app.utils.auth_cookies import (
     clear_auth_cookies,
     set_auth_cookies,
 )
-from .serializers import RegistrationSerializer, CustomTokenObtainPairSerializer
+from .serializers import (
+    CookieTokenRefreshSerializer,
+    CustomTokenObtainPairSerializer,
+    RegistrationSerializer,
+)
 
 LOGOUT_MESSAGE = (
     "Log-Out successfully! All Tokens will be deleted. "
@@ -57,6 +61,8 @@ class CookieTokenObtainPairView(TokenObtainPairView):
 class CookieRefreshView(TokenRefreshView):
     """Refresh the access token using the refresh cookie."""
 
+    serializer_class = CookieTokenRefreshSerializer
+
     def post(self, request, *args, **kwargs):
         """Issue a new access token and update cookie."""
         refresh = request.COOKIES.get("refresh_token")
@@ -84,7 +90,7 @@ class LogoutView(APIView):
     def post(self, request):
         """Blacklist refresh token and clear auth cookies."""
         refresh = request.COOKIES.get("refresh_token")
-        blacklist_refresh_cookie(refresh)
+        blacklist_refresh_cookie(refresh, request.COOKIES.get("access_token"))
         response = Response({"detail": LOGOUT_MESSAGE}, status=status.HTTP_200_OK)
         clear_auth_cookies(response)
         return response
\ No newline at end of file
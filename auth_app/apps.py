@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
+
+from core.process import is_serving_process
 
 
 class AuthAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auth_app'
+
+    def ready(self):
+        """Start the periodic purge of expired tokens if enabled."""
+        if settings.JWT_TOKEN_PURGE_INTERVAL <= 0 or not is_serving_process():
+            return
+        from auth_app.utils.token_blacklist import start_token_purger
+
+        start_token_purger(settings.JWT_TOKEN_PURGE_INTERVAL)
@@ -2,9 +2,18 @@
 
 from __future__ import annotations
 
+from django.conf import settings
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from auth_app.utils.token_cache import (
+    get_cached_token,
+    store_cached_token,
+    token_digest,
+)
+from auth_app.utils.token_user import get_token_user
 
 
 class CookieJWTAuthentication(JWTAuthentication):
@@ -30,4 +39,31 @@ class CookieJWTAuthentication(JWTAuthentication):
             # Expired or invalid cookie token → behave as unauthenticated
             return None
 
-        return self.get_user(validated_token), validated_token
\ No newline at end of file
+        return self.get_user(validated_token), validated_token
+
+    def get_validated_token(self, raw_token):
+        """Verify a raw JWT once and reuse the result until it expires.
+
+        Invalid tokens are never cached, so they keep failing every time.
+        """
+        key = token_digest(raw_token)
+        token = get_cached_token(key)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            store_cached_token(key, token)
+        return token
+
+    def get_user(self, validated_token):
+        """Return a lazy token user in JWT_TOKEN_USER mode, else load the row.
+
+        The lazy user skips the per-request SELECT; only the is_active flag
+        is checked, from a short per-process cache.
+        """
+        if not settings.JWT_TOKEN_USER or api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as error:
+            msg = "Token contained no recognizable user identification"
+            raise InvalidToken(msg) from error
+        return get_token_user(user_id)
@@ -0,0 +1,25 @@
+"""Management command that deletes expired outstanding JWTs in batches."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from auth_app.utils.token_blacklist import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    """Purge expired rows from the token_blacklist tables."""
+
+    help = "Delete expired outstanding and blacklisted tokens in batches."
+
+    def add_arguments(self, parser):
+        """Register the batch size option."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.JWT_TOKEN_PURGE_BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        """Run the purge and report the number of deleted tokens."""
+        deleted = purge_expired_tokens(options["batch_size"])
+        self.stdout.write(f"Purged {deleted} expired token(s).")
@@ -0,0 +1,34 @@
+"""Index the token_blacklist columns used by purging and filter syncing."""
+
+from django.db import migrations, models
+
+INDEXES = [
+    ("OutstandingToken", models.Index(fields=["expires_at"], name="auth_token_expires_idx")),
+    (
+        "BlacklistedToken",
+        models.Index(fields=["blacklisted_at"], name="auth_blacklisted_at_idx"),
+    ),
+]
+
+
+def add_indexes(apps, schema_editor):
+    """Create the indexes on the third-party token_blacklist tables."""
+    for model_name, index in INDEXES:
+        schema_editor.add_index(apps.get_model("token_blacklist", model_name), index)
+
+
+def remove_indexes(apps, schema_editor):
+    """Drop the indexes again."""
+    for model_name, index in INDEXES:
+        schema_editor.remove_index(apps.get_model("token_blacklist", model_name), index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("token_blacklist", "0013_alter_blacklistedtoken_options_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
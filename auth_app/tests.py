@@ -1,9 +1,44 @@
 """API tests for authentication endpoints."""
 
+import io
+from datetime import timedelta
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from auth_app.hashers import TunedPBKDF2PasswordHasher
+from auth_app.utils.token_blacklist import (
+    BloomFilter,
+    FilteredRefreshToken,
+    get_blacklist_filter,
+    purge_expired_tokens,
+    reset_blacklist_filter,
+)
+from auth_app.utils.token_cache import (
+    clear_cached_tokens,
+    get_cached_token,
+    store_cached_token,
+    token_digest,
+)
+from auth_app.utils.token_user import LazyTokenUser, clear_active_flags
+from quiz_app.models import Quiz
+from quiz_app.utils.response_cache import get_cache as get_response_cache
 
 User = get_user_model()
 
@@ -120,4 +155,301 @@ class TokenRefreshApiTests(BaseAuthApiTests):
         url = reverse("token-refresh")
         response = self.client.post(url, format="json")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-        self.assertEqual(response.data["detail"], "Refresh token not found")
\ No newline at end of file
+        self.assertEqual(response.data["detail"], "Refresh token not found")
+
+
+@override_settings(JWT_TOKEN_USER=True)
+class TokenUserAuthTests(BaseAuthApiTests):
+    """Tests for the lazy token user mode of CookieJWTAuthentication."""
+
+    def setUp(self):
+        """Start every test with an empty active-flag cache."""
+        super().setUp()
+        clear_active_flags()
+        self.addCleanup(clear_active_flags)
+        get_response_cache().clear()
+
+    def test_lazy_user_answers_claims_without_queries(self):
+        """id, pk and is_authenticated come from the token claims."""
+        user = LazyTokenUser(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertEqual((user.id, user.pk), (self.user.id, self.user.id))
+            self.assertTrue(user.is_authenticated)
+            self.assertTrue(user)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, "testuser")
+            self.assertEqual(user.email, "test@example.com")
+
+    def test_lazy_user_can_be_assigned_to_foreign_keys(self):
+        """Write paths load the row and accept the proxy like a user."""
+        quiz = Quiz.objects.create(user=LazyTokenUser(self.user.id), title="Q")
+        self.assertEqual(quiz.user_id, self.user.id)
+
+    def test_token_user_id_matches_primary_key_type(self):
+        """String id claims are converted, so ownership checks still work."""
+        quiz = Quiz.objects.create(user=self.user, title="Mine")
+        self.login()
+        response = self.client.get(reverse("quiz-detail", args=[quiz.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_quiz_list_skips_user_lookup(self):
+        """After the first request the active flag comes from the cache."""
+        self.login()
+        url = reverse("quiz-list")
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        get_response_cache().clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def test_inactive_user_is_rejected(self):
+        """Deactivation drops the cached flag and the token stops working."""
+        self.login()
+        url = reverse("quiz-list")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        """A token of a deleted user authenticates nobody."""
+        self.login()
+        self.user.delete()
+        response = self.client.get(reverse("quiz-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TokenCacheTests(BaseAuthApiTests):
+    """Tests for the per-process cache of verified access tokens."""
+
+    def setUp(self):
+        """Start every test with an empty token cache."""
+        super().setUp()
+        clear_cached_tokens()
+        self.addCleanup(clear_cached_tokens)
+
+    def test_repeated_requests_verify_token_once(self):
+        """The same access cookie is decoded and verified only once."""
+        self.login()
+        url = reverse("quiz-list")
+        original = JWTAuthentication.get_validated_token
+        with patch.object(
+            JWTAuthentication,
+            "get_validated_token",
+            autospec=True,
+            side_effect=original,
+        ) as verify:
+            for _ in range(3):
+                self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.assertEqual(verify.call_count, 1)
+
+    def test_expired_token_is_not_served_from_cache(self):
+        """Entries live until exp, so an expired token is verified again."""
+        token = AccessToken.for_user(self.user)
+        token.set_exp(lifetime=timedelta(seconds=-1))
+        key = token_digest(str(token))
+        store_cached_token(key, token)
+        self.assertIsNone(get_cached_token(key))
+        self.client.cookies["access_token"] = str(token)
+        response = self.client.get(reverse("quiz-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_token_is_not_cached(self):
+        """Tokens that fail verification never enter the cache."""
+        raw = str(AccessToken.for_user(self.user)) + "x"
+        self.client.cookies["access_token"] = raw
+        response = self.client.get(reverse("quiz-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIsNone(get_cached_token(token_digest(raw)))
+
+    def test_logout_drops_cached_tokens(self):
+        """Logout evicts the access and refresh tokens of the session."""
+        self.login()
+        access = self.client.cookies["access_token"].value
+        self.client.get(reverse("quiz-list"))
+        self.assertIsNotNone(get_cached_token(token_digest(access)))
+        response = self.client.post(reverse("api-logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(get_cached_token(token_digest(access)))
+
+
+@override_settings(JWT_BLACKLIST_BLOOM_FILTER=True, JWT_BLACKLIST_BLOOM_SYNC_SECONDS=60)
+class TokenBlacklistTests(BaseAuthApiTests):
+    """Tests for the blacklist bloom filter and the expired token purge."""
+
+    def setUp(self):
+        """Start every test with a freshly built filter."""
+        super().setUp()
+        reset_blacklist_filter()
+        self.addCleanup(reset_blacklist_filter)
+        get_blacklist_filter().rebuild()
+
+    def refresh(self):
+        """Call the refresh endpoint with the current cookies."""
+        return self.client.post(reverse("token-refresh"), format="json")
+
+    def blacklist_queries(self, queries):
+        """Return captured queries that read the blacklist table."""
+        return [
+            query for query in queries.captured_queries
+            if "token_blacklist_blacklistedtoken" in query["sql"]
+        ]
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Every added item is found; few others are reported."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for number in range(1000):
+            bloom.add(f"jti-{number}")
+        self.assertTrue(all(f"jti-{number}" in bloom for number in range(1000)))
+        false_positives = sum(f"other-{number}" in bloom for number in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_refresh_skips_blacklist_query(self):
+        """Once the filter is built, refreshes do not query the blacklist."""
+        self.login()
+        self.assertEqual(self.refresh().status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.refresh().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.blacklist_queries(queries), [])
+
+    def test_refresh_after_logout_is_rejected(self):
+        """Logout adds the refresh token to the filter and the table."""
+        self.login()
+        refresh = self.client.cookies["refresh_token"].value
+        self.assertEqual(self.refresh().status_code, status.HTTP_200_OK)
+        self.client.post(reverse("api-logout"))
+        with self.assertRaises(TokenError):
+            FilteredRefreshToken(refresh)
+
+    @override_settings(JWT_BLACKLIST_BLOOM_SYNC_SECONDS=0)
+    def test_blacklist_from_other_process_is_synced(self):
+        """Rows written elsewhere are picked up by the next sync."""
+        reset_blacklist_filter()
+        self.login()
+        get_blacklist_filter().rebuild()
+        refresh = self.client.cookies["refresh_token"].value
+        FilteredRefreshToken(refresh)
+        RefreshToken(refresh).blacklist()
+        with self.assertRaises(TokenError):
+            FilteredRefreshToken(refresh)
+
+    @override_settings(JWT_BLACKLIST_BLOOM_SYNC_SECONDS=0)
+    def test_sync_adds_overlap_rows_only_once(self):
+        """Rows re-read in the overlap window do not inflate the count."""
+        reset_blacklist_filter()
+        blacklist_filter = get_blacklist_filter()
+        blacklist_filter.rebuild()
+        self.login()
+        RefreshToken(self.client.cookies["refresh_token"].value).blacklist()
+        for _ in range(3):
+            blacklist_filter.might_contain("unknown")
+        self.assertEqual(blacklist_filter._bloom.count, 1)
+
+    def test_unbuilt_filter_falls_back_to_table(self):
+        """The first check starts a background build and asks the DB."""
+        reset_blacklist_filter()
+        with patch("auth_app.utils.token_blacklist.threading.Thread") as thread:
+            self.assertTrue(get_blacklist_filter().might_contain("jti"))
+            self.assertTrue(get_blacklist_filter().might_contain("jti"))
+        thread.return_value.start.assert_called_once_with()
+
+    def test_purge_deletes_only_expired_tokens_in_batches(self):
+        """Expired tokens and their blacklist rows go; valid ones stay."""
+        now = timezone.now()
+        tokens = OutstandingToken.objects.bulk_create(
+            OutstandingToken(
+                user=self.user,
+                jti=f"jti-{number}",
+                token="x",
+                expires_at=now + timedelta(hours=1 if number < 2 else -1),
+            )
+            for number in range(7)
+        )
+        BlacklistedToken.objects.create(token=tokens[5])
+        BlacklistedToken.objects.create(token=tokens[0])
+        self.assertEqual(purge_expired_tokens(batch_size=2), 5)
+        remaining = set(OutstandingToken.objects.values_list("jti", flat=True))
+        self.assertEqual(remaining, {"jti-0", "jti-1"})
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+    def test_purge_command_reports_count(self):
+        """The management command prints the number of purged tokens."""
+        OutstandingToken.objects.create(
+            jti="old", token="x", expires_at=timezone.now() - timedelta(days=1)
+        )
+        out = io.StringIO()
+        call_command("purge_expired_tokens", "--batch-size", "10", stdout=out)
+        self.assertIn("Purged 1 expired token(s).", out.getvalue())
+
+
+class PasswordHashingTests(BaseAuthApiTests):
+    """Tests for the single-hash login path and the tuned hashers."""
+
+    def test_login_hashes_password_once(self):
+        """A successful login verifies the password exactly once."""
+        original = TunedPBKDF2PasswordHasher.verify
+        with patch.object(
+            TunedPBKDF2PasswordHasher, "verify", autospec=True, side_effect=original
+        ) as verify:
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.assertEqual(verify.call_count, 1)
+
+    def test_unknown_user_still_hashes(self):
+        """Unknown users cost one hash too, like a wrong password."""
+        with patch(
+            "auth_app.api.serializers.make_password", wraps=make_password
+        ) as hashed:
+            payload = {"username": "nobody", "password": "whatever123"}
+            response = self.client.post(reverse("api-login"), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        hashed.assert_called_once_with("whatever123")
+
+    def test_inactive_user_is_rejected(self):
+        """Inactive accounts cannot log in even with the right password."""
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertEqual(self.login().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_login_rehashes_when_iterations_change(self):
+        """A login upgrades the stored hash to the configured iterations."""
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "auth_app.hashers.TunedScryptPasswordHasher",
+            "auth_app.hashers.TunedPBKDF2PasswordHasher",
+        ],
+        PASSWORD_SCRYPT_WORK_FACTOR=1024,
+    )
+    def test_login_rehashes_with_preferred_hasher(self):
+        """Switching the hasher migrates passwords on the next login."""
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+        self.assertIn("$1024$", self.user.password)
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["auth_app.hashers.TunedScryptPasswordHasher"],
+    PASSWORD_SCRYPT_WORK_FACTOR=65536,
+)
+class ScryptHasherTests(BaseAuthApiTests):
+    """Tests for scrypt hashes created under other work factors."""
+
+    def test_lowered_and_raised_work_factor_still_verify(self):
+        """Stored hashes verify whatever the current factor is, then upgrade."""
+        for stored, current in ((65536, 1024), (1024, 65536)):
+            with self.subTest(stored=stored, current=current):
+                with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=stored):
+                    self.user.set_password(self.password)
+                    self.user.save(update_fields=["password"])
+                with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=current):
+                    self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+                    self.user.refresh_from_db()
+                    self.assertIn(f"scrypt${current}$", self.user.password)
+                    self.assertTrue(self.user.check_password(self.password))
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from auth_app.utils.token_blacklist import FilteredRefreshToken
+from auth_app.utils.token_cache import forget_cached_token
 
 
 def set_auth_cookies(response: Response, access: str, refresh: str) -> None:
@@ -24,12 +25,17 @@ def clear_auth_cookies(response: Response) -> None:
     response.delete_cookie("refresh_token")
 
 
-def blacklist_refresh_cookie(refresh_token: str | None) -> None:
-    """Blacklist the given refresh token if possible."""
+def blacklist_refresh_cookie(
+    refresh_token: str | None,
+    access_token: str | None = None,
+) -> None:
+    """Blacklist the given refresh token and drop both from the token cache."""
+    forget_cached_token(access_token)
+    forget_cached_token(refresh_token)
     if not refresh_token:
         return
     try:
-        token = RefreshToken(refresh_token)
+        token = FilteredRefreshToken(refresh_token)
         token.blacklist()
     except Exception:
         return
\ No newline at end of file
@@ -0,0 +1,290 @@
+"""Bloom-filtered blacklist checks and batched purging of expired tokens."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+logger = logging.getLogger(__name__)
+
+_FILTER: "BlacklistFilter | None" = None
+_FILTER_LOCK = threading.Lock()
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (no false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: str) -> None:
+        """Set the bits of ``item``."""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def _positions(self, item: str):
+        """Derive all bit positions from one digest (double hashing)."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * second) % self.size for index in range(self.hashes))
+
+
+class BlacklistFilter:
+    """Per-process bloom filter of blacklisted JTIs, synced from the DB.
+
+    Blacklists made in this process are added immediately. Rows written
+    by other processes are picked up by an incremental sync at most every
+    ``sync_seconds``, so they are honoured here with that much delay;
+    rows blacklisted up to ``overlap_seconds`` before the last sync are
+    read again so late commits are not missed (rows already added are
+    skipped by id). Full builds run in a background thread; until the
+    first one finishes every check falls back to the blacklist table.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        error_rate: float,
+        sync_seconds: float,
+        overlap_seconds: float = 60,
+        clock=time.monotonic,
+    ) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self.overlap_seconds = overlap_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._bloom: BloomFilter | None = None
+        self._synced_at = 0.0
+        self._synced_until = None
+        self._recent_ids: set[int] = set()
+        self._id_marks: deque = deque()
+        self._builds = 0
+        self._added_while_building: list[str] = []
+
+    def might_contain(self, jti: str) -> bool:
+        """Return False only if ``jti`` is certainly not blacklisted."""
+        with self._lock:
+            if self._bloom is None:
+                self._start_build()
+                return True
+            if self._clock() - self._synced_at >= self.sync_seconds:
+                self._sync()
+            return jti in self._bloom
+
+    def add(self, jti: str) -> None:
+        """Record a JTI blacklisted by this process."""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+            if self._builds:
+                self._added_while_building.append(jti)
+
+    def rebuild(self) -> None:
+        """Reload all blacklisted JTIs in this thread, e.g. after a purge."""
+        with self._lock:
+            self._builds += 1
+        self._build()
+
+    def _start_build(self) -> None:
+        """Build the filter in a daemon thread; hold the lock."""
+        if self._builds:
+            return
+        self._builds += 1
+        threading.Thread(
+            target=self._build_in_background,
+            name="token-blacklist-filter",
+            daemon=True,
+        ).start()
+
+    def _build_in_background(self) -> None:
+        """Thread entry point that manages the thread's DB connection."""
+        close_old_connections()
+        try:
+            self._build()
+        except Exception:
+            logger.exception("Building the token blacklist filter failed")
+        finally:
+            connection.close()
+
+    def _build(self) -> None:
+        """Read the whole table into a fresh filter, then swap it in."""
+        try:
+            started = aware_utcnow()
+            recent_since = started - timedelta(seconds=self.overlap_seconds)
+            count = BlacklistedToken.objects.count()
+            bloom = BloomFilter(max(self.capacity, count * 2), self.error_rate)
+            recent_ids = set()
+            max_id = 0
+            rows = BlacklistedToken.objects.values_list(
+                "id", "token__jti", "blacklisted_at"
+            )
+            for row_id, jti, blacklisted_at in rows.iterator(chunk_size=10000):
+                bloom.add(jti)
+                max_id = max(max_id, row_id)
+                if blacklisted_at >= recent_since:
+                    recent_ids.add(row_id)
+        except BaseException:
+            with self._lock:
+                self._finish_build()
+            raise
+        with self._lock:
+            for jti in self._added_while_building:
+                bloom.add(jti)
+            self._finish_build()
+            self._bloom = bloom
+            self._recent_ids = recent_ids
+            self._id_marks = deque([(started, max_id)])
+            self._mark_synced(started)
+
+    def _finish_build(self) -> None:
+        """Count a build as done; hold the lock."""
+        self._builds -= 1
+        if not self._builds:
+            self._added_while_building = []
+
+    def _sync(self) -> None:
+        """Add rows blacklisted since the last sync; hold the lock.
+
+        Every row with ``blacklisted_at >= since`` got its id after the
+        highest id seen by a sync that started before ``since``, so that
+        id bounds the (indexed) query from below.
+        """
+        started = aware_utcnow()
+        since = self._synced_until - timedelta(seconds=self.overlap_seconds)
+        while len(self._id_marks) > 1 and self._id_marks[1][0] <= since:
+            self._id_marks.popleft()
+        floor_at, floor_id = self._id_marks[0]
+        rows = BlacklistedToken.objects.filter(blacklisted_at__gte=since)
+        if floor_at <= since:
+            rows = rows.filter(id__gt=floor_id)
+        recent_ids = set()
+        for row_id, jti in rows.values_list("id", "token__jti"):
+            recent_ids.add(row_id)
+            if row_id not in self._recent_ids:
+                self._bloom.add(jti)
+        self._recent_ids = recent_ids
+        max_id = max(recent_ids, default=0)
+        self._id_marks.append((started, max(max_id, self._id_marks[-1][1])))
+        self._mark_synced(started)
+        if self._bloom.count > self._bloom.capacity:
+            self._start_build()
+
+    def _mark_synced(self, started) -> None:
+        """Remember when and up to which row timestamp we synced."""
+        self._synced_at = self._clock()
+        self._synced_until = started
+
+
+class FilteredRefreshToken(RefreshToken):
+    """Refresh token that asks the bloom filter before the blacklist table."""
+
+    def check_blacklist(self) -> None:
+        """Skip the DB lookup when the filter rules the JTI out."""
+        if settings.JWT_BLACKLIST_BLOOM_FILTER:
+            jti = self.payload[api_settings.JTI_CLAIM]
+            if not get_blacklist_filter().might_contain(jti):
+                return
+        super().check_blacklist()
+
+    def blacklist(self):
+        """Blacklist the token and add its JTI to this process's filter."""
+        result = super().blacklist()
+        if _FILTER is not None:
+            _FILTER.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+def get_blacklist_filter() -> BlacklistFilter:
+    """Return the process-wide blacklist filter."""
+    global _FILTER
+    with _FILTER_LOCK:
+        if _FILTER is None:
+            _FILTER = BlacklistFilter(
+                capacity=settings.JWT_BLACKLIST_BLOOM_CAPACITY,
+                error_rate=settings.JWT_BLACKLIST_BLOOM_ERROR_RATE,
+                sync_seconds=settings.JWT_BLACKLIST_BLOOM_SYNC_SECONDS,
+            )
+    return _FILTER
+
+
+def reset_blacklist_filter() -> None:
+    """Forget the process-wide filter; it is rebuilt on next use."""
+    global _FILTER
+    with _FILTER_LOCK:
+        _FILTER = None
+
+
+def purge_expired_tokens(batch_size: int | None = None) -> int:
+    """Delete expired outstanding tokens (and their blacklist rows) in batches.
+
+    Expired tokens fail verification on their own, so their rows are no
+    longer needed. Returns the number of outstanding tokens deleted.
+    """
+    batch_size = batch_size or settings.JWT_TOKEN_PURGE_BATCH_SIZE
+    leeway = api_settings.LEEWAY
+    if not isinstance(leeway, timedelta):
+        leeway = timedelta(seconds=leeway)
+    cutoff = aware_utcnow() - leeway
+    expired = OutstandingToken.objects.filter(expires_at__lte=cutoff).order_by()
+    deleted = 0
+    while True:
+        ids = list(expired.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        OutstandingToken.objects.filter(id__in=ids).only("id").delete()
+        deleted += len(ids)
+    if deleted and _FILTER is not None:
+        _FILTER.rebuild()
+    return deleted
+
+
+def start_token_purger(interval: float) -> threading.Thread:
+    """Run purge_expired_tokens every ``interval`` seconds in a daemon thread."""
+
+    def run() -> None:
+        while True:
+            time.sleep(interval)
+            close_old_connections()
+            try:
+                deleted = purge_expired_tokens()
+            except Exception:
+                logger.exception("Purging expired tokens failed")
+                continue
+            if deleted:
+                logger.info("Purged %d expired outstanding tokens", deleted)
+
+    thread = threading.Thread(target=run, name="token-purger", daemon=True)
+    thread.start()
+    return thread
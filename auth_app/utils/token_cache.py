@@ -0,0 +1,69 @@
+"""Per-process cache of validated access tokens keyed by their digest."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+
+from cachetools import TLRUCache
+from django.conf import settings
+
+_TOKENS: TLRUCache | None = None
+_TOKENS_LOCK = threading.Lock()
+
+
+def token_digest(raw_token: str | bytes) -> str:
+    """Return the SHA-256 hex digest used as cache key for a raw JWT."""
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode()
+    return hashlib.sha256(raw_token).hexdigest()
+
+
+def get_cached_token(key: str):
+    """Return the cached validated token or None (missing or expired)."""
+    with _TOKENS_LOCK:
+        cache = _get_cache()
+        return cache.get(key) if cache is not None else None
+
+
+def store_cached_token(key: str, token) -> None:
+    """Cache a validated token until its ``exp`` claim."""
+    with _TOKENS_LOCK:
+        cache = _get_cache()
+        if cache is not None and "exp" in token.payload:
+            cache[key] = token
+
+
+def forget_cached_token(raw_token: str | bytes | None) -> None:
+    """Drop a raw token from the cache, e.g. when it is logged out."""
+    if not raw_token:
+        return
+    key = token_digest(raw_token)
+    with _TOKENS_LOCK:
+        if _TOKENS is not None:
+            _TOKENS.pop(key, None)
+
+
+def clear_cached_tokens() -> None:
+    """Drop all cached tokens in this process."""
+    global _TOKENS
+    with _TOKENS_LOCK:
+        _TOKENS = None
+
+
+def _get_cache() -> TLRUCache | None:
+    """Create the cache on first use; the caller must hold the lock."""
+    global _TOKENS
+    if _TOKENS is None and settings.JWT_TOKEN_CACHE_SIZE > 0:
+        _TOKENS = TLRUCache(
+            maxsize=settings.JWT_TOKEN_CACHE_SIZE,
+            ttu=_expires_at,
+            timer=time.time,
+        )
+    return _TOKENS
+
+
+def _expires_at(key: str, token, now: float) -> float:
+    """Let entries expire exactly when the token's ``exp`` passes."""
+    return float(token.payload["exp"])
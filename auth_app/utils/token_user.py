@@ -0,0 +1,110 @@
+"""Lazy users built from JWT claims and a per-process active-user cache."""
+
+from __future__ import annotations
+
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import AuthenticationFailed
+
+_ACTIVE_USERS: TTLCache | None = None
+_ACTIVE_USERS_LOCK = threading.Lock()
+
+
+class LazyTokenUser(SimpleLazyObject):
+    """User proxy that answers id/pk from the token and loads the rest lazily.
+
+    ``id``, ``pk``, ``is_authenticated`` and truthiness never touch the
+    database; any other attribute fetches the user row once.
+    """
+
+    def __init__(self, user_id) -> None:
+        self.__dict__["_token_user_id"] = user_id
+        super().__init__(lambda: get_user_model().objects.get(pk=user_id))
+
+    @property
+    def id(self):
+        return self._token_user_id
+
+    @property
+    def pk(self):
+        return self._token_user_id
+
+    @property
+    def is_authenticated(self) -> bool:
+        return True
+
+    @property
+    def is_anonymous(self) -> bool:
+        return False
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return f"<LazyTokenUser: {self._token_user_id}>"
+
+
+def get_token_user(user_id) -> LazyTokenUser:
+    """Return a lazy user after checking the cached active flag.
+
+    ``user_id`` is the raw claim (simplejwt stores it as a string) and is
+    converted to the primary key type first.
+    """
+    user_id = get_user_model()._meta.pk.to_python(user_id)
+    is_active = _get_active_flag(user_id)
+    if is_active is None:
+        raise AuthenticationFailed("User not found", code="user_not_found")
+    if not is_active:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    return LazyTokenUser(user_id)
+
+
+def forget_active_flag(user_id) -> None:
+    """Drop the cached active flag of a user in this process."""
+    with _ACTIVE_USERS_LOCK:
+        if _ACTIVE_USERS is not None:
+            _ACTIVE_USERS.pop(user_id, None)
+
+
+def clear_active_flags() -> None:
+    """Drop all cached active flags in this process."""
+    global _ACTIVE_USERS
+    with _ACTIVE_USERS_LOCK:
+        _ACTIVE_USERS = None
+
+
+def _get_active_flag(user_id) -> bool | None:
+    """Return is_active from the cache or one single-column query."""
+    global _ACTIVE_USERS
+    with _ACTIVE_USERS_LOCK:
+        if _ACTIVE_USERS is None:
+            _ACTIVE_USERS = TTLCache(
+                maxsize=settings.JWT_ACTIVE_USER_CACHE_SIZE,
+                ttl=settings.JWT_ACTIVE_USER_CACHE_TTL,
+            )
+        if user_id in _ACTIVE_USERS:
+            return _ACTIVE_USERS[user_id]
+    is_active = (
+        get_user_model()
+        .objects.filter(pk=user_id)
+        .values_list("is_active", flat=True)
+        .first()
+    )
+    if is_active is not None:
+        with _ACTIVE_USERS_LOCK:
+            if _ACTIVE_USERS is not None:
+                _ACTIVE_USERS[user_id] = is_active
+    return is_active
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def _user_changed(sender, instance, **kwargs) -> None:
+    """Forget the cached flag when a user is saved or deleted here."""
+    forget_active_flag(instance.pk)
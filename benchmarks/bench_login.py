@@ -0,0 +1,99 @@
+"""Benchmark login throughput for each configurable password hasher.
+
+Usage (from the project root)::
+
+    python -m benchmarks.bench_login [--logins 20]
+
+For every available hasher (pbkdf2, scrypt and argon2 if argon2-cffi is
+installed, each with the PASSWORD_* cost settings) a user is created in
+a throwaway test database and /api/login/ is called repeatedly. The old
+login path (check_password followed by authenticate, two hashes) is
+timed next to it for comparison.
+"""
+
+import argparse
+import importlib.util
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.contrib.auth import authenticate, get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+HASHERS = {
+    "pbkdf2": "auth_app.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "auth_app.hashers.TunedScryptPasswordHasher",
+    "argon2": "auth_app.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD = "bench-password-123"
+
+
+def available_hashers() -> dict:
+    """Return the hashers usable here (argon2 needs argon2-cffi)."""
+    if importlib.util.find_spec("argon2") is None:
+        return {name: path for name, path in HASHERS.items() if name != "argon2"}
+    return HASHERS
+
+
+def api_logins(client: Client, username: str, logins: int) -> float:
+    """Return logins per second through the login endpoint."""
+    payload = {"username": username, "password": PASSWORD}
+    started = time.perf_counter()
+    for _ in range(logins):
+        response = client.post("/api/login/", payload, content_type="application/json")
+        if response.status_code != 200:
+            raise SystemExit(f"Login failed with {response.status_code}")
+    return logins / (time.perf_counter() - started)
+
+
+def double_hash_logins(user, logins: int) -> float:
+    """Return logins per second of the former check_password + authenticate."""
+    started = time.perf_counter()
+    for _ in range(logins):
+        user.check_password(PASSWORD)
+        authenticate(username=user.username, password=PASSWORD)
+    return logins / (time.perf_counter() - started)
+
+
+def main() -> None:
+    """Parse arguments, benchmark every hasher and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    rows = []
+    try:
+        for name, path in available_hashers().items():
+            others = [other for other in HASHERS.values() if other != path]
+            with override_settings(PASSWORD_HASHERS=[path, *others]):
+                user = get_user_model().objects.create_user(
+                    username=f"bench-{name}", password=PASSWORD
+                )
+                client = Client()
+                api_logins(client, user.username, 1)
+                rows.append(
+                    (
+                        name,
+                        api_logins(client, user.username, args.logins),
+                        double_hash_logins(user, args.logins),
+                    )
+                )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(f"logins per hasher: {args.logins}")
+    print(f"{'hasher':8} {'single hash':>14} {'double hash':>14}")
+    for name, single, double in rows:
+        print(f"{name:8} {single:10.1f} /s {double:10.1f} /s")
+
+
+if __name__ == "__main__":
+    main()
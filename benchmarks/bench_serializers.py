@@ -0,0 +1,119 @@
+"""Benchmark per-quiz serialization cost of the quiz list read path.
+
+Usage (from the project root)::
+
+    python -m benchmarks.bench_serializers [--quizzes 200] [--questions 10]
+
+A throwaway test database is filled with quizzes, then the DRF path
+(QuizSerializer + JSONRenderer over prefetched instances) is compared
+with the values()-based fast path (serialize_quiz_rows + FastJSONRenderer).
+Both timings include the queries, and the rendered bytes are checked to
+be identical.
+"""
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Prefetch  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from quiz_app.api.fast_serializers import QUIZ_FIELDS, serialize_quiz_rows  # noqa: E402
+from quiz_app.api.renderers import FastJSONRenderer  # noqa: E402
+from quiz_app.api.serializers import QuizSerializer  # noqa: E402
+from quiz_app.models import Question, Quiz  # noqa: E402
+
+
+def populate(quizzes: int, questions: int):
+    """Create one user with the requested number of quizzes and questions."""
+    user = get_user_model().objects.create_user(username="bench", password="x")
+    created = Quiz.objects.bulk_create(
+        Quiz(
+            user=user,
+            title=f"Benchmark quiz {number}",
+            description="A quiz created for the serializer benchmark.",
+            video_url="https://www.youtube.com/watch?v=benchmark",
+        )
+        for number in range(quizzes)
+    )
+    Question.objects.bulk_create(
+        Question(
+            quiz=quiz,
+            question_title=f"What is the answer to question {index}?",
+            question_options=["Option A", "Option B", "Option C", "Option D"],
+            answer="Option A",
+        )
+        for quiz in created
+        for index in range(questions)
+    )
+    return user
+
+
+def drf_path(user) -> bytes:
+    """Render the list the way the original view did."""
+    quizzes = (
+        Quiz.objects.filter(user=user)
+        .order_by("-created_at", "-id")
+        .prefetch_related(
+            Prefetch("questions", queryset=Question.objects.order_by("id"))
+        )
+    )
+    return JSONRenderer().render(QuizSerializer(quizzes, many=True).data)
+
+
+def fast_path(user) -> bytes:
+    """Render the list through values() rows and the shared encoder."""
+    rows = (
+        Quiz.objects.filter(user=user)
+        .order_by("-created_at", "-id")
+        .values(*QUIZ_FIELDS)
+    )
+    return FastJSONRenderer().render(serialize_quiz_rows(rows))
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    """Return the fastest wall-clock time of ``repeat`` runs."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    """Parse arguments, run both paths and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quizzes", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = populate(args.quizzes, args.questions)
+        if drf_path(user) != fast_path(user):
+            raise SystemExit("Fast path output differs from QuizSerializer.")
+        drf = best_of(args.repeat, drf_path, user)
+        fast = best_of(args.repeat, fast_path, user)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    per_quiz = 1e6 / args.quizzes
+    print(f"quizzes: {args.quizzes} x {args.questions} questions")
+    print(f"DRF serializer: {drf * per_quiz:8.1f} us/quiz ({drf * 1000:.1f} ms)")
+    print(f"fast path:      {fast * per_quiz:8.1f} us/quiz ({fast * 1000:.1f} ms)")
+    print(f"speedup:        {drf / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
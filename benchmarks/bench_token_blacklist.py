@@ -0,0 +1,116 @@
+"""Benchmark blacklist checks and the expired token purge on a large table.
+
+Usage (from the project root)::
+
+    python -m benchmarks.bench_token_blacklist [--rows 1000000] [--checks 5000]
+
+A throwaway test database gets ``--rows`` outstanding tokens (half of
+them expired, every tenth one blacklisted). The benchmark then compares
+the per-refresh blacklist check of simplejwt (one JOIN query) with the
+bloom-filtered check for JTIs that are not blacklisted, and times
+purge_expired_tokens over the expired half.
+"""
+
+import argparse
+import os
+import time
+import uuid
+from datetime import timedelta
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework_simplejwt.token_blacklist.models import (  # noqa: E402
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from auth_app.utils.token_blacklist import (  # noqa: E402
+    get_blacklist_filter,
+    purge_expired_tokens,
+)
+
+BATCH = 20000
+
+
+def populate(rows: int) -> None:
+    """Insert outstanding tokens and blacklist every tenth one."""
+    now = timezone.now()
+    for start in range(0, rows, BATCH):
+        tokens = OutstandingToken.objects.bulk_create(
+            OutstandingToken(
+                jti=uuid.uuid4().hex,
+                token="x",
+                expires_at=now + timedelta(days=1 if number % 2 else -1),
+            )
+            for number in range(start, min(start + BATCH, rows))
+        )
+        BlacklistedToken.objects.bulk_create(
+            BlacklistedToken(token=token) for token in tokens[::10]
+        )
+
+
+def db_check(jti: str) -> bool:
+    """Run simplejwt's blacklist query."""
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def filtered_check(jti: str) -> bool:
+    """Ask the bloom filter first and query only on a possible hit."""
+    return get_blacklist_filter().might_contain(jti) and db_check(jti)
+
+
+def timed(fn, jtis) -> float:
+    """Return the wall-clock seconds for checking all JTIs."""
+    started = time.perf_counter()
+    for jti in jtis:
+        fn(jti)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    """Parse arguments, run the checks and the purge, print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--checks", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        started = time.perf_counter()
+        populate(args.rows)
+        filled = time.perf_counter() - started
+        jtis = [uuid.uuid4().hex for _ in range(args.checks)]
+        started = time.perf_counter()
+        get_blacklist_filter().rebuild()
+        built = time.perf_counter() - started
+        db = timed(db_check, jtis)
+        filtered = timed(filtered_check, jtis)
+        started = time.perf_counter()
+        purged = purge_expired_tokens(args.batch_size)
+        purge = time.perf_counter() - started
+        remaining = OutstandingToken.objects.count()
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    per_check = 1e6 / args.checks
+    print(f"rows: {args.rows} (filled in {filled:.1f} s)")
+    print(f"bloom filter build:  {built * 1000:8.1f} ms")
+    print(f"DB blacklist check:  {db * per_check:8.1f} us/refresh")
+    print(f"bloom-filtered:      {filtered * per_check:8.1f} us/refresh")
+    print(f"speedup:             {db / filtered:8.1f}x")
+    print(
+        f"purge: {purged} expired tokens in {purge:.1f} s "
+        f"(batch {args.batch_size}), {remaining} left"
+    )
+
+
+if __name__ == "__main__":
+    main()
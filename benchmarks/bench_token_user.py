@@ -0,0 +1,87 @@
+"""Benchmark /api/quizzes/ with and without the lazy JWT token user.
+
+Usage (from the project root)::
+
+    python -m benchmarks.bench_token_user [--requests 2000] [--quizzes 5]
+
+A throwaway test database gets one user with a few quizzes. The list is
+requested repeatedly through the Django test client with the access
+token cookie, once with JWT_TOKEN_USER off (one user SELECT per request)
+and once with it on. The response cache is cleared before every request
+unless --response-cache is passed, so both runs do the same view work.
+"""
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from auth_app.utils.token_user import clear_active_flags  # noqa: E402
+from quiz_app.utils.response_cache import get_cache  # noqa: E402
+
+from .bench_serializers import populate  # noqa: E402
+
+
+def run(client: Client, requests: int, clear_cache: bool) -> tuple[float, int]:
+    """Issue the list requests; return elapsed seconds and queries per request."""
+    cache = get_cache()
+    cache.clear()
+    client.get("/api/quizzes/")
+    if clear_cache:
+        cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/api/quizzes/")
+    query_count = len(queries)
+    started = time.perf_counter()
+    for _ in range(requests):
+        if clear_cache:
+            cache.clear()
+        response = client.get("/api/quizzes/")
+        if response.status_code != 200:
+            raise SystemExit(f"Unexpected status {response.status_code}")
+    elapsed = time.perf_counter() - started
+    return elapsed, query_count
+
+
+def main() -> None:
+    """Parse arguments, run both modes and print requests per second."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--quizzes", type=int, default=5)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--response-cache", action="store_true")
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    results = {}
+    try:
+        user = populate(args.quizzes, args.questions)
+        client = Client()
+        client.cookies["access_token"] = str(RefreshToken.for_user(user).access_token)
+        for label, token_user in (("user lookup", False), ("token user", True)):
+            clear_active_flags()
+            with override_settings(JWT_TOKEN_USER=token_user):
+                results[label] = run(client, args.requests, not args.response_cache)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(f"requests: {args.requests}, quizzes: {args.quizzes} x {args.questions}")
+    for label, (elapsed, queries) in results.items():
+        rate = args.requests / elapsed
+        print(f"{label:12} {rate:8.0f} req/s  ({queries} queries/request)")
+    baseline = results["user lookup"][0]
+    print(f"speedup:     {baseline / results['token user'][0]:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
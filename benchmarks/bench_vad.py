@@ -0,0 +1,81 @@
+"""Benchmark Whisper runtime on silence-trimmed vs. untrimmed audio.
+
+Usage (from the project root)::
+
+    python -m benchmarks.bench_vad [AUDIO_FILE] [--model tiny] [--repeat 1]
+
+Without AUDIO_FILE a synthetic lecture-like signal is used: short tone
+bursts separated by long pauses. ``--vad-only`` skips Whisper and only
+times the trimming stage.
+"""
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+import numpy as np  # noqa: E402
+import whisper  # noqa: E402
+from whisper.audio import SAMPLE_RATE, load_audio  # noqa: E402
+
+from quiz_app.utils.audio_preprocessing import trim_silence_with_settings  # noqa: E402
+
+
+def synthetic_lecture(minutes: float) -> np.ndarray:
+    """Build alternating 20 s "speech" and 10 s silence segments."""
+    rng = np.random.default_rng(0)
+    t = np.arange(20 * SAMPLE_RATE) / SAMPLE_RATE
+    speech = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+    silence = 0.0005 * rng.standard_normal(10 * SAMPLE_RATE)
+    block = np.concatenate([speech, silence]).astype(np.float32)
+    repeats = max(1, int(minutes * 60 // 30))
+    return np.tile(block, repeats)
+
+
+def best_of(repeat: int, fn) -> float:
+    """Return the fastest wall-clock time of ``repeat`` runs."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    """Parse arguments, run both variants and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("audio_file", nargs="?")
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--minutes", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--vad-only", action="store_true")
+    args = parser.parse_args()
+
+    if args.audio_file:
+        samples = load_audio(args.audio_file)
+    else:
+        samples = synthetic_lecture(args.minutes)
+    vad_seconds = best_of(args.repeat, lambda: trim_silence_with_settings(samples))
+    trimmed = trim_silence_with_settings(samples)
+    print(f"audio length:     {samples.size / SAMPLE_RATE:8.1f} s")
+    print(f"after trimming:   {trimmed.size / SAMPLE_RATE:8.1f} s")
+    print(f"VAD runtime:      {vad_seconds * 1000:8.1f} ms")
+    if args.vad_only:
+        return
+
+    model = whisper.load_model(args.model)
+    untrimmed_seconds = best_of(args.repeat, lambda: model.transcribe(samples))
+    trimmed_seconds = best_of(args.repeat, lambda: model.transcribe(trimmed))
+    total_trimmed = trimmed_seconds + vad_seconds
+    print(f"whisper untrimmed:{untrimmed_seconds:8.1f} s")
+    print(f"whisper trimmed:  {total_trimmed:8.1f} s (incl. VAD)")
+    print(f"speed-up:         {untrimmed_seconds / total_trimmed:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Tell server and worker processes apart from one-off management commands."""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Mapping, Optional, Sequence
+
+from django.conf import settings
+
+SERVER_COMMANDS = {"runserver", "run_quiz_worker"}
+SERVER_PROGRAMS = {"daphne", "gunicorn", "hypercorn", "uvicorn", "uwsgi"}
+
+
+def is_serving_process(
+    argv: Optional[Sequence[str]] = None,
+    environ: Optional[Mapping[str, str]] = None,
+) -> bool:
+    """Return True if this process serves requests or runs quiz jobs.
+
+    Background threads started from AppConfig.ready() use this so that
+    commands like ``migrate`` or ``test`` do not start them. The
+    START_BACKGROUND_TASKS setting ("True"/"False") overrides the guess.
+    """
+    configured = settings.START_BACKGROUND_TASKS
+    if configured in ("True", "False"):
+        return configured == "True"
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    program = os.path.basename(argv[0]) if argv else ""
+    if program in SERVER_PROGRAMS:
+        return True
+    command = argv[1] if len(argv) > 1 else ""
+    if command == "runserver":
+        # The autoreloader's parent only watches files; its child serves.
+        return "--noreload" in argv or environ.get("RUN_MAIN") == "true"
+    return command in SERVER_COMMANDS
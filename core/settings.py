@@ -3,6 +3,7 @@
 from datetime import timedelta
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -117,6 +118,32 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing: PASSWORD_HASHER picks the hasher for new and rehashed
+# passwords (pbkdf2 | scrypt | argon2, argon2 needs argon2-cffi); the
+# others stay listed so existing hashes keep working and are upgraded
+# on the next login.
+
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "1000000"))
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv("PASSWORD_SCRYPT_WORK_FACTOR", "16384"))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.getenv("PASSWORD_SCRYPT_BLOCK_SIZE", "8"))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv("PASSWORD_SCRYPT_PARALLELISM", "1"))
+PASSWORD_ARGON2_TIME_COST = int(os.getenv("PASSWORD_ARGON2_TIME_COST", "2"))
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", "102400"))
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv("PASSWORD_ARGON2_PARALLELISM", "8"))
+
+_TUNED_HASHERS = {
+    "pbkdf2": "auth_app.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "auth_app.hashers.TunedScryptPasswordHasher",
+    "argon2": "auth_app.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    _TUNED_HASHERS[PASSWORD_HASHER],
+    *(path for name, path in _TUNED_HASHERS.items() if name != PASSWORD_HASHER),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -161,4 +188,234 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:5500",
 ]
 
-CORS_ALLOW_CREDENTIALS = True
\ No newline at end of file
+CORS_ALLOW_CREDENTIALS = True
+
+# Quiz generation jobs
+# "thread" runs jobs in an in-process pool, "external" leaves them to
+# `manage.py run_quiz_worker`, "eager" runs them inline (tests only).
+# A user runs at most QUIZ_JOB_MAX_PER_USER jobs at once (0 = no limit).
+# Running jobs touch their row every QUIZ_JOB_HEARTBEAT_SECONDS; jobs
+# silent for QUIZ_JOB_STALE_SECONDS are requeued (their worker died).
+
+QUIZ_JOB_MODE = os.getenv("QUIZ_JOB_MODE", "thread")
+QUIZ_JOB_WORKERS = int(os.getenv("QUIZ_JOB_WORKERS", "2"))
+QUIZ_JOB_MAX_PER_USER = int(os.getenv("QUIZ_JOB_MAX_PER_USER", "2"))
+QUIZ_JOB_HEARTBEAT_SECONDS = float(os.getenv("QUIZ_JOB_HEARTBEAT_SECONDS", "30"))
+QUIZ_JOB_STALE_SECONDS = float(os.getenv("QUIZ_JOB_STALE_SECONDS", "300"))
+
+
+# Transcript cache (per YouTube video ID, LRU-evicted by total text size)
+
+TRANSCRIPT_CACHE_MAX_BYTES = int(
+    os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(200 * 1024 * 1024))
+)
+
+
+# Single-flight deduplication of pipeline stages per video ID
+
+SINGLE_FLIGHT_LOCK_DIR = BASE_DIR / "tmp" / "locks"
+SINGLE_FLIGHT_TIMEOUT = int(os.getenv("SINGLE_FLIGHT_TIMEOUT", "1800"))
+
+
+# Streaming transcription (decode and transcribe while downloading)
+
+STREAMING_TRANSCRIPTION = os.getenv("STREAMING_TRANSCRIPTION", "False") == "True"
+STREAMING_CHUNK_SECONDS = int(os.getenv("STREAMING_CHUNK_SECONDS", "30"))
+STREAMING_MAX_BUFFERED_CHUNKS = int(
+    os.getenv("STREAMING_MAX_BUFFERED_CHUNKS", "8")
+)
+
+
+# Whisper model pool
+# WHISPER_THREADS_PER_MODEL=0 splits the CPU cores evenly between instances.
+
+WHISPER_MODEL_NAME = os.getenv("WHISPER_MODEL_NAME", "tiny")
+WHISPER_POOL_SIZE = int(os.getenv("WHISPER_POOL_SIZE", "1"))
+WHISPER_THREADS_PER_MODEL = int(os.getenv("WHISPER_THREADS_PER_MODEL", "0"))
+WHISPER_CHECKOUT_TIMEOUT = int(os.getenv("WHISPER_CHECKOUT_TIMEOUT", "600"))
+WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "False") == "True"
+
+# Background threads started at app load (Whisper warm-up, token purge)
+# only run in server/worker processes; "auto" guesses from the command
+# line, "True"/"False" force it.
+START_BACKGROUND_TASKS = os.getenv("START_BACKGROUND_TASKS", "auto")
+
+
+# Transcription backend ("inline" uses the model pool in the calling thread,
+# "process" runs Whisper in a pool of worker processes)
+
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "inline")
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "2"))
+TRANSCRIPTION_MAX_PENDING = int(os.getenv("TRANSCRIPTION_MAX_PENDING", "4"))
+TRANSCRIPTION_TIMEOUT = int(os.getenv("TRANSCRIPTION_TIMEOUT", "1800"))
+TRANSCRIPTION_SUBMIT_TIMEOUT = int(os.getenv("TRANSCRIPTION_SUBMIT_TIMEOUT", "30"))
+
+
+# Audio pre-processing (energy-based silence trimming before Whisper)
+
+AUDIO_VAD_ENABLED = os.getenv("AUDIO_VAD_ENABLED", "True") == "True"
+AUDIO_VAD_THRESHOLD_DB = float(os.getenv("AUDIO_VAD_THRESHOLD_DB", "-35"))
+AUDIO_VAD_MIN_SILENCE_MS = int(os.getenv("AUDIO_VAD_MIN_SILENCE_MS", "700"))
+AUDIO_VAD_PADDING_MS = int(os.getenv("AUDIO_VAD_PADDING_MS", "200"))
+
+
+# Parallel transcription of long audio in overlapping windows
+
+TRANSCRIPTION_WINDOW_SECONDS = int(os.getenv("TRANSCRIPTION_WINDOW_SECONDS", "300"))
+TRANSCRIPTION_WINDOW_OVERLAP_SECONDS = int(
+    os.getenv("TRANSCRIPTION_WINDOW_OVERLAP_SECONDS", "5")
+)
+TRANSCRIPTION_MAX_WORKERS_PER_JOB = int(
+    os.getenv("TRANSCRIPTION_MAX_WORKERS_PER_JOB", "4")
+)
+
+
+# Prompt size control (tiktoken's cl100k_base approximates Gemini tokens)
+
+GEMINI_TRANSCRIPT_TOKEN_BUDGET = int(
+    os.getenv("GEMINI_TRANSCRIPT_TOKEN_BUDGET", "12000")
+)
+PROMPT_TOKEN_ENCODING = os.getenv("PROMPT_TOKEN_ENCODING", "cl100k_base")
+
+
+# Logging (pipeline timings, cache statistics, token savings)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "quiz_app": {
+            "handlers": ["console"],
+            "level": os.getenv("QUIZLY_LOG_LEVEL", "INFO"),
+        },
+    },
+}
+
+
+# Gemini client pooling (GEMINI_BASE_URL is only needed for proxies/stubs)
+
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "")
+GEMINI_MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", "10"))
+GEMINI_KEEPALIVE_SECONDS = float(os.getenv("GEMINI_KEEPALIVE_SECONDS", "60"))
+GEMINI_MAX_CONCURRENT_CALLS = int(os.getenv("GEMINI_MAX_CONCURRENT_CALLS", "4"))
+GEMINI_SLOT_TIMEOUT = int(os.getenv("GEMINI_SLOT_TIMEOUT", "300"))
+
+
+# Async (ASGI) quiz generation: threads for blocking stages
+
+ASYNC_PIPELINE_WORKERS = int(os.getenv("ASYNC_PIPELINE_WORKERS", "4"))
+
+
+# Generated quiz cache (keyed by Gemini model + prompt hash)
+# Every user gets an own copy of the stored quiz JSON snapshot.
+
+QUIZ_CACHE_TTL_SECONDS = int(os.getenv("QUIZ_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+QUIZ_CACHE_MAX_ENTRIES = int(os.getenv("QUIZ_CACHE_MAX_ENTRIES", "5000"))
+
+
+# Outbound call resilience (deadlines, retries, circuit breakers)
+
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "120"))
+GEMINI_RETRY_ATTEMPTS = int(os.getenv("GEMINI_RETRY_ATTEMPTS", "3"))
+GEMINI_RETRY_MAX_WAIT = float(os.getenv("GEMINI_RETRY_MAX_WAIT", "20"))
+YOUTUBE_SOCKET_TIMEOUT = float(os.getenv("YOUTUBE_SOCKET_TIMEOUT", "30"))
+YOUTUBE_CALL_TIMEOUT = float(os.getenv("YOUTUBE_CALL_TIMEOUT", "600"))
+YOUTUBE_RETRY_ATTEMPTS = int(os.getenv("YOUTUBE_RETRY_ATTEMPTS", "3"))
+YOUTUBE_RETRY_MAX_WAIT = float(os.getenv("YOUTUBE_RETRY_MAX_WAIT", "10"))
+CIRCUIT_BREAKER_FAILURE_RATE = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5"))
+CIRCUIT_BREAKER_MIN_CALLS = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "5"))
+CIRCUIT_BREAKER_WINDOW_SECONDS = float(os.getenv("CIRCUIT_BREAKER_WINDOW_SECONDS", "60"))
+CIRCUIT_BREAKER_RECOVERY_SECONDS = float(
+    os.getenv("CIRCUIT_BREAKER_RECOVERY_SECONDS", "30")
+)
+# Retry-After of 429/503 answers when a user or worker limit is reached
+BUSY_RETRY_AFTER_SECONDS = int(os.getenv("BUSY_RETRY_AFTER_SECONDS", "30"))
+
+
+# Stream Gemini output and save each question as soon as it is complete
+
+GEMINI_STREAMING = os.getenv("GEMINI_STREAMING", "False") == "True"
+
+
+# Server-sent progress events of quiz jobs
+
+QUIZ_JOB_PROGRESS_INTERVAL = float(os.getenv("QUIZ_JOB_PROGRESS_INTERVAL", "1"))
+QUIZ_JOB_EVENTS_POLL_SECONDS = float(os.getenv("QUIZ_JOB_EVENTS_POLL_SECONDS", "1"))
+QUIZ_JOB_EVENTS_HEARTBEAT_SECONDS = float(
+    os.getenv("QUIZ_JOB_EVENTS_HEARTBEAT_SECONDS", "15")
+)
+QUIZ_JOB_EVENTS_TIMEOUT = float(os.getenv("QUIZ_JOB_EVENTS_TIMEOUT", "600"))
+QUIZ_JOB_EVENTS_RETRY_MS = int(os.getenv("QUIZ_JOB_EVENTS_RETRY_MS", "3000"))
+
+
+# Quiz list pagination (cursor based, links in the Link header)
+
+QUIZ_LIST_PAGE_SIZE = int(os.getenv("QUIZ_LIST_PAGE_SIZE", "100"))
+
+
+# Per-user cache of quiz list/detail responses (ETag + version stamps)
+# The file backend is shared by all processes on one host; use Redis or
+# the database cache across hosts. locmem is per process and only fits a
+# single process: other processes' writes show up after at most the TTL.
+
+QUIZ_RESPONSE_CACHE_TTL = int(os.getenv("QUIZ_RESPONSE_CACHE_TTL", "300"))
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "quiz_responses": {
+        "BACKEND": os.getenv(
+            "QUIZ_RESPONSE_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.getenv(
+            "QUIZ_RESPONSE_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "quizly-responses"),
+        ),
+        "TIMEOUT": QUIZ_RESPONSE_CACHE_TTL,
+    },
+}
+
+
+# Stateless JWT fast path: request.user is a lazy proxy built from the
+# token claims; only the is_active flag is checked, from a per-process
+# TTL cache (deactivations take up to the TTL to apply everywhere).
+
+JWT_TOKEN_USER = os.getenv("JWT_TOKEN_USER", "False") == "True"
+JWT_ACTIVE_USER_CACHE_TTL = float(os.getenv("JWT_ACTIVE_USER_CACHE_TTL", "60"))
+JWT_ACTIVE_USER_CACHE_SIZE = int(os.getenv("JWT_ACTIVE_USER_CACHE_SIZE", "10000"))
+
+
+# Validated access tokens are cached per process (keyed by SHA-256 of the
+# raw JWT) until their exp claim; 0 disables the cache.
+
+JWT_TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE", "4096"))
+
+
+# token_blacklist maintenance: an opt-in per-process bloom filter of
+# blacklisted JTIs lets most refreshes skip the blacklist query. Logouts
+# in other processes only take effect here after up to
+# JWT_BLACKLIST_BLOOM_SYNC_SECONDS, so keep that short. Expired
+# outstanding tokens are purged in batches, either with
+# "manage.py purge_expired_tokens" or every JWT_TOKEN_PURGE_INTERVAL
+# seconds in-process (0 = off).
+
+JWT_BLACKLIST_BLOOM_FILTER = os.getenv("JWT_BLACKLIST_BLOOM_FILTER", "False") == "True"
+JWT_BLACKLIST_BLOOM_CAPACITY = int(os.getenv("JWT_BLACKLIST_BLOOM_CAPACITY", "100000"))
+JWT_BLACKLIST_BLOOM_ERROR_RATE = float(
+    os.getenv("JWT_BLACKLIST_BLOOM_ERROR_RATE", "0.01")
+)
+JWT_BLACKLIST_BLOOM_SYNC_SECONDS = float(
+    os.getenv("JWT_BLACKLIST_BLOOM_SYNC_SECONDS", "5")
+)
+JWT_TOKEN_PURGE_INTERVAL = float(os.getenv("JWT_TOKEN_PURGE_INTERVAL", "0"))
+JWT_TOKEN_PURGE_BATCH_SIZE = int(os.getenv("JWT_TOKEN_PURGE_BATCH_SIZE", "5000"))
+
+
+# Batch quiz generation (URL lists and playlists) per request
+
+QUIZ_BATCH_MAX_ITEMS = int(os.getenv("QUIZ_BATCH_MAX_ITEMS", "50"))
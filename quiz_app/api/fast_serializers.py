@@ -0,0 +1,89 @@
+"""values()-based serialization for hot quiz read paths.
+
+The output matches QuizSerializer exactly (same keys, order and value
+formats) but skips DRF field objects, model instances and OrderedDicts.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.utils import timezone
+
+from quiz_app.models import Question, Quiz
+
+QUIZ_FIELDS = ("id", "title", "description", "created_at", "updated_at", "video_url")
+QUESTION_FIELDS = ("id", "question_title", "question_options", "answer")
+
+
+def format_datetime(value: datetime) -> str:
+    """Format like DRF's DateTimeField with the ISO 8601 setting."""
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def serialize_quiz_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Serialize quiz value dicts and attach their questions in one query."""
+    rows = list(rows)
+    questions = questions_by_quiz([row["id"] for row in rows])
+    return [_quiz_dict(row, questions.get(row["id"], [])) for row in rows]
+
+
+def fetch_quiz_detail(pk: int) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """Load a quiz, its owner id and its questions in one LEFT JOIN query.
+
+    Returns ``(owner_id, data)`` or None if the quiz does not exist.
+    """
+    question_columns = [f"questions__{field}" for field in QUESTION_FIELDS]
+    rows = list(
+        Quiz.objects.filter(pk=pk)
+        .order_by("questions__id")
+        .values_list(*QUIZ_FIELDS, "user_id", *question_columns)
+    )
+    if not rows:
+        return None
+    split = len(QUIZ_FIELDS)
+    quiz = dict(zip(QUIZ_FIELDS, rows[0][:split]))
+    questions = [
+        dict(zip(QUESTION_FIELDS, row[split + 1:]))
+        for row in rows
+        if row[split + 1] is not None
+    ]
+    return rows[0][split], _quiz_dict(quiz, questions)
+
+
+def questions_by_quiz(quiz_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Return question dicts grouped by quiz id, ordered by question id."""
+    grouped: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    if not quiz_ids:
+        return grouped
+    rows = (
+        Question.objects.filter(quiz_id__in=quiz_ids)
+        .order_by("id")
+        .values_list("quiz_id", *QUESTION_FIELDS)
+    )
+    for quiz_id, pk, title, options, answer in rows:
+        grouped[quiz_id].append(
+            {
+                "id": pk,
+                "question_title": title,
+                "question_options": options,
+                "answer": answer,
+            }
+        )
+    return grouped
+
+
+def _quiz_dict(row: Dict[str, Any], questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the output dict in QuizSerializer field order."""
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "description": row["description"],
+        "created_at": format_datetime(row["created_at"]),
+        "updated_at": format_datetime(row["updated_at"]),
+        "video_url": row["video_url"],
+        "questions": questions,
+    }
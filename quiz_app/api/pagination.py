@@ -0,0 +1,29 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class QuizCursorPagination(CursorPagination):
+    """
+    Cursor pagination over (created_at, id) that keeps the plain list body
+    and sends the next/prev page URLs in an RFC 8288 Link header.
+    """
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_page_size(self, request):
+        self.page_size = settings.QUIZ_LIST_PAGE_SIZE
+        return super().get_page_size(request)
+
+    def get_paginated_response(self, data):
+        links = [
+            f'<{url}>; rel="{rel}"'
+            for rel, url in (
+                ("next", self.get_next_link()),
+                ("prev", self.get_previous_link()),
+            )
+            if url
+        ]
+        headers = {"Link": ", ".join(links)} if links else None
+        return Response(data, headers=headers)
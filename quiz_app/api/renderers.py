@@ -0,0 +1,44 @@
+import json
+
+from rest_framework.compat import LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from quiz_app.utils.job_events import format_sse
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Accept text/event-stream requests and render errors as an SSE event.
+    """
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return format_sse(None, "error", data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Byte-compatible JSONRenderer that reuses one C-accelerated encoder.
+
+    Plain data (as produced by fast_serializers) skips the per-call
+    encoder setup; anything else falls back to the default path.
+    """
+    encoder = json.JSONEncoder(
+        ensure_ascii=JSONRenderer.ensure_ascii,
+        allow_nan=not JSONRenderer.strict,
+        separators=SHORT_SEPARATORS if JSONRenderer.compact else LONG_SEPARATORS,
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or self.get_indent(
+            accepted_media_type or "", renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            text = self.encoder.encode(data)
+        except (TypeError, ValueError):
+            return super().render(data, accepted_media_type, renderer_context)
+        text = text.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+        return text.encode()
@@ -1,8 +1,9 @@
 """Serializers for quiz creation and quiz management."""
 
+from django.conf import settings
 from rest_framework import serializers
 
-from quiz_app.models import Quiz, Question
+from quiz_app.models import Quiz, QuizJob, Question
 
 
 class CreateQuizSerializer(serializers.Serializer):
@@ -13,6 +14,32 @@ class CreateQuizSerializer(serializers.Serializer):
     )
 
 
+class CreateQuizBatchSerializer(serializers.Serializer):
+    """Validate input for the batch createQuiz endpoint."""
+
+    urls = serializers.ListField(
+        child=serializers.URLField(),
+        required=False,
+        allow_empty=False,
+        help_text="List of YouTube video URLs",
+    )
+    playlist_url = serializers.URLField(
+        required=False,
+        help_text="YouTube playlist URL, e.g. https://www.youtube.com/playlist?list=ID",
+    )
+
+    def validate(self, attrs):
+        """Require exactly one of urls and playlist_url within the limit."""
+        if ("urls" in attrs) == ("playlist_url" in attrs):
+            msg = "Provide either urls or playlist_url."
+            raise serializers.ValidationError(msg)
+        limit = settings.QUIZ_BATCH_MAX_ITEMS
+        if len(attrs.get("urls", [])) > limit:
+            msg = f"At most {limit} URLs per batch."
+            raise serializers.ValidationError({"urls": msg})
+        return attrs
+
+
 class QuestionSerializer(serializers.ModelSerializer):
     """Serialize a question without timestamps (for list/detail responses)."""
 
@@ -62,6 +89,15 @@ class QuizSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at", "questions"]
 
 
+class QuizSummarySerializer(serializers.ModelSerializer):
+    """Serialize only what list screens show, without any questions."""
+
+    class Meta:
+        model = Quiz
+        fields = ["id", "title", "created_at"]
+        read_only_fields = fields
+
+
 class QuizWithTimestampsSerializer(serializers.ModelSerializer):
     """Serialize a quiz where each question includes timestamps."""
 
@@ -78,4 +114,25 @@ class QuizWithTimestampsSerializer(serializers.ModelSerializer):
             "video_url",
             "questions",
         ]
-        read_only_fields = ["id", "created_at", "updated_at", "questions"]
\ No newline at end of file
+        read_only_fields = ["id", "created_at", "updated_at", "questions"]
+
+
+class QuizJobSerializer(serializers.ModelSerializer):
+    """Serialize a quiz generation job and its finished quiz, if any."""
+
+    quiz = QuizWithTimestampsSerializer(read_only=True)
+
+    class Meta:
+        model = QuizJob
+        fields = [
+            "id",
+            "status",
+            "url",
+            "error",
+            "created_at",
+            "updated_at",
+            "started_at",
+            "finished_at",
+            "quiz",
+        ]
+        read_only_fields = fields
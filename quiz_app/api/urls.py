@@ -2,10 +2,34 @@
 
 from django.urls import path
 
-from .views import CreateQuizView, QuizDetailView, QuizListView
+from .views import (
+    AsyncCreateQuizView,
+    CreateQuizBatchView,
+    CreateQuizView,
+    QuizDetailView,
+    QuizJobDetailView,
+    QuizJobEventsView,
+    QuizListView,
+)
 
 urlpatterns = [
     path("createQuiz/", CreateQuizView.as_view(), name="create-quiz"),
+    path(
+        "createQuiz/batch/",
+        CreateQuizBatchView.as_view(),
+        name="create-quiz-batch",
+    ),
+    path(
+        "createQuiz/async/",
+        AsyncCreateQuizView.as_view(),
+        name="create-quiz-async",
+    ),
     path("quizzes/", QuizListView.as_view(), name="quiz-list"),
     path("quizzes/<int:pk>/", QuizDetailView.as_view(), name="quiz-detail"),
+    path("jobs/<int:pk>/", QuizJobDetailView.as_view(), name="quiz-job-detail"),
+    path(
+        "jobs/<int:pk>/events/",
+        QuizJobEventsView.as_view(),
+        name="quiz-job-events",
+    ),
 ]
\ No newline at end of file
@@ -1,66 +1,412 @@
 """API views for creating and managing quizzes."""
 
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import generics, status
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import (
+    APIException,
+    PermissionDenied,
+    ValidationError,
+)
 from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from yt_dlp.utils import DownloadError
 
-from quiz_app.models import Quiz
-from quiz_app.utils.quiz_pipeline import create_quiz_from_youtube_url
+from auth_app.authentication import CookieJWTAuthentication
+from quiz_app.models import Quiz, QuizJob
+from quiz_app.utils.async_pipeline import acreate_quiz_from_youtube_url
+from quiz_app.utils.batch import ITEM_QUEUED, enqueue_quiz_batch
+from quiz_app.utils.gemini_client import GeminiBusyError
+from quiz_app.utils.job_events import aiter_job_events, iter_job_events
+from quiz_app.utils.jobs import (
+    GENERIC_JOB_ERROR,
+    ajob_heartbeat,
+    enqueue_quiz_job,
+    finish_inline_job,
+    start_inline_job,
+)
+from quiz_app.utils.resilience import CircuitOpenError, open_circuits
+from quiz_app.utils.response_cache import (
+    etag_matches,
+    get_cached_response,
+    invalidate_user_quizzes,
+    make_etag,
+    response_cache_key,
+    store_response,
+)
+from quiz_app.utils.transcription_backends import TranscriptionBusyError
+from quiz_app.utils.youtube import (
+    expand_youtube_playlist,
+    extract_youtube_video_id,
+    is_transient_youtube_error,
+)
 
+from .fast_serializers import QUIZ_FIELDS, fetch_quiz_detail, serialize_quiz_rows
+from .pagination import QuizCursorPagination
 from .parsers import PlainTextJSONParser
+from .renderers import EventStreamRenderer, FastJSONRenderer
 from .serializers import (
+    CreateQuizBatchSerializer,
     CreateQuizSerializer,
+    QuizJobSerializer,
     QuizSerializer,
+    QuizSummarySerializer,
     QuizWithTimestampsSerializer,
 )
 
 
+class ServiceUnavailable(APIException):
+    """503 response used while an upstream service's circuit is open."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Service temporarily unavailable, try again later."
+    default_code = "service_unavailable"
+
+
+def _raise_if_circuit_open() -> None:
+    """Fail fast instead of queueing work that is bound to fail."""
+    services = open_circuits()
+    if services:
+        names = ", ".join(services)
+        msg = f"Quiz generation is unavailable ({names}). Please try again later."
+        raise ServiceUnavailable(msg)
+
+
 class CreateQuizView(APIView):
-    """Create a quiz from a YouTube URL."""
+    """Queue quiz generation for a YouTube URL."""
 
     permission_classes = [IsAuthenticated]
     parser_classes = [JSONParser, PlainTextJSONParser]
 
     def post(self, request):
-        """Validate input and trigger quiz creation."""
+        """Validate input and enqueue a quiz generation job."""
         serializer = CreateQuizSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         url = serializer.validated_data["url"]
         try:
-            quiz = create_quiz_from_youtube_url(url, request.user)
+            extract_youtube_video_id(url)
         except ValueError as error:
             detail = {"detail": str(error) or "Invalid YouTube URL."}
             return Response(detail, status=status.HTTP_400_BAD_REQUEST)
-        data = QuizWithTimestampsSerializer(quiz).data
-        return Response(data, status=status.HTTP_201_CREATED)
+        _raise_if_circuit_open()
+        job = enqueue_quiz_job(url, request.user)
+        data = QuizJobSerializer(job).data
+        location = reverse("quiz-job-detail", args=[job.pk])
+        return Response(
+            data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": location},
+        )
+
+
+class CreateQuizBatchView(APIView):
+    """Queue quiz generation for a list of URLs or a whole playlist."""
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, PlainTextJSONParser]
+
+    def post(self, request):
+        """Expand the input, queue new videos and report each item."""
+        serializer = CreateQuizBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        _raise_if_circuit_open()
+        urls = serializer.validated_data.get("urls")
+        if urls is None:
+            urls = _expand_playlist(serializer.validated_data["playlist_url"])
+        items = enqueue_quiz_batch(urls, request.user)
+        queued = any(item["status"] == ITEM_QUEUED for item in items)
+        code = status.HTTP_202_ACCEPTED if queued else status.HTTP_200_OK
+        return Response({"items": items}, status=code)
+
+
+def _expand_playlist(playlist_url: str) -> list[str]:
+    """Return the playlist's video URLs or raise a 400/503 API error."""
+    try:
+        urls = expand_youtube_playlist(playlist_url, settings.QUIZ_BATCH_MAX_ITEMS)
+    except ValueError as error:
+        raise ValidationError({"playlist_url": str(error)})
+    except CircuitOpenError as error:
+        raise ServiceUnavailable(str(error))
+    except DownloadError as error:
+        if is_transient_youtube_error(error):
+            raise ServiceUnavailable("YouTube is not reachable right now.")
+        raise ValidationError({"playlist_url": "Could not load the YouTube playlist."})
+    if not urls:
+        raise ValidationError({"playlist_url": "The playlist contains no videos."})
+    return urls
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncCreateQuizView(View):
+    """Create a quiz and respond once it is ready, without blocking a thread.
+
+    Meant for ASGI servers: while the pipeline runs, the request only
+    occupies a coroutine on the event loop. The run is tracked as a quiz
+    job, so it counts towards QUIZ_JOB_MAX_PER_USER (429 at the limit).
+    """
+
+    http_method_names = ["post"]
+
+    async def post(self, request):
+        """Authenticate, validate input and await the async pipeline."""
+        user = await _aauthenticate(request)
+        if user is None:
+            detail = {"detail": "Authentication credentials were not provided."}
+            return JsonResponse(detail, status=status.HTTP_401_UNAUTHORIZED)
+        try:
+            payload = json.loads(request.body or b"{}")
+        except json.JSONDecodeError:
+            detail = {"detail": "JSON parse error."}
+            return JsonResponse(detail, status=status.HTTP_400_BAD_REQUEST)
+        serializer = CreateQuizSerializer(data=payload)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        url = serializer.validated_data["url"]
+        try:
+            extract_youtube_video_id(url)
+        except ValueError as error:
+            detail = {"detail": str(error) or "Invalid YouTube URL."}
+            return JsonResponse(detail, status=status.HTTP_400_BAD_REQUEST)
+        job = await sync_to_async(start_inline_job)(url, user)
+        if job is None:
+            msg = "Too many quizzes are being generated. Please try again later."
+            return _retry_later_response(
+                msg,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                settings.BUSY_RETRY_AFTER_SECONDS,
+            )
+        finish = sync_to_async(finish_inline_job)
+        try:
+            async with ajob_heartbeat(job.pk):
+                quiz = await acreate_quiz_from_youtube_url(url, user)
+        except ValueError as error:
+            msg = str(error) or "Invalid YouTube URL."
+            await finish(job, error=msg)
+            return JsonResponse({"detail": msg}, status=status.HTTP_400_BAD_REQUEST)
+        except CircuitOpenError as error:
+            await finish(job, error=str(error))
+            return _retry_later_response(
+                str(error),
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                settings.CIRCUIT_BREAKER_RECOVERY_SECONDS,
+            )
+        except (GeminiBusyError, TranscriptionBusyError) as error:
+            await finish(job, error=str(error))
+            return _retry_later_response(
+                "Quiz generation is busy. Please try again later.",
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                settings.BUSY_RETRY_AFTER_SECONDS,
+            )
+        except BaseException:
+            await finish(job, error=GENERIC_JOB_ERROR)
+            raise
+        await finish(job, quiz=quiz)
+        data = await sync_to_async(_serialize_created_quiz)(quiz)
+        return JsonResponse(data, status=status.HTTP_201_CREATED)
+
+
+def _retry_later_response(detail: str, status_code: int, retry_after: float):
+    """Build an error response that tells clients when to retry."""
+    response = JsonResponse({"detail": detail}, status=status_code)
+    response["Retry-After"] = str(int(retry_after))
+    return response
 
 
-class QuizListView(generics.ListAPIView):
-    """List all quizzes for the authenticated user."""
+async def _aauthenticate(request):
+    """Run the cookie JWT authentication off the event loop."""
+    authenticator = CookieJWTAuthentication()
+    try:
+        result = await sync_to_async(authenticator.authenticate)(request)
+    except APIException:
+        return None
+    return result[0] if result else None
+
+
+def _serialize_created_quiz(quiz: Quiz) -> dict:
+    """Serialize a new quiz the same way the createQuiz response did."""
+    return QuizWithTimestampsSerializer(quiz).data
+
+
+class QuizJobDetailView(generics.RetrieveAPIView):
+    """Report status and result of a quiz generation job."""
+
+    serializer_class = QuizJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        """Return job instance or raise 403/404 like quiz detail."""
+        return _get_own_job(self.request.user, self.kwargs.get("pk"))
+
+
+class QuizJobEventsView(APIView):
+    """Stream progress events of a quiz job as server-sent events.
+
+    On WSGI servers every connection holds a worker thread while it
+    polls, so keep QUIZ_JOB_EVENTS_TIMEOUT moderate there. Under ASGI the
+    stream is an async generator that waits on the event loop.
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get(self, request, pk):
+        """Send stored events, then new ones until the job has finished."""
+        job = _get_own_job(request.user, pk)
+        last_event_id = request.headers.get("Last-Event-ID", "")
+        # A sync iterator would be drained completely before ASGI sends it.
+        stream = (
+            aiter_job_events
+            if isinstance(request._request, ASGIRequest)
+            else iter_job_events
+        )
+        events = stream(
+            job.pk,
+            int(last_event_id) if last_event_id.isdigit() else 0,
+        )
+        response = StreamingHttpResponse(events, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+def _get_own_job(user, pk) -> QuizJob:
+    """Return the user's job or raise 404/403."""
+    job = get_object_or_404(QuizJob, pk=pk)
+    if job.user_id != user.id:
+        msg = "You do not have permission to access this job."
+        raise PermissionDenied(msg)
+    return job
+
+
+class CachedReadMixin:
+    """Serve GET responses from the per-user response cache with ETags."""
+
+    cached_headers = ("Link",)
+
+    def cached_get(self, request, build) -> Response:
+        """Answer 304 or a cached copy, otherwise call ``build`` and store it."""
+        cache_key = response_cache_key(request.user.id, request.build_absolute_uri())
+        etag = make_etag(cache_key)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        entry = get_cached_response(cache_key)
+        if entry is None:
+            response = build()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            extra = {
+                name: response[name]
+                for name in self.cached_headers
+                if response.has_header(name)
+            }
+            entry = {"data": response.data, "headers": extra}
+            store_response(cache_key, entry["data"], extra)
+        return Response(entry["data"], headers={**entry["headers"], **headers})
+
+
+class QuizListView(CachedReadMixin, generics.ListAPIView):
+    """List the authenticated user's quizzes, newest first, page by page.
+
+    ``?view=summary`` returns only id, title and created_at per quiz and
+    skips loading questions altogether.
+    """
 
     serializer_class = QuizSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = QuizCursorPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    view_modes = ("full", "summary")
+
+    def get_view_mode(self) -> str:
+        """Return the requested representation or raise 400."""
+        mode = self.request.query_params.get("view", "full")
+        if mode not in self.view_modes:
+            msg = f"Must be one of: {', '.join(self.view_modes)}."
+            raise ValidationError({"view": [msg]})
+        return mode
+
+    def get_serializer_class(self):
+        """Use the summary serializer for ?view=summary."""
+        if self.get_view_mode() == "summary":
+            return QuizSummarySerializer
+        return QuizSerializer
 
     def get_queryset(self):
-        """Return quizzes belonging to the current user."""
-        user = self.request.user
-        return Quiz.objects.filter(user=user).order_by("-created_at")
+        """Return the user's quizzes, newest first."""
+        quizzes = Quiz.objects.filter(user_id=self.request.user.id).order_by(
+            "-created_at", "-id"
+        )
+        if self.get_view_mode() == "summary":
+            return quizzes.only("id", "title", "created_at")
+        return quizzes
 
+    def list(self, request, *args, **kwargs):
+        """Return the cached page or build it."""
+        return self.cached_get(request, lambda: self._build_list(request))
 
-class QuizDetailView(generics.RetrieveUpdateDestroyAPIView):
+    def _build_list(self, request) -> Response:
+        """Serialize full quizzes from values() rows, two queries per page."""
+        if self.get_view_mode() == "summary":
+            return super().list(request)
+        rows = self.paginate_queryset(self.get_queryset().values(*QUIZ_FIELDS))
+        return self.get_paginated_response(serialize_quiz_rows(rows))
+
+
+class QuizDetailView(CachedReadMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a single quiz."""
 
     serializer_class = QuizSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
 
     def get_object(self):
-        """Return quiz instance or raise 403/404 as specified."""
+        """Return quiz instance or raise 403/404 as specified.
+
+        Ownership is compared on the row's user_id, so the owner is never
+        loaded; one query in total.
+        """
         quiz = get_object_or_404(Quiz, pk=self.kwargs.get("pk"))
-        if quiz.user != self.request.user:
+        self.check_owner(quiz.user_id)
+        return quiz
+
+    def check_owner(self, owner_id: int) -> None:
+        """Raise 403 unless the quiz belongs to the requesting user."""
+        if owner_id != self.request.user.id:
             msg = "You do not have permission to access this quiz."
             raise PermissionDenied(msg)
-        return quiz
\ No newline at end of file
+
+    def retrieve(self, request, *args, **kwargs):
+        """Serialize the quiz through the values()-based fast path."""
+        return self.cached_get(request, self._build_detail)
+
+    def _build_detail(self) -> Response:
+        """Check ownership and read quiz plus questions in one query."""
+        loaded = fetch_quiz_detail(self.kwargs.get("pk"))
+        if loaded is None:
+            raise Http404(f"No {Quiz._meta.object_name} matches the given query.")
+        owner_id, data = loaded
+        self.check_owner(owner_id)
+        return Response(data)
+
+    def perform_update(self, serializer):
+        """Save changes and drop the user's cached responses."""
+        super().perform_update(serializer)
+        invalidate_user_quizzes(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        """Delete the quiz and drop the user's cached responses."""
+        super().perform_destroy(instance)
+        invalidate_user_quizzes(self.request.user.id)
@@ -1,6 +1,35 @@
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+
+from core.process import is_serving_process
 
 
 class QuizAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'quiz_app'
+
+    def ready(self):
+        """Start the background work of server and worker processes.
+
+        In thread mode, stale and leftover jobs are recovered periodically;
+        the Whisper model pool is warmed up if enabled.
+        """
+        from quiz_app import checks  # noqa: F401  (registers system checks)
+
+        if not is_serving_process():
+            return
+        if settings.QUIZ_JOB_MODE == "thread":
+            from quiz_app.utils.jobs import start_job_recovery
+
+            start_job_recovery(settings.QUIZ_JOB_STALE_SECONDS)
+        if not settings.WHISPER_PRELOAD:
+            return
+        from quiz_app.utils.whisper_pool import get_model_pool
+
+        threading.Thread(
+            target=get_model_pool().warm_up,
+            name="whisper-warm-up",
+            daemon=True,
+        ).start()
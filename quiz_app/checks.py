@@ -0,0 +1,37 @@
+"""System checks for quiz app settings."""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from quiz_app.utils.response_cache import CACHE_ALIAS
+
+LOCMEM_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+
+
+@register(Tags.caches)
+def check_response_cache_backend(app_configs, **kwargs):
+    """Warn if other processes cannot invalidate the response cache."""
+    backend = settings.CACHES.get(CACHE_ALIAS, {}).get("BACKEND")
+    if backend != LOCMEM_BACKEND:
+        return []
+    if settings.QUIZ_JOB_MODE == "external":
+        msg = (
+            "The quiz response cache is per process, but quizzes are created "
+            "by run_quiz_worker processes."
+        )
+    else:
+        msg = (
+            "The quiz response cache is per process; with several server "
+            "workers each one serves its own stale copy."
+        )
+    return [
+        Warning(
+            msg,
+            hint=(
+                "Set QUIZ_RESPONSE_CACHE_BACKEND to a shared backend; until "
+                "then changes from other processes appear after "
+                "QUIZ_RESPONSE_CACHE_TTL."
+            ),
+            id="quiz_app.W001",
+        )
+    ]
@@ -0,0 +1,60 @@
+"""Management command that processes queued quiz jobs from the database."""
+
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from quiz_app.utils.jobs import claim_next_job, execute_job
+
+
+class Command(BaseCommand):
+    """Poll the quiz job table and run pending jobs in worker threads."""
+
+    help = "Run quiz generation jobs queued by the createQuiz endpoint."
+
+    def add_arguments(self, parser):
+        """Register worker count, poll interval and drain options."""
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--poll-interval", type=float, default=2.0)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no pending jobs are left.",
+        )
+
+    def handle(self, *args, **options):
+        """Start the worker threads and wait for them to finish."""
+        workers = [
+            threading.Thread(
+                target=self._work,
+                args=(options["poll_interval"], options["once"]),
+                name=f"quiz-worker-{index}",
+                daemon=True,
+            )
+            for index in range(max(1, options["workers"]))
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {len(workers)} quiz worker(s).")
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping quiz workers.")
+
+    def _work(self, poll_interval: float, once: bool) -> None:
+        """Claim and execute jobs until stopped or the queue is drained."""
+        try:
+            while True:
+                close_old_connections()
+                job_id = claim_next_job()
+                if job_id is not None:
+                    execute_job(job_id)
+                    continue
+                if once:
+                    return
+                time.sleep(poll_interval)
+        finally:
+            connection.close()
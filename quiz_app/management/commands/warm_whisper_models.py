@@ -0,0 +1,24 @@
+"""Management command that downloads and loads the Whisper model pool."""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from quiz_app.utils.whisper_pool import get_model_pool
+
+
+class Command(BaseCommand):
+    """Load every pooled Whisper instance to fill caches ahead of traffic."""
+
+    help = "Download and load the configured Whisper models."
+
+    def handle(self, *args, **options):
+        """Warm up the pool and report how long loading took."""
+        pool = get_model_pool()
+        started = time.perf_counter()
+        pool.warm_up()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Loaded {pool.size} x Whisper '{pool.model_name}' "
+            f"({pool.threads_per_model} threads each) in {elapsed:.1f}s."
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0004_generatedquiz'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizJobEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(max_length=32)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='quiz_app.quizjob')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
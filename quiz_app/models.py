@@ -18,6 +18,14 @@ class Quiz(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="quiz_user_created_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         """Return the quiz title for readable representations."""
         return self.title
@@ -39,4 +47,112 @@ class Question(models.Model):
 
     def __str__(self) -> str:
         """Return a readable representation for admin and debugging."""
-        return f"{self.quiz.title}: {self.question_title[:50]}"
\ No newline at end of file
+        return f"{self.quiz.title}: {self.question_title[:50]}"
+
+
+class Transcript(models.Model):
+    """Cached Whisper transcript of a YouTube video per Whisper model."""
+
+    video_id = models.CharField(max_length=64)
+    model_name = models.CharField(max_length=64)
+    text = models.TextField()
+    size_bytes = models.PositiveIntegerField()
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["video_id", "model_name"],
+                name="transcript_video_model_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return video ID and model for readable representations."""
+        return f"{self.video_id} ({self.model_name})"
+
+
+class GeneratedQuiz(models.Model):
+    """Cached Gemini quiz output keyed by a hash of model and prompt."""
+
+    key = models.CharField(max_length=64, unique=True)
+    quiz_data = models.JSONField()
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    last_accessed_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        """Return the cache key for readable representations."""
+        return self.key
+
+
+class QuizJob(models.Model):
+    """Tracks an asynchronous quiz generation request for a user."""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="quiz_jobs",
+    )
+    url = models.URLField()
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        db_index=True,
+    )
+    quiz = models.ForeignKey(
+        Quiz,
+        on_delete=models.SET_NULL,
+        related_name="jobs",
+        null=True,
+        blank=True,
+    )
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        """Return a readable representation for admin and debugging."""
+        return f"Job {self.pk} ({self.status}): {self.url}"
+
+    @property
+    def is_finished(self) -> bool:
+        """Return True once the job has either succeeded or failed."""
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+
+class QuizJobEvent(models.Model):
+    """Progress event of a quiz job, streamed to clients via SSE."""
+
+    job = models.ForeignKey(
+        QuizJob,
+        on_delete=models.CASCADE,
+        related_name="events",
+    )
+    stage = models.CharField(max_length=32)
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        """Return job id and stage for readable representations."""
+        return f"{self.job_id}: {self.stage}"
@@ -1,13 +1,100 @@
 """API tests for quiz creation and quiz management."""
 
-from unittest.mock import patch
+import asyncio
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import skipUnless
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
+import numpy as np
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
+from yt_dlp.utils import DownloadError
 
-from quiz_app.models import Quiz
+from core.process import is_serving_process
+from quiz_app.api.renderers import FastJSONRenderer
+from quiz_app.api.serializers import QuizSerializer
+from quiz_app.checks import LOCMEM_BACKEND, check_response_cache_backend
+from quiz_app.models import GeneratedQuiz, Question, Quiz, QuizJob, Transcript
+from quiz_app.utils.async_pipeline import acreate_quiz_from_youtube_url
+from quiz_app.utils.audio_preprocessing import preprocess_audio, trim_silence
+from quiz_app.utils.audio_stream import iter_pcm_chunks, open_pcm_stream
+from quiz_app.utils.condensation import condense_transcript, count_tokens
+from quiz_app.utils.gemini_client import (
+    GEMINI_BREAKER,
+    GeminiBusyError,
+    generate_quiz_from_transcript,
+    get_gemini_client,
+    stream_quiz_from_prompt,
+)
+from quiz_app.utils.job_events import record_job_event
+from quiz_app.utils.jobs import (
+    JobProgress,
+    claim_job,
+    claim_next_job,
+    execute_job,
+    requeue_stale_jobs,
+    run_job,
+)
+from quiz_app.utils.quiz_cache import (
+    evict_cached_quizzes,
+    quiz_cache_stats,
+    store_cached_quiz,
+)
+from quiz_app.utils.quiz_pipeline import (
+    _create_quiz_with_questions,
+    create_quiz_from_youtube_url,
+    get_transcript_for_video,
+)
+from quiz_app.utils.quiz_stream import QuizStreamParser
+from quiz_app.utils.resilience import CircuitBreaker, CircuitOpenError, get_breaker
+from quiz_app.utils.response_cache import get_cache as get_response_cache
+from quiz_app.utils.single_flight import single_flight
+from quiz_app.utils.transcript_cache import (
+    evict_transcripts,
+    get_cached_transcript,
+    store_transcript,
+)
+from quiz_app.utils.transcription import (
+    split_into_windows,
+    stitch_transcripts,
+    transcribe_audio,
+    transcribe_pcm_stream,
+)
+from quiz_app.utils.transcription_backends import (
+    ProcessPoolTranscriptionBackend,
+    TranscriptionBusyError,
+    TranscriptionError,
+    TranscriptionTimeoutError,
+)
+from quiz_app.utils.whisper_pool import WhisperModelPool
+from quiz_app.utils.youtube import (
+    YOUTUBE_BREAKER,
+    YouTubeTimeoutError,
+    extract_video_info,
+)
 
 User = get_user_model()
 
@@ -17,6 +104,7 @@ class BaseQuizApiTests(APITestCase):
 
     def setUp(self):
         """Create a default user used across quiz tests."""
+        get_response_cache().clear()
         self.password = "quizpassword123"
         self.user = User.objects.create_user(
             username="quizuser",
@@ -41,9 +129,47 @@ class CreateQuizApiTests(BaseQuizApiTests):
         response = self.client.post(url, payload, format="json")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
-    @patch("quiz_app.api.views.create_quiz_from_youtube_url")
-    def test_create_quiz_returns_201_with_valid_url(self, mock_create_quiz):
-        """Authenticated user can create a quiz from a valid URL."""
+    @patch("quiz_app.utils.jobs.create_quiz_from_youtube_url")
+    def test_create_quiz_returns_202_with_pending_job(self, mock_create_quiz):
+        """Authenticated user gets a queued job instead of a blocking call."""
+        self.login()
+        url = reverse("create-quiz")
+        payload = {"url": "https://www.youtube.com/watch?v=example"}
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], QuizJob.STATUS_PENDING)
+        self.assertIsNone(response.data["quiz"])
+        job_url = reverse("quiz-job-detail", args=[response.data["id"]])
+        self.assertEqual(response["Location"], job_url)
+        mock_create_quiz.assert_not_called()
+
+    def test_create_quiz_returns_400_for_non_youtube_url(self):
+        """URLs without a YouTube video ID are rejected before queueing."""
+        self.login()
+        url = reverse("create-quiz")
+        payload = {"url": "https://example.com/video"}
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(QuizJob.objects.exists())
+
+
+@override_settings(QUIZ_JOB_MODE="eager")
+class QuizJobApiTests(BaseQuizApiTests):
+    """Tests for job execution and the /api/jobs/{id}/ endpoint."""
+
+    def create_job(self):
+        """Submit a createQuiz request and run its job on commit."""
+        self.login()
+        url = reverse("create-quiz")
+        payload = {"url": "https://www.youtube.com/watch?v=example"}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        return response.data["id"]
+
+    @patch("quiz_app.utils.jobs.create_quiz_from_youtube_url")
+    def test_job_reports_finished_quiz(self, mock_create_quiz):
+        """A succeeded job exposes the generated quiz."""
         quiz = Quiz.objects.create(
             user=self.user,
             title="Test Quiz",
@@ -51,13 +177,354 @@ class CreateQuizApiTests(BaseQuizApiTests):
             video_url="https://www.youtube.com/watch?v=example",
         )
         mock_create_quiz.return_value = quiz
+        job_id = self.create_job()
+        response = self.client.get(reverse("quiz-job-detail", args=[job_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], QuizJob.STATUS_SUCCEEDED)
+        self.assertEqual(response.data["quiz"]["id"], quiz.id)
+        self.assertEqual(response.data["quiz"]["video_url"], quiz.video_url)
+
+    @patch("quiz_app.utils.jobs.create_quiz_from_youtube_url")
+    def test_job_records_pipeline_error(self, mock_create_quiz):
+        """Pipeline errors mark the job as failed with a message."""
+        mock_create_quiz.side_effect = ValueError("Gemini returned non-JSON")
+        job_id = self.create_job()
+        response = self.client.get(reverse("quiz-job-detail", args=[job_id]))
+        self.assertEqual(response.data["status"], QuizJob.STATUS_FAILED)
+        self.assertEqual(response.data["error"], "Gemini returned non-JSON")
+        self.assertIsNone(response.data["quiz"])
+
+    def read_events(self, job_id, **headers):
+        """Consume the SSE endpoint and return (id, stage, data) tuples."""
+        url = reverse("quiz-job-events", args=[job_id])
+        response = self.client.get(url, HTTP_ACCEPT="text/event-stream", **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join(response.streaming_content).decode()
+        events = []
+        for message in body.strip().split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in message.splitlines())
+            if "event" in fields:
+                events.append(
+                    (int(fields["id"]), fields["event"], json.loads(fields["data"]))
+                )
+        return events
+
+    @patch("quiz_app.utils.jobs.create_quiz_from_youtube_url")
+    def test_events_stream_reports_pipeline_stages(self, mock_create_quiz):
+        """The SSE endpoint replays every stage and ends with the result."""
+        quiz = Quiz.objects.create(
+            user=self.user,
+            title="Test Quiz",
+            video_url="https://www.youtube.com/watch?v=example",
+        )
+
+        def fake_pipeline(url, user, progress):
+            progress("downloading", percent=0.0)
+            progress("transcribing", percent=100.0)
+            progress("generating")
+            progress("quiz_created", quiz=quiz)
+            progress("question_saved", number=1)
+            return quiz
+
+        mock_create_quiz.side_effect = fake_pipeline
+        job_id = self.create_job()
+        events = self.read_events(job_id)
+        self.assertEqual(
+            [stage for _, stage, _ in events],
+            [
+                "pending",
+                "running",
+                "downloading",
+                "transcribing",
+                "generating",
+                "quiz_created",
+                "question_saved",
+                "succeeded",
+            ],
+        )
+        self.assertEqual(events[4][2], {})
+        self.assertEqual(events[5][2], {"quiz_id": quiz.id})
+        self.assertEqual(events[-1][2], {"quiz_id": quiz.id})
+        resumed = self.read_events(job_id, HTTP_LAST_EVENT_ID=str(events[5][0]))
+        self.assertEqual(
+            [stage for _, stage, _ in resumed], ["question_saved", "succeeded"]
+        )
+
+    def test_job_progress_throttles_intermediate_updates(self):
+        """Rapid percent updates are thinned out, the final one is kept."""
+        job = QuizJob.objects.create(user=self.user, url="https://youtu.be/x")
+        progress = JobProgress(job)
+        with override_settings(QUIZ_JOB_PROGRESS_INTERVAL=60):
+            for percent in (0.0, 10.0, 20.0, 30.0, 100.0):
+                progress("downloading", percent=percent)
+        stored = list(job.events.values_list("data", flat=True))
+        self.assertEqual(
+            stored, [{"percent": 0.0}, {"percent": 10.0}, {"percent": 100.0}]
+        )
+
+    @override_settings(QUIZ_JOB_EVENTS_POLL_SECONDS=0.01)
+    def test_events_stream_under_asgi_before_job_finishes(self):
+        """Under ASGI stored events arrive while the job is still running."""
+        job = QuizJob.objects.create(
+            user=self.user, url="https://youtu.be/x", status=QuizJob.STATUS_RUNNING
+        )
+        record_job_event(job.id, QuizJob.STATUS_RUNNING)
         self.login()
-        url = reverse("create-quiz")
-        payload = {"url": "https://www.youtube.com/watch?v=example"}
-        response = self.client.post(url, payload, format="json")
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(response.data["id"], quiz.id)
-        self.assertEqual(response.data["video_url"], quiz.video_url)
+        self.async_client.cookies = self.client.cookies
+        url = reverse("quiz-job-events", args=[job.id])
+
+        async def first_messages():
+            response = await self.async_client.get(
+                url, headers={"accept": "text/event-stream"}
+            )
+            self.assertTrue(response.is_async)
+            content = aiter(response.streaming_content)
+            messages = [await anext(content), await anext(content)]
+            await content.aclose()
+            return messages
+
+        retry, event = async_to_sync(first_messages)()
+        self.assertTrue(retry.startswith(b"retry:"))
+        self.assertIn(b"event: running", event)
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.STATUS_RUNNING)
+
+    def test_events_of_other_user_return_403(self):
+        """Event streams of foreign jobs are rejected."""
+        other_user = User.objects.create_user(username="other", password="pw")
+        job = QuizJob.objects.create(user=other_user, url="https://youtu.be/x")
+        self.login()
+        url = reverse("quiz-job-events", args=[job.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_job_of_other_user_returns_403(self):
+        """Jobs of other users are not visible."""
+        other_user = User.objects.create_user(
+            username="other",
+            email="other@example.com",
+            password="otherpass123",
+        )
+        job = QuizJob.objects.create(
+            user=other_user,
+            url="https://www.youtube.com/watch?v=other",
+        )
+        self.login()
+        response = self.client.get(reverse("quiz-job-detail", args=[job.id]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unknown_job_returns_404(self):
+        """Unknown job id should return 404."""
+        self.login()
+        response = self.client.get(reverse("quiz-job-detail", args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(QUIZ_JOB_MODE="eager", QUIZ_JOB_MAX_PER_USER=1)
+class QuizBatchApiTests(BaseQuizApiTests):
+    """Tests for /api/createQuiz/batch/ and the per-user job limit."""
+
+    def post_batch(self, payload):
+        """Log in, post a batch and run the queued jobs on commit."""
+        self.login()
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                reverse("create-quiz-batch"), payload, format="json"
+            )
+
+    @patch("quiz_app.utils.jobs.create_quiz_from_youtube_url")
+    def test_batch_reports_status_per_item(self, mock_create_quiz):
+        """New videos are queued; known, repeated and invalid ones are not."""
+        existing = Quiz.objects.create(
+            user=self.user,
+            title="Done",
+            video_url="https://www.youtube.com/watch?v=done",
+        )
+        mock_create_quiz.side_effect = lambda url, user, progress: Quiz.objects.create(
+            user=user, title=url, video_url=url
+        )
+        response = self.post_batch(
+            {
+                "urls": [
+                    "https://www.youtube.com/watch?v=one",
+                    "https://youtu.be/two",
+                    "https://www.youtube.com/watch?v=one&t=30",
+                    "https://youtu.be/done",
+                    "https://example.com/video",
+                ]
+            }
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        items = response.data["items"]
+        self.assertEqual(
+            [item["status"] for item in items],
+            ["queued", "queued", "duplicate", "exists", "invalid"],
+        )
+        self.assertEqual(items[1]["video_url"], "https://www.youtube.com/watch?v=two")
+        self.assertEqual(items[3]["quiz_id"], existing.id)
+        jobs = QuizJob.objects.filter(pk__in=[items[0]["job_id"], items[1]["job_id"]])
+        self.assertEqual(
+            set(jobs.values_list("status", flat=True)), {QuizJob.STATUS_SUCCEEDED}
+        )
+        self.assertEqual(mock_create_quiz.call_count, 2)
+
+    def test_batch_skips_videos_with_active_jobs(self):
+        """A video with a pending job is reported instead of queued again."""
+        job = QuizJob.objects.create(
+            user=self.user,
+            url="https://www.youtube.com/watch?v=busy",
+            status=QuizJob.STATUS_RUNNING,
+        )
+        response = self.post_batch({"urls": ["https://youtu.be/busy"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["items"][0]["status"], "in_progress")
+        self.assertEqual(response.data["items"][0]["job_id"], job.id)
+        self.assertEqual(QuizJob.objects.count(), 1)
+
+    @patch("quiz_app.utils.jobs.create_quiz_from_youtube_url")
+    @patch("quiz_app.utils.youtube.extract_video_info")
+    def test_playlist_is_expanded_with_flat_extraction(self, mock_info, mock_create):
+        """Playlist entries become one queued item per video."""
+        mock_info.return_value = {"entries": [{"id": "a"}, {"id": "b"}, None]}
+        mock_create.side_effect = ValueError("skip")
+        response = self.post_batch(
+            {"playlist_url": "https://www.youtube.com/playlist?list=PL123"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        urls = [item["video_url"] for item in response.data["items"]]
+        self.assertEqual(
+            urls,
+            [
+                "https://www.youtube.com/watch?v=a",
+                "https://www.youtube.com/watch?v=b",
+            ],
+        )
+        url, options = mock_info.call_args.args
+        self.assertEqual(url, "https://www.youtube.com/playlist?list=PL123")
+        self.assertEqual(options["extract_flat"], "in_playlist")
+        self.assertFalse(mock_info.call_args.kwargs["download"])
+
+    def test_batch_validates_input(self):
+        """Exactly one of urls and playlist_url, within the item limit."""
+        for payload in (
+            {},
+            {"urls": ["https://youtu.be/a"], "playlist_url": "https://youtu.be/a"},
+            {"playlist_url": "https://www.youtube.com/watch?v=nolist"},
+        ):
+            response = self.post_batch(payload)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with override_settings(QUIZ_BATCH_MAX_ITEMS=1):
+            response = self.post_batch(
+                {"urls": ["https://youtu.be/a", "https://youtu.be/b"]}
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(QuizJob.objects.exists())
+
+    @patch("quiz_app.utils.jobs.create_quiz_from_youtube_url")
+    def test_held_back_job_runs_after_the_running_one(self, mock_create_quiz):
+        """A job refused by the limit is picked up when the slot frees."""
+        first = QuizJob.objects.create(user=self.user, url="https://youtu.be/a")
+        second = QuizJob.objects.create(user=self.user, url="https://youtu.be/b")
+        order = []
+
+        def create(url, user, progress):
+            order.append(url)
+            if url == first.url:
+                run_job(second.id)
+                order.append("second held back")
+            raise ValueError("done")
+
+        mock_create_quiz.side_effect = create
+        run_job(first.id)
+        self.assertEqual(order, [first.url, "second held back", second.url])
+        second.refresh_from_db()
+        self.assertEqual(second.status, QuizJob.STATUS_FAILED)
+
+    @override_settings(QUIZ_JOB_MAX_PER_USER=2)
+    @patch("quiz_app.utils.jobs.create_quiz_from_youtube_url")
+    def test_other_users_job_runs_beside_a_batch(self, mock_create_quiz):
+        """A free worker takes another user's job before the rest of a batch."""
+        other = User.objects.create_user(username="other", password="pw")
+        batch = [
+            QuizJob.objects.create(user=self.user, url=f"https://youtu.be/a{i}")
+            for i in range(3)
+        ]
+        foreign = QuizJob.objects.create(user=other, url="https://youtu.be/b")
+        order = []
+
+        def create(url, user, progress):
+            order.append(url)
+            if url == batch[0].url:
+                # A second worker frees up while the first job still runs.
+                execute_job(claim_next_job())
+            raise ValueError("done")
+
+        mock_create_quiz.side_effect = create
+        run_job(batch[0].id)
+        self.assertEqual(
+            order, [batch[0].url, foreign.url, batch[1].url, batch[2].url]
+        )
+
+    def test_claim_respects_per_user_limit(self):
+        """Jobs wait while their user is at the limit; others still run."""
+        other = User.objects.create_user(username="other", password="pw")
+        QuizJob.objects.create(
+            user=self.user, url="https://youtu.be/a", status=QuizJob.STATUS_RUNNING
+        )
+        waiting = QuizJob.objects.create(user=self.user, url="https://youtu.be/b")
+        foreign = QuizJob.objects.create(user=other, url="https://youtu.be/c")
+        self.assertFalse(claim_job(waiting.id))
+        self.assertEqual(claim_next_job(), foreign.id)
+        self.assertIsNone(claim_next_job())
+        with override_settings(QUIZ_JOB_MAX_PER_USER=0):
+            self.assertTrue(claim_job(waiting.id))
+
+    def make_stale(self, job):
+        """Backdate a job's heartbeat past QUIZ_JOB_STALE_SECONDS."""
+        QuizJob.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+    @patch("quiz_app.utils.jobs.create_quiz_from_youtube_url")
+    def test_stale_running_job_is_requeued(self, mock_create_quiz):
+        """A running job without heartbeat frees its slot and runs again."""
+        mock_create_quiz.side_effect = ValueError("done")
+        partial = Quiz.objects.create(user=self.user, title="", video_url="x")
+        stale = QuizJob.objects.create(
+            user=self.user,
+            url="https://youtu.be/a",
+            status=QuizJob.STATUS_RUNNING,
+            quiz=partial,
+        )
+        waiting = QuizJob.objects.create(user=self.user, url="https://youtu.be/b")
+        self.make_stale(stale)
+        self.assertTrue(claim_job(waiting.id))
+        self.assertEqual(requeue_stale_jobs(), 1)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, QuizJob.STATUS_PENDING)
+        self.assertIsNone(stale.started_at)
+        self.assertFalse(Quiz.objects.filter(pk=partial.pk).exists())
+        self.assertEqual(stale.events.last().data, {"requeued": True})
+        QuizJob.objects.filter(pk=waiting.pk).update(status=QuizJob.STATUS_FAILED)
+        self.assertEqual(claim_next_job(), stale.id)
+
+    @patch("quiz_app.utils.jobs.create_quiz_from_youtube_url")
+    def test_requeued_job_drops_late_result(self, mock_create_quiz):
+        """A worker that was presumed dead cannot overwrite the rerun."""
+        job = QuizJob.objects.create(user=self.user, url="https://youtu.be/a")
+
+        def create(url, user, progress):
+            self.make_stale(job)
+            requeue_stale_jobs()
+            return Quiz.objects.create(user=user, title="late", video_url=url)
+
+        mock_create_quiz.side_effect = create
+        self.assertTrue(claim_job(job.id))
+        execute_job(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.STATUS_PENDING)
+        self.assertFalse(Quiz.objects.filter(title="late").exists())
 
 
 class QuizListApiTests(BaseQuizApiTests):
@@ -99,6 +566,205 @@ class QuizListApiTests(BaseQuizApiTests):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["id"], self.quiz.id)
 
+    def create_quizzes(self, count, questions=0):
+        """Create additional quizzes with the given number of questions."""
+        for number in range(count):
+            quiz = Quiz.objects.create(
+                user=self.user,
+                title=f"Quiz {number}",
+                video_url="https://www.youtube.com/watch?v=example",
+            )
+            Question.objects.bulk_create(
+                Question(
+                    quiz=quiz,
+                    question_title=f"Q{index}?",
+                    question_options=["A", "B", "C", "D"],
+                    answer="A",
+                )
+                for index in range(questions)
+            )
+
+    def test_list_quizzes_query_count_is_constant(self):
+        """User, quizzes and questions load in three queries in total."""
+        self.create_quizzes(20, questions=3)
+        self.login()
+        url = reverse("quiz-list")
+        with self.assertNumQueries(3):
+            response = self.client.get(url, format="json")
+        self.assertEqual(len(response.data), 21)
+        self.assertEqual(len(response.data[0]["questions"]), 3)
+
+    def test_summary_view_skips_questions(self):
+        """?view=summary returns id, title and created_at in two queries."""
+        self.create_quizzes(5, questions=3)
+        self.login()
+        url = reverse("quiz-list")
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"view": "summary"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(set(response.data[0]), {"id", "title", "created_at"})
+
+    def test_unknown_view_returns_400(self):
+        """Unsupported list representations are rejected."""
+        self.login()
+        response = self.client.get(reverse("quiz-list"), {"view": "tiny"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("view", response.data)
+
+    @override_settings(QUIZ_LIST_PAGE_SIZE=2)
+    def test_list_quizzes_paginates_with_link_header(self):
+        """Pages stay plain lists; the cursor links are in the Link header."""
+        self.create_quizzes(3)
+        self.login()
+        response = self.client.get(reverse("quiz-list"), format="json")
+        self.assertEqual(len(response.data), 2)
+        self.assertIn('rel="next"', response["Link"])
+        seen = [quiz["id"] for quiz in response.data]
+        while 'rel="next"' in response.get("Link", ""):
+            next_url = response["Link"].split(">", 1)[0].lstrip("<")
+            response = self.client.get(next_url, format="json")
+            seen += [quiz["id"] for quiz in response.data]
+        expected = Quiz.objects.filter(user=self.user).order_by("-created_at", "-id")
+        self.assertEqual(seen, list(expected.values_list("id", flat=True)))
+
+
+class FastSerializationTests(BaseQuizApiTests):
+    """Tests that the fast read path renders exactly like DRF did."""
+
+    def setUp(self):
+        super().setUp()
+        for number in range(3):
+            quiz = Quiz.objects.create(
+                user=self.user,
+                title=f"Grüße {number} \u2028 \U0001f600",
+                description='Quotes " and \\ backslashes',
+                video_url="https://www.youtube.com/watch?v=example",
+            )
+            Question.objects.bulk_create(
+                Question(
+                    quiz=quiz,
+                    question_title=f"Frage {index}?",
+                    question_options=["Ä", "B", "C", "D"],
+                    answer="Ä",
+                )
+                for index in range(2)
+            )
+
+    def drf_render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_list_body_is_byte_identical(self):
+        """The list endpoint returns the bytes QuizSerializer produced."""
+        quizzes = (
+            Quiz.objects.filter(user=self.user)
+            .order_by("-created_at", "-id")
+            .prefetch_related(
+                Prefetch("questions", queryset=Question.objects.order_by("id"))
+            )
+        )
+        expected = self.drf_render(QuizSerializer(quizzes, many=True).data)
+        self.login()
+        response = self.client.get(reverse("quiz-list"), HTTP_ACCEPT="application/json")
+        self.assertEqual(response.content, expected)
+
+    def test_detail_body_is_byte_identical(self):
+        """The detail endpoint returns the bytes QuizSerializer produced."""
+        quiz = Quiz.objects.filter(user=self.user).first()
+        expected = self.drf_render(QuizSerializer(quiz).data)
+        self.login()
+        url = reverse("quiz-detail", args=[quiz.id])
+        response = self.client.get(url, HTTP_ACCEPT="application/json")
+        self.assertEqual(response.content, expected)
+
+    def test_renderer_falls_back_for_rich_types(self):
+        """Data the plain encoder rejects still renders like JSONRenderer."""
+        data = {"when": timezone.now(), "amount": Decimal("1.50")}
+        self.assertEqual(FastJSONRenderer().render(data), self.drf_render(data))
+
+
+class QuizResponseCacheTests(BaseQuizApiTests):
+    """Tests for cached quiz reads, ETags and write-through invalidation."""
+
+    def setUp(self):
+        super().setUp()
+        self.quiz = Quiz.objects.create(
+            user=self.user,
+            title="Cached Quiz",
+            video_url="https://www.youtube.com/watch?v=example",
+        )
+        self.detail_url = reverse("quiz-detail", args=[self.quiz.id])
+        self.login()
+
+    def test_repeated_get_is_served_from_cache(self):
+        """The second read only needs the authentication query."""
+        first = self.client.get(self.detail_url)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.detail_url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_matching_etag_returns_304(self):
+        """If-None-Match with the current ETag gets an empty 304."""
+        etag = self.client.get(reverse("quiz-list"))["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("quiz-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_patch_invalidates_detail_and_list(self):
+        """Edits change the ETag and show up in subsequent reads."""
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.client.get(reverse("quiz-list"))
+        self.client.patch(self.detail_url, {"title": "Renamed"}, format="json")
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["title"], "Renamed")
+        listed = self.client.get(reverse("quiz-list")).data
+        self.assertEqual(listed[0]["title"], "Renamed")
+
+    def test_delete_invalidates_list(self):
+        """Deleted quizzes disappear from the cached list."""
+        self.assertEqual(len(self.client.get(reverse("quiz-list")).data), 1)
+        self.client.delete(self.detail_url)
+        self.assertEqual(self.client.get(reverse("quiz-list")).data, [])
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_new_quiz_invalidates_list(self):
+        """Quizzes created by the pipeline appear immediately."""
+        self.client.get(reverse("quiz-list"))
+        _create_quiz_with_questions(
+            {"title": "Fresh", "description": "", "questions": []},
+            "https://www.youtube.com/watch?v=fresh",
+            self.user,
+        )
+        titles = [quiz["title"] for quiz in self.client.get(reverse("quiz-list")).data]
+        self.assertEqual(titles, ["Fresh", "Cached Quiz"])
+
+    def test_version_expires_with_cache_ttl(self):
+        """Writes missed by this process's cache show up after the TTL."""
+        etag = self.client.get(self.detail_url)["ETag"]
+        Quiz.objects.filter(pk=self.quiz.pk).update(title="Changed elsewhere")
+        later = time.time() + settings.QUIZ_RESPONSE_CACHE_TTL + 1
+        clock = "django.core.cache.backends.filebased.time.time"
+        with patch(clock, return_value=later):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["title"], "Changed elsewhere")
+
+    def test_check_warns_about_locmem(self):
+        """A per-process response cache is flagged; the shared default is not."""
+        self.assertEqual(check_response_cache_backend(None), [])
+        caches = {**settings.CACHES, "quiz_responses": {"BACKEND": LOCMEM_BACKEND}}
+        for mode in ("thread", "external"):
+            with self.subTest(mode=mode):
+                with override_settings(CACHES=caches, QUIZ_JOB_MODE=mode):
+                    warnings = check_response_cache_backend(None)
+                self.assertEqual(
+                    [warning.id for warning in warnings], ["quiz_app.W001"]
+                )
+
 
 class QuizDetailApiTests(BaseQuizApiTests):
     """Tests for /api/quizzes/{id}/ detail, patch and delete."""
@@ -169,4 +835,1336 @@ class QuizDetailApiTests(BaseQuizApiTests):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(
             Quiz.objects.filter(id=self.own_quiz.id).exists()
-        )
\ No newline at end of file
+        )
+
+    def add_questions(self, quiz, count=3):
+        """Attach a few questions to the given quiz."""
+        Question.objects.bulk_create(
+            Question(
+                quiz=quiz,
+                question_title=f"Q{number}?",
+                question_options=["A", "B", "C", "D"],
+                answer="A",
+            )
+            for number in range(count)
+        )
+
+    def test_quiz_detail_get_query_count(self):
+        """GET loads quiz, owner id and questions in a single query."""
+        self.add_questions(self.own_quiz)
+        self.login()
+        url = reverse("quiz-detail", args=[self.own_quiz.id])
+        with self.assertNumQueries(2):
+            response = self.client.get(url, format="json")
+        self.assertEqual(len(response.data["questions"]), 3)
+        self.assertEqual(
+            [item["id"] for item in response.data["questions"]],
+            list(self.own_quiz.questions.order_by("id").values_list("id", flat=True)),
+        )
+
+    def test_quiz_detail_get_without_questions(self):
+        """A quiz without questions is returned with an empty list."""
+        self.login()
+        url = reverse("quiz-detail", args=[self.own_quiz.id])
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.data["questions"], [])
+        self.assertEqual(response.data["title"], "Own Quiz")
+
+    def test_quiz_detail_foreign_and_unknown_query_count(self):
+        """403 and 404 are decided by the same single query."""
+        self.login()
+        for pk, expected in (
+            (self.other_quiz.id, status.HTTP_403_FORBIDDEN),
+            (999999, status.HTTP_404_NOT_FOUND),
+        ):
+            with self.assertNumQueries(2):
+                response = self.client.get(reverse("quiz-detail", args=[pk]))
+            self.assertEqual(response.status_code, expected)
+
+    def test_quiz_patch_query_count(self):
+        """PATCH needs one lookup, the update and the questions read."""
+        self.add_questions(self.own_quiz)
+        self.login()
+        url = reverse("quiz-detail", args=[self.own_quiz.id])
+        with self.assertNumQueries(4):
+            response = self.client.patch(url, {"title": "New"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["questions"]), 3)
+
+    def test_quiz_delete_query_count(self):
+        """DELETE: one lookup, questions, the job SET_NULL update, the quiz."""
+        self.add_questions(self.own_quiz)
+        self.login()
+        url = reverse("quiz-detail", args=[self.own_quiz.id])
+        with self.assertNumQueries(5):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+@override_settings(SINGLE_FLIGHT_LOCK_DIR=tempfile.gettempdir())
+class TranscriptCacheTests(TestCase):
+    """Tests for the per-video transcript cache used by the pipeline."""
+
+    @patch("quiz_app.utils.quiz_pipeline.preprocess_audio")
+    @patch("quiz_app.utils.quiz_pipeline.transcribe_audio")
+    @patch("quiz_app.utils.quiz_pipeline.download_youtube_audio")
+    def test_cache_miss_downloads_and_stores(
+        self, mock_download, mock_transcribe, mock_preprocess
+    ):
+        """First request for a video transcribes it and fills the cache."""
+        mock_download.return_value = ("tmp/audio/abc.webm", "unused")
+        mock_transcribe.return_value = "Hello transcript"
+        self.assertEqual(get_transcript_for_video("abc"), "Hello transcript")
+        mock_download.assert_called_once_with(
+            "https://www.youtube.com/watch?v=abc", None
+        )
+        mock_preprocess.assert_called_once_with("tmp/audio/abc.webm")
+        mock_transcribe.assert_called_once_with(mock_preprocess.return_value, None)
+        entry = Transcript.objects.get(video_id="abc")
+        self.assertEqual(entry.size_bytes, len("Hello transcript"))
+
+    @patch("quiz_app.utils.quiz_pipeline.transcribe_audio")
+    @patch("quiz_app.utils.quiz_pipeline.download_youtube_audio")
+    def test_cache_hit_skips_download(self, mock_download, mock_transcribe):
+        """Cached videos never touch yt-dlp or Whisper."""
+        store_transcript("abc", "Cached text")
+        self.assertEqual(get_transcript_for_video("abc"), "Cached text")
+        mock_download.assert_not_called()
+        mock_transcribe.assert_not_called()
+        self.assertEqual(Transcript.objects.get(video_id="abc").hit_count, 1)
+
+    def test_cache_is_keyed_by_whisper_model(self):
+        """Switching WHISPER_MODEL_NAME does not serve the old transcript."""
+        with override_settings(WHISPER_MODEL_NAME="tiny"):
+            store_transcript("abc", "Tiny text")
+        with override_settings(WHISPER_MODEL_NAME="medium"):
+            self.assertIsNone(get_cached_transcript("abc"))
+            store_transcript("abc", "Medium text")
+            self.assertEqual(get_cached_transcript("abc"), "Medium text")
+        with override_settings(WHISPER_MODEL_NAME="tiny"):
+            self.assertEqual(get_cached_transcript("abc"), "Tiny text")
+
+    def test_eviction_removes_least_recently_used(self):
+        """Eviction drops the oldest accessed entries first."""
+        now = timezone.now()
+        for age, video_id in ((3, "stale"), (2, "older"), (1, "recent")):
+            store_transcript(video_id, "x" * 10)
+            Transcript.objects.filter(video_id=video_id).update(
+                last_accessed_at=now - timedelta(hours=age)
+            )
+        deleted = evict_transcripts(max_bytes=20)
+        self.assertEqual(deleted, 1)
+        remaining = set(Transcript.objects.values_list("video_id", flat=True))
+        self.assertEqual(remaining, {"older", "recent"})
+
+
+CACHED_QUIZ = {
+    "title": "Cached Quiz",
+    "description": "From the cache.",
+    "questions": [
+        {
+            "question_title": "Q1?",
+            "question_options": ["A", "B", "C", "D"],
+            "answer": "A",
+        }
+    ],
+}
+
+
+@override_settings(SINGLE_FLIGHT_LOCK_DIR=tempfile.gettempdir())
+class QuizResultCacheTests(TestCase):
+    """Tests for the content-addressed cache of generated quiz JSON."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.alice = User.objects.create_user(username="alice", password="pw")
+        self.bob = User.objects.create_user(username="bob", password="pw")
+        transcript = patch(
+            "quiz_app.utils.quiz_pipeline.get_transcript_for_video",
+            return_value="Same lecture transcript.",
+        )
+        transcript.start()
+        self.addCleanup(transcript.stop)
+        generate = patch(
+            "quiz_app.utils.quiz_pipeline.generate_quiz_from_prompt",
+            return_value=CACHED_QUIZ,
+        )
+        self.mock_generate = generate.start()
+        self.addCleanup(generate.stop)
+
+    def create(self, user):
+        return create_quiz_from_youtube_url(
+            "https://www.youtube.com/watch?v=abc", user
+        )
+
+    def test_second_user_reuses_cached_quiz_json(self):
+        """The same transcript and prompt call Gemini only once."""
+        before = quiz_cache_stats()
+        first = self.create(self.alice)
+        second = self.create(self.bob)
+        self.mock_generate.assert_called_once()
+        self.assertNotEqual(first.pk, second.pk)
+        self.assertEqual(second.user, self.bob)
+        self.assertEqual(second.questions.count(), 1)
+        stats = quiz_cache_stats()
+        self.assertEqual(stats["hits"] - before["hits"], 1)
+        self.assertEqual(stats["misses"] - before["misses"], 1)
+        entry = GeneratedQuiz.objects.get()
+        self.assertEqual(entry.hit_count, 1)
+
+    def test_expired_entry_is_regenerated(self):
+        """Entries past their TTL are ignored and refreshed."""
+        self.create(self.alice)
+        GeneratedQuiz.objects.update(expires_at=timezone.now())
+        self.create(self.bob)
+        self.assertEqual(self.mock_generate.call_count, 2)
+
+    def test_copies_ignore_edits_of_other_users(self):
+        """Cache hits copy the stored JSON, not the first user's live quiz."""
+        first = self.create(self.alice)
+        Quiz.objects.filter(pk=first.pk).update(title="Private notes")
+        first.questions.update(question_title="Alice's edit")
+        second = self.create(self.bob)
+        self.assertEqual(second.title, CACHED_QUIZ["title"])
+        self.assertEqual(
+            list(second.questions.values_list("question_title", flat=True)),
+            ["Q1?"],
+        )
+
+    def test_eviction_removes_least_recently_used(self):
+        """Surplus entries are evicted oldest access first."""
+        now = timezone.now()
+        for age, key in ((3, "stale"), (2, "older"), (1, "recent")):
+            store_cached_quiz(key, CACHED_QUIZ)
+            GeneratedQuiz.objects.filter(key=key).update(
+                last_accessed_at=now - timedelta(hours=age)
+            )
+        self.assertEqual(evict_cached_quizzes(max_entries=2), 1)
+        remaining = set(GeneratedQuiz.objects.values_list("key", flat=True))
+        self.assertEqual(remaining, {"older", "recent"})
+
+
+@override_settings(SINGLE_FLIGHT_LOCK_DIR=tempfile.gettempdir())
+class SingleFlightTests(SimpleTestCase):
+    """Tests for sharing in-flight pipeline work between callers."""
+
+    def run_concurrently(self, fn, count=5):
+        """Call single_flight from several threads and collect outcomes."""
+        outcomes = []
+        barrier = threading.Barrier(count)
+
+        def worker():
+            barrier.wait()
+            try:
+                outcomes.append(single_flight("test-key", fn))
+            except Exception as error:
+                outcomes.append(error)
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_concurrent_callers_share_one_computation(self):
+        """Only one caller runs the work; all receive its result."""
+        calls = []
+
+        def slow_work():
+            calls.append(1)
+            time.sleep(0.2)
+            return "transcript"
+
+        outcomes = self.run_concurrently(slow_work)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(outcomes, ["transcript"] * 5)
+
+    def test_errors_are_propagated_to_waiters(self):
+        """Waiters see the leader's exception instead of hanging."""
+
+        def failing_work():
+            time.sleep(0.2)
+            raise ValueError("download failed")
+
+        outcomes = self.run_concurrently(failing_work, count=3)
+        self.assertTrue(all(isinstance(item, ValueError) for item in outcomes))
+
+    def test_key_is_released_after_completion(self):
+        """Sequential calls recompute once the previous flight landed."""
+        self.assertEqual(single_flight("test-key", lambda: 1), 1)
+        self.assertEqual(single_flight("test-key", lambda: 2), 2)
+
+
+class TrickleStream(io.RawIOBase):
+    """Fake network stream that returns audio bytes in small pieces."""
+
+    def __init__(self, data: bytes, piece_size: int = 1000):
+        self.data = data
+        self.piece_size = piece_size
+        self.offset = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        size = self.piece_size if size < 0 else min(size, self.piece_size)
+        piece = self.data[self.offset:self.offset + size]
+        self.offset += len(piece)
+        return piece
+
+
+def make_pcm_audio(seconds: float, sample_rate: int = 16000) -> bytes:
+    """Return a 440 Hz tone as 16 kHz mono s16le bytes."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+    return (tone * 32767).astype(np.int16).tobytes()
+
+
+class StalledStream:
+    """Return some PCM data, then block like a stalled download."""
+
+    def __init__(self, data):
+        self.data = data
+        self.aborted = threading.Event()
+
+    def read(self, size=-1):
+        if self.data:
+            data, self.data = self.data[:size], self.data[size:]
+            return data
+        self.aborted.wait(timeout=5)
+        return b""
+
+    def abort(self):
+        self.aborted.set()
+
+
+@override_settings(STREAMING_CHUNK_SECONDS=2, STREAMING_MAX_BUFFERED_CHUNKS=2)
+class StreamingTranscriptionTests(SimpleTestCase):
+    """Tests for chunked PCM streaming into Whisper."""
+
+    def test_chunks_have_fixed_size_despite_partial_reads(self):
+        """Small network reads are assembled into full-size chunks."""
+        stream = TrickleStream(make_pcm_audio(5))
+        sizes = [len(chunk) for chunk in iter_pcm_chunks(stream, 2)]
+        self.assertEqual(sizes, [32000, 32000, 16000])
+
+    @patch("quiz_app.utils.transcription_backends.get_model_pool")
+    def test_local_file_is_transcribed_segment_by_segment(self, mock_get_pool):
+        """A local PCM file served as a stream is fed to Whisper in order."""
+        model = MagicMock()
+        model.transcribe.side_effect = [
+            {"text": " first "},
+            {"text": "second"},
+            {"text": "third"},
+        ]
+        mock_get_pool.return_value = WhisperModelPool("tiny", 1, 1, lambda _: model)
+        with tempfile.TemporaryFile() as audio_file:
+            audio_file.write(make_pcm_audio(5))
+            audio_file.seek(0)
+            text = transcribe_pcm_stream(audio_file)
+        self.assertEqual(text, "first second third")
+        calls = model.transcribe.call_args_list
+        self.assertEqual([len(call.args[0]) for call in calls], [32000, 32000, 16000])
+        self.assertEqual(calls[1].kwargs["initial_prompt"], "first")
+
+    @patch("quiz_app.utils.transcription_backends.get_model_pool")
+    def test_stream_errors_are_raised(self, mock_get_pool):
+        """Read errors in the producer thread surface in the caller."""
+        stream = MagicMock()
+        stream.read.side_effect = OSError("connection reset")
+        mock_get_pool.return_value = WhisperModelPool("tiny", 1, 1, MagicMock())
+        with self.assertRaises(OSError):
+            transcribe_pcm_stream(stream)
+
+    @patch("quiz_app.utils.transcription_backends.get_model_pool")
+    def test_failed_transcription_aborts_stalled_stream(self, mock_get_pool):
+        """A Whisper error does not wait for a download that hangs."""
+        model = MagicMock()
+        model.transcribe.side_effect = RuntimeError("out of memory")
+        mock_get_pool.return_value = WhisperModelPool("tiny", 1, 1, lambda _: model)
+        stream = StalledStream(make_pcm_audio(2))
+        started = time.monotonic()
+        with self.assertRaises(RuntimeError):
+            transcribe_pcm_stream(stream)
+        self.assertTrue(stream.aborted.is_set())
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_pcm_stream_drains_stderr_while_reading(self):
+        """A process flooding stderr still delivers all of its output."""
+        script = (
+            "import sys; sys.stderr.write('warning\\n' * 50000); sys.stderr.flush(); "
+            "sys.stdout.buffer.write(b'\\0' * 64000); sys.exit(1)"
+        )
+        popen = subprocess.Popen
+
+        def fake_ffmpeg(cmd, **kwargs):
+            return popen([sys.executable, "-c", script], **kwargs)
+
+        with patch("quiz_app.utils.audio_stream.subprocess.Popen", fake_ffmpeg):
+            with self.assertRaises(RuntimeError) as raised:
+                with open_pcm_stream("lecture.webm") as stream:
+                    chunks = list(iter_pcm_chunks(stream, 2))
+        self.assertEqual([len(chunk) for chunk in chunks], [32000])
+        self.assertTrue(str(raised.exception).endswith("warning"))
+
+    @skipUnless(shutil.which("ffmpeg"), "FFmpeg is not installed")
+    def test_ffmpeg_decodes_local_file_as_stream(self):
+        """FFmpeg turns a local WAV file into 16 kHz PCM chunks."""
+        with tempfile.NamedTemporaryFile(suffix=".wav") as wav_file:
+            with wave.open(wav_file.name, "wb") as writer:
+                writer.setnchannels(1)
+                writer.setsampwidth(2)
+                writer.setframerate(16000)
+                writer.writeframes(make_pcm_audio(3))
+            with open_pcm_stream(wav_file.name) as stream:
+                chunks = list(iter_pcm_chunks(stream, 2))
+        self.assertEqual([len(chunk) for chunk in chunks], [32000, 16000])
+
+
+class ServingProcessTests(SimpleTestCase):
+    """Tests for detecting server and worker processes."""
+
+    def test_management_commands_are_not_serving(self):
+        self.assertFalse(is_serving_process(["manage.py", "migrate"], {}))
+        self.assertFalse(is_serving_process(["manage.py", "test"], {}))
+
+    def test_servers_and_workers_are_serving(self):
+        self.assertTrue(is_serving_process(["/venv/bin/gunicorn", "core.wsgi"], {}))
+        self.assertTrue(is_serving_process(["manage.py", "run_quiz_worker"], {}))
+
+    def test_runserver_serves_only_in_reloader_child(self):
+        argv = ["manage.py", "runserver"]
+        self.assertFalse(is_serving_process(argv, {}))
+        self.assertTrue(is_serving_process(argv, {"RUN_MAIN": "true"}))
+        self.assertTrue(is_serving_process(argv + ["--noreload"], {}))
+
+    @override_settings(START_BACKGROUND_TASKS="True")
+    def test_setting_overrides_guess(self):
+        self.assertTrue(is_serving_process(["manage.py", "migrate"], {}))
+
+
+class WhisperModelPoolTests(SimpleTestCase):
+    """Tests for checkout/return semantics of the Whisper model pool."""
+
+    def make_pool(self, size):
+        """Build a pool whose loader counts and returns distinct objects."""
+        self.loads = []
+
+        def loader(name):
+            time.sleep(0.05)
+            self.loads.append(name)
+            return object()
+
+        return WhisperModelPool("tiny", size, 1, loader)
+
+    def test_concurrent_checkouts_never_exceed_pool_size(self):
+        """Parallel first requests load at most ``size`` models."""
+        pool = self.make_pool(2)
+        in_use = []
+        peak = []
+        lock = threading.Lock()
+
+        def worker():
+            with pool.model(timeout=5) as model:
+                with lock:
+                    in_use.append(model)
+                    peak.append(len(in_use))
+                time.sleep(0.1)
+                with lock:
+                    in_use.remove(model)
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.loads), 2)
+        self.assertLessEqual(max(peak), 2)
+
+    def test_warm_up_preloads_all_instances(self):
+        """Warm-up loads every slot so checkouts do not load again."""
+        pool = self.make_pool(3)
+        pool.warm_up()
+        self.assertEqual(len(self.loads), 3)
+        with pool.model():
+            pass
+        self.assertEqual(len(self.loads), 3)
+
+    def test_checkout_times_out_when_pool_is_exhausted(self):
+        """Callers give up with TimeoutError instead of waiting forever."""
+        pool = self.make_pool(1)
+        model = pool.checkout()
+        with self.assertRaises(TimeoutError):
+            pool.checkout(timeout=0.05)
+        pool.release(model)
+        self.assertIs(pool.checkout(timeout=0.05), model)
+
+    def test_waiting_caller_gets_model_before_returning_thread(self):
+        """A thread giving a model back cannot take it again ahead of waiters."""
+        pool = self.make_pool(1)
+        model = pool.checkout()
+        served = []
+        waiter = threading.Thread(
+            target=lambda: served.append(pool.checkout(timeout=5))
+        )
+        waiter.start()
+        time.sleep(0.05)
+        pool.release(model)
+        with self.assertRaises(TimeoutError):
+            pool.checkout(timeout=0.05)
+        waiter.join()
+        self.assertEqual(served, [model])
+
+
+class SlowFakeModel:
+    """Stand-in for a worker's Whisper model with configurable latency."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def transcribe(self, audio, **options):
+        time.sleep(self.delay)
+        return {"text": f" text for {audio} "}
+
+
+class ProcessPoolBackendTests(SimpleTestCase):
+    """Tests for backpressure and timeouts of the worker pool backend."""
+
+    def make_backend(self, delay, broken_pools=0, **kwargs):
+        """Build a backend whose workers are threads with a fake model.
+
+        The first ``broken_pools`` executors it creates are already broken.
+        """
+        patcher = patch(
+            "quiz_app.utils.transcription_backends._WORKER_MODEL",
+            SlowFakeModel(delay),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.executors = []
+
+        def new_executor():
+            executor = ThreadPoolExecutor(max_workers=1)
+            self.addCleanup(executor.shutdown)
+            if len(self.executors) < broken_pools:
+                executor.submit = MagicMock(side_effect=BrokenProcessPool("died"))
+            self.executors.append(executor)
+            return executor
+
+        options = {"workers": 1, "max_pending": 0, "timeout": 5, "submit_timeout": 5}
+        options.update(kwargs)
+        return ProcessPoolTranscriptionBackend(executor_factory=new_executor, **options)
+
+    def test_transcribe_returns_worker_text(self):
+        """Results from the worker are stripped and returned."""
+        backend = self.make_backend(0)
+        self.assertEqual(backend.transcribe("a.webm"), "text for a.webm")
+
+    def test_full_queue_raises_busy_error(self):
+        """Submissions beyond workers + max_pending are rejected."""
+        backend = self.make_backend(0.5, submit_timeout=0.05)
+        first = threading.Thread(target=backend.transcribe, args=("a.webm",))
+        first.start()
+        time.sleep(0.05)
+        with self.assertRaises(TranscriptionBusyError):
+            backend.transcribe("b.webm")
+        first.join()
+        self.assertEqual(backend.transcribe("c.webm"), "text for c.webm")
+
+    def test_waiting_call_ignores_submit_timeout(self):
+        """With wait=True a full queue delays the call instead of failing it."""
+        backend = self.make_backend(0.2, submit_timeout=0.05)
+        first = threading.Thread(target=backend.transcribe, args=("a.webm",))
+        first.start()
+        time.sleep(0.05)
+        self.assertEqual(backend.transcribe("b.webm", wait=True), "text for b.webm")
+        first.join()
+
+    def test_broken_pool_is_replaced_once(self):
+        """A dead worker pool is rebuilt and the audio submitted again."""
+        backend = self.make_backend(0, broken_pools=1)
+        self.assertEqual(backend.transcribe("a.webm"), "text for a.webm")
+        self.assertEqual(backend.transcribe("b.webm"), "text for b.webm")
+        self.assertEqual(len(self.executors), 2)
+
+    def test_pool_breaking_again_raises_transcription_error(self):
+        """A second crash fails the call but leaves a fresh pool behind."""
+        backend = self.make_backend(0, broken_pools=2)
+        with self.assertRaises(TranscriptionError):
+            backend.transcribe("a.webm")
+        self.assertEqual(backend.transcribe("b.webm"), "text for b.webm")
+        self.assertEqual(len(self.executors), 3)
+
+    def test_slow_transcription_times_out(self):
+        """A call exceeding its deadline raises TranscriptionTimeoutError."""
+        backend = self.make_backend(0.3, timeout=0.05)
+        with self.assertRaises(TranscriptionTimeoutError):
+            backend.transcribe("a.webm")
+
+
+def make_tone(seconds: float, sample_rate: int = 16000) -> np.ndarray:
+    """Return a loud float32 tone standing in for speech."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def make_silence(seconds: float, sample_rate: int = 16000) -> np.ndarray:
+    """Return low-level noise standing in for a silent stretch."""
+    rng = np.random.default_rng(0)
+    return (0.0005 * rng.standard_normal(int(seconds * sample_rate))).astype(np.float32)
+
+
+class SilenceTrimmingTests(SimpleTestCase):
+    """Tests for the energy-based VAD pre-processing stage."""
+
+    def test_long_silence_is_removed(self):
+        """Long silent stretches are dropped, speech is preserved."""
+        audio = np.concatenate([make_silence(5), make_tone(2), make_silence(10)])
+        trimmed = trim_silence(audio, padding_ms=0)
+        self.assertAlmostEqual(trimmed.size / 16000, 2, delta=0.1)
+
+    def test_short_pauses_are_kept(self):
+        """Pauses shorter than min_silence_ms stay in the audio."""
+        audio = np.concatenate([make_tone(1), make_silence(0.3), make_tone(1)])
+        self.assertEqual(trim_silence(audio).size, audio.size)
+
+    def test_pure_silence_becomes_empty(self):
+        """Audio without speech is trimmed to nothing."""
+        self.assertEqual(trim_silence(make_silence(3)).size, 0)
+
+    @override_settings(AUDIO_VAD_ENABLED=False)
+    @patch("quiz_app.utils.audio_preprocessing.load_audio")
+    def test_disabled_vad_returns_decoded_audio(self, mock_load_audio):
+        """With VAD disabled the decoded waveform is passed through."""
+        audio = np.concatenate([make_silence(5), make_tone(1)])
+        mock_load_audio.return_value = audio
+        self.assertIs(preprocess_audio("a.webm"), audio)
+        mock_load_audio.assert_called_once_with("a.webm", sr=16000)
+
+
+class ParallelTranscriptionTests(SimpleTestCase):
+    """Tests for windowed, concurrent transcription of long audio."""
+
+    def test_windows_overlap_and_cover_the_audio(self):
+        """Windows share the configured overlap and reach the end."""
+        samples = np.arange(20 * 16000, dtype=np.float32)
+        windows = split_into_windows(samples, 8, 2)
+        self.assertEqual([window[0] for window in windows], [0, 6 * 16000, 12 * 16000])
+        self.assertEqual(windows[-1][-1], samples[-1])
+
+    def test_stitching_removes_overlapping_words(self):
+        """Words transcribed twice in the overlap appear only once."""
+        texts = [
+            "Welcome to the lecture about cells. Today we",
+            "about cells today we look at membranes and",
+            "at membranes and proteins.",
+        ]
+        self.assertEqual(
+            stitch_transcripts(texts),
+            "Welcome to the lecture about cells today we look at membranes "
+            "and proteins.",
+        )
+
+    def test_stitching_without_overlap_concatenates(self):
+        """Unrelated windows are simply joined."""
+        self.assertEqual(stitch_transcripts(["one two", "three four"]), "one two three four")
+
+    @override_settings(
+        TRANSCRIPTION_WINDOW_SECONDS=2,
+        TRANSCRIPTION_WINDOW_OVERLAP_SECONDS=0,
+        TRANSCRIPTION_MAX_WORKERS_PER_JOB=2,
+    )
+    @patch("quiz_app.utils.transcription.get_transcription_backend")
+    def test_long_audio_runs_windows_concurrently_with_cap(self, mock_backend):
+        """Windows run in parallel, but never more than the per-job cap."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def fake_transcribe(window, wait=False):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            self.assertTrue(wait)
+            return f"part{int(window[0])}"
+
+        mock_backend.return_value.capacity = 4
+        mock_backend.return_value.transcribe.side_effect = fake_transcribe
+        samples = np.repeat(np.arange(5, dtype=np.float32), 2 * 16000)
+        text = transcribe_audio(samples)
+        self.assertEqual(text, "part0 part1 part2 part3 part4")
+        self.assertEqual(max(peak), 2)
+        mock_backend.return_value.capacity = 1
+        peak.clear()
+        transcribe_audio(samples)
+        self.assertEqual(max(peak), 1)
+
+
+LECTURE = (
+    "Today we talk about cells. Cells are the basic unit of life. "
+    "You know, you know, cells have membranes. Cells are the basic unit of life. "
+    "The weather is nice today. Membranes protect cells and control transport. "
+)
+
+
+class TranscriptCondensationTests(SimpleTestCase):
+    """Tests for fitting transcripts into the Gemini token budget."""
+
+    def test_repeated_sentences_and_phrases_are_removed(self):
+        """Duplicates are dropped even when the budget is not exceeded."""
+        result = condense_transcript(LECTURE, budget=10_000)
+        self.assertEqual(result.text.count("basic unit of life"), 1)
+        self.assertIn("You know, cells have membranes.", result.text)
+        self.assertGreater(result.tokens_saved, 0)
+
+    def test_long_transcript_fits_budget_in_original_order(self):
+        """Selected sentences respect the budget and keep their order."""
+        transcript = LECTURE + " ".join(
+            f"Filler sentence number {index} about nothing." for index in range(200)
+        )
+        result = condense_transcript(transcript, budget=40)
+        self.assertLessEqual(result.tokens, 40)
+        self.assertEqual(result.original_tokens, count_tokens(transcript))
+        self.assertEqual(result.tokens_saved, result.original_tokens - result.tokens)
+        self.assertIn("Membranes protect cells", result.text)
+        self.assertLess(
+            result.text.index("cells have membranes"),
+            result.text.index("Membranes protect cells"),
+        )
+
+    def test_unspaced_cjk_transcript_is_not_emptied(self):
+        """CJK punctuation splits sentences; text without it is truncated."""
+        sentences = [f"细胞是生命的基本单位第{index}部分。" for index in range(4000)]
+        punctuated = condense_transcript("".join(sentences), budget=200)
+        self.assertGreater(punctuated.tokens, 0)
+        self.assertLessEqual(punctuated.tokens, 200)
+        self.assertIn("细胞是生命的基本单位第0部分。", punctuated.text)
+        unbroken = condense_transcript("细胞膜保护细胞" * 10_000, budget=200)
+        self.assertGreater(unbroken.tokens, 150)
+        self.assertLessEqual(unbroken.tokens, 200)
+        self.assertTrue(unbroken.text.startswith("细胞膜保护细胞"))
+
+    @override_settings(GEMINI_TRANSCRIPT_TOKEN_BUDGET=40)
+    @patch("quiz_app.utils.gemini_client.get_gemini_client")
+    def test_prompt_contains_condensed_transcript(self, mock_get_client):
+        """Gemini receives the condensed transcript, not the raw one."""
+        response = MagicMock(text='{"title": "Cells", "questions": []}')
+        client = mock_get_client.return_value
+        client.models.generate_content.return_value = response
+        transcript = LECTURE * 20
+        quiz = generate_quiz_from_transcript(transcript)
+        self.assertEqual(quiz["title"], "Cells")
+        prompt = client.models.generate_content.call_args.kwargs["contents"]
+        self.assertLess(len(prompt), len(transcript))
+        self.assertEqual(prompt.count("basic unit of life"), 1)
+
+
+STUB_QUIZ = {"title": "Stub Quiz", "description": "From stub.", "questions": []}
+STREAMED_QUIZ = {
+    "title": "Streamed Quiz",
+    "description": "Questions arrive {one} by \"one\".",
+    "questions": [
+        {
+            "question_title": f"Question {number}? [{number}]",
+            "question_options": ["A", "B}", "C{", "D"],
+            "answer": "A",
+        }
+        for number in range(1, 4)
+    ],
+}
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    """Answer generateContent calls and record connection statistics."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            failing = self.server.failures > 0
+            self.server.failures -= failing
+        if failing:
+            body = b'{"error": {"code": 503, "status": "UNAVAILABLE"}}'
+            self.send_response(503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if "streamGenerateContent" in self.path:
+            self.stream_quiz()
+            return
+        with self.server.lock:
+            self.server.active += 1
+            self.server.peak = max(self.server.peak, self.server.active)
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.active -= 1
+        text = json.dumps(STUB_QUIZ)
+        body = json.dumps(
+            {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_quiz(self):
+        """Send STREAMED_QUIZ as server-sent events in small text pieces."""
+        text = "```json\n" + json.dumps(STREAMED_QUIZ, indent=2) + "\n```"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        starts = range(0, len(text), 40)
+        for start in starts:
+            if start == starts[-1]:
+                self.server.release.wait(timeout=5)
+            part = {"role": "model", "parts": [{"text": text[start:start + 40]}]}
+            event = f"data: {json.dumps({'candidates': [{'content': part}]})}\n\n"
+            data = event.encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+            self.server.sent += 1
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_gemini(test) -> ThreadingHTTPServer:
+    """Serve StubGeminiHandler and point the Gemini client at it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGeminiHandler)
+    server.connections = 0
+    server.active = 0
+    server.peak = 0
+    server.delay = 0
+    server.failures = 0
+    server.sent = 0
+    server.release = threading.Event()
+    server.release.set()
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test.addCleanup(server.server_close)
+    test.addCleanup(server.shutdown)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    overrides = override_settings(GEMINI_BASE_URL=base_url)
+    overrides.enable()
+    test.addCleanup(overrides.disable)
+    env = patch.dict(os.environ, {"GOOGLE_API_KEY": "test-key"})
+    env.start()
+    test.addCleanup(env.stop)
+    return server
+
+
+class GeminiClientPoolingTests(SimpleTestCase):
+    """Tests for the shared Gemini client against a local stub server."""
+
+    def setUp(self):
+        """Start a stub Gemini API and point the client at it."""
+        self.server = start_stub_gemini(self)
+
+    def test_client_and_connection_are_reused(self):
+        """Sequential calls share one client and one TCP connection."""
+        self.assertIs(get_gemini_client(), get_gemini_client())
+        for _ in range(3):
+            quiz = generate_quiz_from_transcript("A short transcript.")
+            self.assertEqual(quiz["title"], "Stub Quiz")
+        self.assertEqual(self.server.connections, 1)
+
+    @override_settings(GEMINI_MAX_CONCURRENT_CALLS=2)
+    def test_concurrent_calls_are_limited(self):
+        """No more than GEMINI_MAX_CONCURRENT_CALLS requests run at once."""
+        self.server.delay = 0.1
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(
+                executor.map(generate_quiz_from_transcript, ["Transcript."] * 5)
+            )
+        self.assertEqual(len(results), 5)
+        self.assertLessEqual(self.server.peak, 2)
+
+
+class QuizStreamParserTests(SimpleTestCase):
+    """Tests for incremental parsing of streamed quiz JSON."""
+
+    def test_questions_are_emitted_as_soon_as_complete(self):
+        """Each question is returned by the feed call that closes it."""
+        text = "```json\n" + json.dumps(STREAMED_QUIZ) + "\n```"
+        parser = QuizStreamParser()
+        emitted = []
+        for offset in range(0, len(text), 5):
+            for question in parser.feed(text[offset:offset + 5]):
+                emitted.append((offset, question))
+        self.assertEqual(
+            [question for _, question in emitted], STREAMED_QUIZ["questions"]
+        )
+        self.assertLess(emitted[0][0], text.index("Question 2"))
+        self.assertEqual(parser.fields["description"], STREAMED_QUIZ["description"])
+        self.assertTrue(parser.done)
+
+    def test_incomplete_question_is_not_emitted(self):
+        """A question cut off mid-object stays pending."""
+        parser = QuizStreamParser()
+        text = '{"title": "T", "questions": [{"question_title": "Q", "answer'
+        self.assertEqual(parser.feed(text), [])
+        self.assertEqual(parser.fields, {"title": "T"})
+        self.assertFalse(parser.done)
+
+
+class GeminiStreamingTests(SimpleTestCase):
+    """Tests for streaming generation against the local Gemini stub."""
+
+    def setUp(self):
+        self.server = start_stub_gemini(self)
+
+    def test_questions_are_reported_before_the_stream_ends(self):
+        """Callbacks fire while the last chunk is still held back."""
+        self.server.release.clear()
+        seen = []
+
+        def on_question(question, fields):
+            seen.append((fields["title"], self.server.sent))
+            self.server.release.set()
+
+        quiz = stream_quiz_from_prompt("Prompt.", on_question)
+        self.assertEqual(quiz, STREAMED_QUIZ)
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(seen[0][0], "Streamed Quiz")
+        self.assertLess(seen[0][1], self.server.sent)
+
+
+@override_settings(GEMINI_STREAMING=True, SINGLE_FLIGHT_LOCK_DIR=tempfile.gettempdir())
+class StreamingPipelineTests(TestCase):
+    """Tests for persisting streamed questions one by one."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="streamer", password="pw"
+        )
+        transcript = patch(
+            "quiz_app.utils.quiz_pipeline.get_transcript_for_video",
+            return_value="Streamed lecture.",
+        )
+        transcript.start()
+        self.addCleanup(transcript.stop)
+
+    @patch("quiz_app.utils.quiz_pipeline.stream_quiz_from_prompt")
+    def test_questions_are_saved_while_streaming(self, mock_stream):
+        """The quiz exists and grows before generation finishes."""
+        counts = []
+
+        def fake_stream(prompt, on_question):
+            fields = {"title": "Streamed Quiz"}
+            for question in STREAMED_QUIZ["questions"]:
+                on_question(question, fields)
+                counts.append(Question.objects.count())
+            return STREAMED_QUIZ
+
+        mock_stream.side_effect = fake_stream
+        created = []
+
+        def progress(stage, **data):
+            if stage == "quiz_created":
+                created.append(data["quiz"])
+
+        quiz = create_quiz_from_youtube_url(
+            "https://youtu.be/stream", self.user, progress=progress
+        )
+        self.assertEqual(counts, [1, 2, 3])
+        self.assertEqual(created, [quiz])
+        self.assertEqual(quiz.description, STREAMED_QUIZ["description"])
+        self.assertEqual(GeneratedQuiz.objects.get().quiz_data, STREAMED_QUIZ)
+
+    @patch("quiz_app.utils.quiz_pipeline.stream_quiz_from_prompt")
+    def test_failed_stream_removes_partial_quiz(self, mock_stream):
+        """Questions saved before an error do not leave a broken quiz."""
+
+        def failing_stream(prompt, on_question):
+            on_question(STREAMED_QUIZ["questions"][0], {"title": "Partial"})
+            raise ValueError("Gemini returned non-JSON output")
+
+        mock_stream.side_effect = failing_stream
+        with self.assertRaises(ValueError):
+            create_quiz_from_youtube_url("https://youtu.be/stream", self.user)
+        self.assertFalse(Quiz.objects.exists())
+        self.assertFalse(GeneratedQuiz.objects.exists())
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """Tests for the error-rate circuit breaker."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker(
+            "Stub",
+            failure_rate=0.5,
+            min_calls=4,
+            window_seconds=60,
+            recovery_seconds=30,
+            clock=lambda: self.now,
+        )
+
+    def test_opens_when_error_rate_is_reached(self):
+        """Half of four calls failing opens the circuit."""
+        for failed in (False, True, False):
+            self.breaker.before_call()
+            if failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_half_open_allows_one_trial_call(self):
+        """After recovery one trial decides whether the circuit closes."""
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.now += 31
+        self.assertEqual(self.breaker.state, "half-open")
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.now += 31
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_old_failures_leave_the_window(self):
+        """Failures older than the window no longer count."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.now += 61
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+
+
+@override_settings(
+    GEMINI_TIMEOUT_SECONDS=0.3,
+    GEMINI_RETRY_ATTEMPTS=3,
+    GEMINI_RETRY_MAX_WAIT=0.01,
+    CIRCUIT_BREAKER_MIN_CALLS=3,
+)
+class GeminiResilienceTests(SimpleTestCase):
+    """Tests for retries and deadlines against a faulty Gemini stub."""
+
+    def setUp(self):
+        self.server = start_stub_gemini(self)
+        breakers = patch.dict("quiz_app.utils.resilience._BREAKERS", clear=True)
+        breakers.start()
+        self.addCleanup(breakers.stop)
+
+    def test_server_errors_are_retried(self):
+        """Two 503 responses are retried until the call succeeds."""
+        self.server.failures = 2
+        quiz = generate_quiz_from_transcript("Transcript.")
+        self.assertEqual(quiz["title"], "Stub Quiz")
+        self.assertEqual(self.server.failures, 0)
+
+    def test_slow_responses_hit_the_deadline_and_open_the_circuit(self):
+        """Timeouts are retried, counted and finally fail fast."""
+        self.server.delay = 1
+        with self.assertRaises(httpx.TimeoutException):
+            generate_quiz_from_transcript("Transcript.")
+        self.assertEqual(get_breaker(GEMINI_BREAKER).state, "open")
+        started = time.monotonic()
+        with self.assertRaises(CircuitOpenError):
+            generate_quiz_from_transcript("Transcript.")
+        self.assertLess(time.monotonic() - started, 0.2)
+
+
+class StubMediaHandler(BaseHTTPRequestHandler):
+    """Serve a tiny audio file, optionally failing or stalling first."""
+
+    def do_GET(self):
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        time.sleep(self.server.delay)
+        body = make_pcm_audio(0.1)
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/wav")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command == "HEAD":
+                return
+            if not self.server.trickle:
+                self.wfile.write(body)
+                return
+            for start in range(0, len(body), 256):
+                self.wfile.write(body[start:start + 256])
+                self.wfile.flush()
+                time.sleep(0.1)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    do_HEAD = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SilentLogger:
+    """Swallow yt-dlp output in tests."""
+
+    def debug(self, msg):
+        pass
+
+    warning = error = info = debug
+
+
+@override_settings(
+    YOUTUBE_SOCKET_TIMEOUT=0.3,
+    YOUTUBE_RETRY_ATTEMPTS=3,
+    YOUTUBE_RETRY_MAX_WAIT=0.01,
+)
+class YoutubeResilienceTests(SimpleTestCase):
+    """Tests for yt-dlp retries and deadlines against a local media server."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubMediaHandler)
+        self.server.failures = 0
+        self.server.delay = 0
+        self.server.trickle = False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/lecture.wav"
+        breakers = patch.dict("quiz_app.utils.resilience._BREAKERS", clear=True)
+        breakers.start()
+        self.addCleanup(breakers.stop)
+
+    def extract(self):
+        options = {"quiet": True, "logger": SilentLogger()}
+        return extract_video_info(self.url, options, download=False)
+
+    def test_server_errors_are_retried(self):
+        """A 503 from the media host is retried transparently."""
+        self.server.failures = 2
+        self.assertEqual(self.extract()["url"], self.url)
+
+    def test_stalled_server_times_out(self):
+        """A stalled socket fails after the configured attempts."""
+        self.server.delay = 1
+        started = time.monotonic()
+        with self.assertRaises(DownloadError):
+            self.extract()
+        self.assertLess(time.monotonic() - started, 3)
+
+    @override_settings(YOUTUBE_CALL_TIMEOUT=0.5, YOUTUBE_RETRY_ATTEMPTS=1)
+    def test_slow_download_hits_call_deadline(self):
+        """A download that keeps trickling is cut off and trips the breaker."""
+        self.server.trickle = True
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            options = {
+                "quiet": True,
+                "logger": SilentLogger(),
+                "outtmpl": os.path.join(tmp_dir, "audio.%(ext)s"),
+            }
+            started = time.monotonic()
+            with self.assertRaises(YouTubeTimeoutError):
+                extract_video_info(self.url, options, download=True)
+        self.assertLess(time.monotonic() - started, 2)
+        outcomes = get_breaker(YOUTUBE_BREAKER)._outcomes
+        self.assertEqual([failed for _, failed in outcomes], [True])
+
+
+class CircuitOpenApiTests(BaseQuizApiTests):
+    """Tests for failing fast while an upstream circuit is open."""
+
+    def setUp(self):
+        super().setUp()
+        breakers = patch.dict("quiz_app.utils.resilience._BREAKERS", clear=True)
+        breakers.start()
+        self.addCleanup(breakers.stop)
+        breaker = get_breaker(GEMINI_BREAKER)
+        for _ in range(breaker.min_calls):
+            breaker.record_failure()
+
+    def test_create_quiz_returns_503_while_circuit_is_open(self):
+        """No job is queued while Gemini is known to be down."""
+        self.login()
+        url = reverse("create-quiz")
+        payload = {"url": "https://www.youtube.com/watch?v=abc"}
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("Gemini", response.data["detail"])
+        self.assertFalse(QuizJob.objects.exists())
+
+
+class AsyncCreateQuizApiTests(BaseQuizApiTests):
+    """Tests for the ASGI-friendly /api/createQuiz/async/ endpoint."""
+
+    def test_async_create_requires_authentication(self):
+        """Unauthenticated request should return 401."""
+        url = reverse("create-quiz-async")
+        payload = {"url": "https://www.youtube.com/watch?v=example"}
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @patch("quiz_app.api.views.acreate_quiz_from_youtube_url", new_callable=AsyncMock)
+    def test_async_create_returns_201_with_quiz(self, mock_create_quiz):
+        """The async endpoint answers with the finished quiz."""
+        quiz = Quiz.objects.create(
+            user=self.user,
+            title="Async Quiz",
+            description="Created in test.",
+            video_url="https://www.youtube.com/watch?v=example",
+        )
+        mock_create_quiz.return_value = quiz
+        self.login()
+        url = reverse("create-quiz-async")
+        payload = {"url": "https://www.youtube.com/watch?v=example"}
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["id"], quiz.id)
+        self.assertEqual(mock_create_quiz.await_args.args[1], self.user)
+        job = QuizJob.objects.get()
+        self.assertEqual(job.status, QuizJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.quiz, quiz)
+
+    @patch("quiz_app.api.views.acreate_quiz_from_youtube_url", new_callable=AsyncMock)
+    def test_async_create_maps_busy_errors_to_503(self, mock_create_quiz):
+        """Saturated Gemini or Whisper slots answer 503 with Retry-After."""
+        self.login()
+        url = reverse("create-quiz-async")
+        payload = {"url": "https://www.youtube.com/watch?v=example"}
+        for error in (GeminiBusyError("busy"), TranscriptionBusyError("busy")):
+            with self.subTest(error=type(error).__name__):
+                mock_create_quiz.side_effect = error
+                response = self.client.post(url, payload, format="json")
+                self.assertEqual(
+                    response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+                self.assertEqual(response["Retry-After"], "30")
+        self.assertEqual(
+            set(QuizJob.objects.values_list("status", flat=True)),
+            {QuizJob.STATUS_FAILED},
+        )
+
+    @override_settings(QUIZ_JOB_MAX_PER_USER=1)
+    @patch("quiz_app.api.views.acreate_quiz_from_youtube_url", new_callable=AsyncMock)
+    def test_async_create_respects_per_user_limit(self, mock_create_quiz):
+        """A user at the job limit gets 429 before the pipeline starts."""
+        QuizJob.objects.create(
+            user=self.user, url="https://youtu.be/a", status=QuizJob.STATUS_RUNNING
+        )
+        self.login()
+        url = reverse("create-quiz-async")
+        payload = {"url": "https://www.youtube.com/watch?v=example"}
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+        mock_create_quiz.assert_not_awaited()
+        self.assertEqual(QuizJob.objects.count(), 1)
+
+    @override_settings(QUIZ_JOB_HEARTBEAT_SECONDS=0.01)
+    @patch("quiz_app.api.views.acreate_quiz_from_youtube_url", new_callable=AsyncMock)
+    def test_async_create_beats_on_the_event_loop(self, mock_create_quiz):
+        """The job heartbeat runs as a task instead of a separate thread."""
+        seen = []
+        jobs = QuizJob.objects.values_list("updated_at", flat=True)
+
+        async def create(url, user):
+            started = await sync_to_async(jobs.get)()
+            await asyncio.sleep(0.1)
+            seen.append(await sync_to_async(jobs.get)() > started)
+            seen.append(
+                any(t.name.endswith("-heartbeat") for t in threading.enumerate())
+            )
+            raise ValueError("stop")
+
+        mock_create_quiz.side_effect = create
+        self.login()
+        url = reverse("create-quiz-async")
+        payload = {"url": "https://www.youtube.com/watch?v=example"}
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(seen, [True, False])
+
+    def test_async_create_rejects_invalid_url(self):
+        """Serializer errors are returned as 400."""
+        self.login()
+        url = reverse("create-quiz-async")
+        response = self.client.post(url, {"url": "not a url"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("url", response.json())
+
+
+class AsyncPipelineTests(TestCase):
+    """Tests for the async quiz pipeline."""
+
+    def setUp(self):
+        """Create a user and fake the blocking and Gemini stages."""
+        self.user = User.objects.create_user(username="asyncuser", password="x")
+        transcript = patch(
+            "quiz_app.utils.async_pipeline.get_transcript_for_video",
+            return_value="Cells are the basic unit of life.",
+        )
+        self.mock_transcript = transcript.start()
+        self.addCleanup(transcript.stop)
+        client = patch("quiz_app.utils.gemini_client.get_gemini_client")
+        self.mock_client = client.start().return_value
+        self.addCleanup(client.stop)
+
+    def fake_gemini(self, delay=0.0):
+        """Let the async Gemini client answer after an optional delay."""
+        quiz_json = json.dumps({
+            "title": "Cells",
+            "description": "Biology basics.",
+            "questions": [{
+                "question_title": "What is the basic unit of life?",
+                "question_options": ["Cell", "Atom", "Organ", "Tissue"],
+                "answer": "Cell",
+            }],
+        })
+
+        async def generate_content(**kwargs):
+            await asyncio.sleep(delay)
+            return MagicMock(text=quiz_json)
+
+        mock = AsyncMock(side_effect=generate_content)
+        self.mock_client.aio.models.generate_content = mock
+        return mock
+
+    def test_creates_quiz_with_questions(self):
+        """The async pipeline persists the quiz for the user."""
+        self.fake_gemini()
+        url = "https://youtu.be/abc"
+        quiz = async_to_sync(acreate_quiz_from_youtube_url)(url, self.user)
+        self.assertEqual(quiz.user, self.user)
+        self.assertEqual(quiz.video_url, "https://www.youtube.com/watch?v=abc")
+        self.assertEqual(quiz.questions.count(), 1)
+        self.mock_transcript.assert_called_once_with("abc")
+
+    def test_concurrent_requests_share_one_gemini_call(self):
+        """Coroutines for the same video await a single Gemini call."""
+        generate = self.fake_gemini(delay=0.1)
+        url = "https://youtu.be/abc"
+
+        async def create_many():
+            return await asyncio.gather(
+                *(acreate_quiz_from_youtube_url(url, self.user) for _ in range(5))
+            )
+
+        quizzes = async_to_sync(create_many)()
+        self.assertEqual(len({quiz.id for quiz in quizzes}), 5)
+        self.assertEqual(generate.await_count, 1)
@@ -0,0 +1,116 @@
+"""Async variant of the quiz pipeline for ASGI deployments.
+
+Blocking stages (yt-dlp, Whisper, prompt condensation) run on a bounded
+thread pool and the Gemini call uses the SDK's async client, so pending
+generations wait on the event loop instead of each holding a thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from quiz_app.models import GeneratedQuiz, Quiz
+from quiz_app.utils.gemini_client import (
+    agenerate_quiz_from_prompt,
+    build_condensed_prompt,
+)
+from quiz_app.utils.quiz_cache import (
+    get_cached_quiz,
+    quiz_cache_key,
+    store_cached_quiz,
+)
+from quiz_app.utils.quiz_pipeline import (
+    create_quiz_from_cache_entry,
+    get_transcript_for_video,
+)
+from quiz_app.utils.transcript_cache import get_cached_transcript
+from quiz_app.utils.youtube import (
+    build_canonical_youtube_url,
+    extract_youtube_video_id,
+)
+
+T = TypeVar("T")
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+_INFLIGHT_QUIZZES: dict[str, asyncio.Task] = {}
+
+
+def get_pipeline_executor() -> ThreadPoolExecutor:
+    """Return the bounded pool that runs blocking pipeline stages."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_PIPELINE_WORKERS,
+                thread_name_prefix="quiz-pipeline",
+            )
+    return _EXECUTOR
+
+
+async def run_blocking(fn: Callable[..., T], *args) -> T:
+    """Run a blocking callable on the pipeline executor."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(_with_db_connection, fn, *args)
+    return await loop.run_in_executor(get_pipeline_executor(), call)
+
+
+def _with_db_connection(fn: Callable[..., T], *args) -> T:
+    """Give executor work a fresh DB connection and close it afterwards."""
+    close_old_connections()
+    try:
+        return fn(*args)
+    finally:
+        connection.close()
+
+
+async def acreate_quiz_from_youtube_url(url: str, user) -> Quiz:
+    """Async counterpart of quiz_pipeline.create_quiz_from_youtube_url."""
+    video_id = extract_youtube_video_id(url)
+    transcript = await aget_transcript_for_video(video_id)
+    prompt = await run_blocking(build_condensed_prompt, transcript)
+    key = quiz_cache_key(prompt)
+    entry = await sync_to_async(get_cached_quiz)(key)
+    if entry is None:
+        entry = await _shared_quiz_generation(key, prompt)
+    video_url = build_canonical_youtube_url(video_id)
+    create = sync_to_async(create_quiz_from_cache_entry)
+    return await create(entry, video_url, user)
+
+
+async def aget_transcript_for_video(video_id: str) -> str:
+    """Return the cached transcript or produce it off the event loop."""
+    transcript = await sync_to_async(get_cached_transcript)(video_id)
+    if transcript is not None:
+        return transcript
+    return await run_blocking(get_transcript_for_video, video_id)
+
+
+async def _agenerate_cached_quiz(key: str, prompt: str) -> GeneratedQuiz:
+    """Await Gemini for a prompt and store the result in the quiz cache."""
+    quiz_data = await agenerate_quiz_from_prompt(prompt)
+    return await sync_to_async(store_cached_quiz)(key, quiz_data)
+
+
+async def _shared_quiz_generation(key: str, prompt: str) -> GeneratedQuiz:
+    """Let concurrent coroutines for one prompt await a single Gemini call."""
+    task = _INFLIGHT_QUIZZES.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_agenerate_cached_quiz(key, prompt))
+        _INFLIGHT_QUIZZES[key] = task
+        task.add_done_callback(functools.partial(_forget_task, key))
+    return await asyncio.shield(task)
+
+
+def _forget_task(key: str, task: asyncio.Task) -> None:
+    """Drop a finished task unless a newer one replaced it already."""
+    if _INFLIGHT_QUIZZES.get(key) is task:
+        del _INFLIGHT_QUIZZES[key]
@@ -0,0 +1,84 @@
+"""Audio pre-processing between download and transcription."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from whisper.audio import SAMPLE_RATE, load_audio
+
+NOISE_FLOOR_DB = -60.0
+
+
+def preprocess_audio(audio_path: str | Path) -> np.ndarray:
+    """Decode to 16 kHz mono once and drop silent stretches if enabled."""
+    samples = load_audio(str(audio_path), sr=SAMPLE_RATE)
+    if not settings.AUDIO_VAD_ENABLED:
+        return samples
+    return trim_silence_with_settings(samples)
+
+
+def trim_silence_with_settings(samples: np.ndarray) -> np.ndarray:
+    """Apply trim_silence with the thresholds configured in settings."""
+    return trim_silence(
+        samples,
+        threshold_db=settings.AUDIO_VAD_THRESHOLD_DB,
+        min_silence_ms=settings.AUDIO_VAD_MIN_SILENCE_MS,
+        padding_ms=settings.AUDIO_VAD_PADDING_MS,
+    )
+
+
+def trim_silence(
+    samples: np.ndarray,
+    *,
+    frame_ms: int = 30,
+    threshold_db: float = -35.0,
+    min_silence_ms: int = 700,
+    padding_ms: int = 200,
+) -> np.ndarray:
+    """Remove silent regions using a frame-wise energy threshold.
+
+    Frames quieter than ``threshold_db`` below the loud reference level
+    count as silence. Only silent runs of at least ``min_silence_ms`` are
+    dropped, and speech keeps ``padding_ms`` of context on both sides.
+    """
+    frame_len = SAMPLE_RATE * frame_ms // 1000
+    if samples.size < frame_len:
+        return samples
+    speech = _speech_frames(samples, frame_len, threshold_db)
+    speech = _fill_short_gaps(speech, max(1, min_silence_ms // frame_ms))
+    speech = _dilate(speech, padding_ms // frame_ms)
+    keep = np.repeat(speech, frame_len)[: samples.size]
+    return samples[keep]
+
+
+def _speech_frames(samples: np.ndarray, frame_len: int, threshold_db: float) -> np.ndarray:
+    """Return a boolean speech flag per frame based on RMS level in dB."""
+    n_frames = -(-samples.size // frame_len)
+    padded = np.zeros(n_frames * frame_len, dtype=np.float32)
+    padded[: samples.size] = samples
+    frames = padded.reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1) + 1e-12)
+    level_db = 20.0 * np.log10(rms)
+    reference_db = np.percentile(level_db, 95)
+    return level_db > max(reference_db + threshold_db, NOISE_FLOOR_DB)
+
+
+def _fill_short_gaps(speech: np.ndarray, min_frames: int) -> np.ndarray:
+    """Mark silent runs shorter than ``min_frames`` as speech again."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([1], speech.astype(np.int8), [1]))))
+    starts, ends = edges[::2], edges[1::2]
+    short = (ends - starts) < min_frames
+    filled = speech.copy()
+    for start, end in zip(starts[short], ends[short]):
+        filled[start:end] = True
+    return filled
+
+
+def _dilate(speech: np.ndarray, frames: int) -> np.ndarray:
+    """Extend every speech region by ``frames`` on each side."""
+    if frames <= 0:
+        return speech
+    kernel = np.ones(2 * frames + 1, dtype=np.int32)
+    return np.convolve(speech.astype(np.int32), kernel, mode="same") > 0
@@ -0,0 +1,112 @@
+"""Decode YouTube audio into PCM chunks while it is still downloading."""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+import numpy as np
+from whisper.audio import SAMPLE_RATE
+
+from quiz_app.utils.youtube import extract_video_info
+
+BYTES_PER_SAMPLE = 2
+STDERR_TAIL_LINES = 20
+
+
+def resolve_audio_stream_url(url: str) -> str:
+    """Return the direct media URL of the best audio stream of a video."""
+    ydl_opts = {"format": "bestaudio/best", "quiet": True, "noplaylist": True}
+    info = extract_video_info(url, ydl_opts, download=False)
+    return info["url"]
+
+
+class PcmStream:
+    """Readable PCM output of an FFmpeg process that can be aborted."""
+
+    def __init__(self, process: subprocess.Popen) -> None:
+        self._process = process
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes of PCM data; b"" at the end."""
+        return self._process.stdout.read(size)
+
+    def abort(self) -> None:
+        """Kill FFmpeg so that blocked and later reads return EOF."""
+        self._process.kill()
+
+
+@contextmanager
+def open_pcm_stream(source: str) -> Iterator[PcmStream]:
+    """Run FFmpeg on a URL or file and yield its 16 kHz mono s16le output.
+
+    FFmpeg's stderr is drained by a thread while the output is read, so
+    a chatty process cannot block on a full pipe; its last lines end up
+    in the error message if FFmpeg fails.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", source,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le",
+        "-ar", str(SAMPLE_RATE),
+        "-",
+    ]
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    stderr_tail: deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+    drainer = threading.Thread(
+        target=stderr_tail.extend,
+        args=(process.stderr,),
+        name="ffmpeg-stderr",
+        daemon=True,
+    )
+    drainer.start()
+    try:
+        yield PcmStream(process)
+    except BaseException:
+        process.kill()
+        raise
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+        drainer.join()
+        process.stderr.close()
+    if returncode != 0:
+        stderr = b"".join(stderr_tail).decode(errors="replace")
+        msg = f"Failed to decode audio stream: {stderr.strip()}"
+        raise RuntimeError(msg)
+
+
+@contextmanager
+def open_youtube_pcm_stream(url: str) -> Iterator[PcmStream]:
+    """Stream the audio of a YouTube video as raw PCM without a temp file."""
+    with open_pcm_stream(resolve_audio_stream_url(url)) as stream:
+        yield stream
+
+
+def iter_pcm_chunks(stream: BinaryIO, chunk_seconds: float) -> Iterator[np.ndarray]:
+    """Yield float32 sample arrays of a fixed duration from a PCM stream."""
+    chunk_bytes = int(chunk_seconds * SAMPLE_RATE) * BYTES_PER_SAMPLE
+    buffer = bytearray()
+    while True:
+        data = stream.read(chunk_bytes - len(buffer))
+        if not data:
+            break
+        buffer.extend(data)
+        if len(buffer) >= chunk_bytes:
+            yield pcm_to_float32(bytes(buffer))
+            buffer.clear()
+    usable = len(buffer) - len(buffer) % BYTES_PER_SAMPLE
+    if usable:
+        yield pcm_to_float32(bytes(buffer[:usable]))
+
+
+def pcm_to_float32(data: bytes) -> np.ndarray:
+    """Convert s16le bytes to the float32 waveform format Whisper expects."""
+    return np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
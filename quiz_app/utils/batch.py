@@ -0,0 +1,67 @@
+"""Queue quiz jobs for a batch of YouTube URLs with per-item status."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from django.db import transaction
+
+from quiz_app.models import Quiz, QuizJob
+from quiz_app.utils.jobs import enqueue_quiz_job
+from quiz_app.utils.youtube import (
+    build_canonical_youtube_url,
+    extract_youtube_video_id,
+)
+
+ITEM_QUEUED = "queued"
+ITEM_EXISTS = "exists"
+ITEM_IN_PROGRESS = "in_progress"
+ITEM_DUPLICATE = "duplicate"
+ITEM_INVALID = "invalid"
+
+
+def enqueue_quiz_batch(urls: List[str], user) -> List[Dict[str, Any]]:
+    """Queue one job per new video and report what happened to each URL.
+
+    Videos the user already has a quiz for (``exists``) or a pending or
+    running job for (``in_progress``) are not queued again, and repeats
+    within the batch are reported as ``duplicate``.
+    """
+    items: List[Dict[str, Any]] = []
+    seen: set[str] = set()
+    for url in urls:
+        try:
+            video_url = build_canonical_youtube_url(extract_youtube_video_id(url))
+        except ValueError as error:
+            items.append({"url": url, "status": ITEM_INVALID, "error": str(error)})
+            continue
+        status = ITEM_DUPLICATE if video_url in seen else None
+        seen.add(video_url)
+        items.append({"url": url, "video_url": video_url, "status": status})
+
+    quizzes = dict(
+        Quiz.objects.filter(user=user, video_url__in=seen)
+        .order_by("created_at", "id")
+        .values_list("video_url", "id")
+    )
+    jobs = dict(
+        QuizJob.objects.filter(
+            user=user,
+            url__in=seen,
+            status__in=[QuizJob.STATUS_PENDING, QuizJob.STATUS_RUNNING],
+        ).values_list("url", "id")
+    )
+    with transaction.atomic():
+        for item in items:
+            if item["status"] is not None:
+                continue
+            video_url = item["video_url"]
+            if video_url in quizzes:
+                item.update(status=ITEM_EXISTS, quiz_id=quizzes[video_url])
+            elif video_url in jobs:
+                item.update(status=ITEM_IN_PROGRESS, job_id=jobs[video_url])
+            else:
+                job = enqueue_quiz_job(video_url, user)
+                item.update(status=ITEM_QUEUED, job_id=job.pk)
+    return items
+
@@ -0,0 +1,172 @@
+"""Fit long transcripts into a token budget before prompting Gemini."""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import tiktoken
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN_ESTIMATE = 4
+MAX_SENTENCE_WORDS = 40
+# CJK sentence punctuation is usually not followed by a space.
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|(?<=[。！？；…])\s*")
+REPEATED_PHRASE = re.compile(r"\b(\w+(?:\s+\w+){0,4})(?:[\s,]+\1\b)+", re.IGNORECASE)
+STOPWORDS = frozenset(
+    """
+    about after again also because been before being could does doing during
+    from have having here into just like more most only other over really
+    same should some such than that their them then there these they this
+    those through very what when where which while will with would your
+    """.split()
+)
+
+
+@dataclass(frozen=True)
+class CondensedTranscript:
+    """Condensed transcript text together with its token accounting."""
+
+    text: str
+    original_tokens: int
+    tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        """Number of prompt tokens removed by condensation."""
+        return self.original_tokens - self.tokens
+
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> Optional[tiktoken.Encoding]:
+    """Load the tokenizer once; None if its data cannot be fetched."""
+    try:
+        return tiktoken.get_encoding(settings.PROMPT_TOKEN_ENCODING)
+    except Exception:  # encoding files are downloaded on first use
+        logger.warning("tiktoken encoding unavailable, estimating tokens")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, or estimate them if it is unavailable."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN_ESTIMATE)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def condense_transcript(transcript: str, budget: int) -> CondensedTranscript:
+    """Deduplicate and extractively shorten a transcript to ``budget`` tokens.
+
+    Repeated phrases and sentences are removed first. If the text is still
+    too long, the sentences with the highest content-word frequency score
+    are kept in their original order until the budget is used up. Text
+    without usable sentence breaks is cut after ``budget`` tokens instead.
+    """
+    original_tokens = count_tokens(transcript)
+    sentences = _deduplicate(_split_sentences(transcript))
+    text = " ".join(sentences)
+    tokens = count_tokens(text)
+    if tokens > budget:
+        text = _select_sentences(sentences, budget) or _truncate(text, budget)
+        tokens = count_tokens(text)
+    return CondensedTranscript(text, original_tokens, tokens)
+
+
+def _split_sentences(text: str) -> list[str]:
+    """Split on sentence punctuation, chunking run-on text by word count."""
+    sentences = []
+    for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+        words = sentence.split()
+        for start in range(0, len(words), MAX_SENTENCE_WORDS):
+            sentences.append(" ".join(words[start:start + MAX_SENTENCE_WORDS]))
+    return sentences
+
+
+def _deduplicate(sentences: list[str]) -> list[str]:
+    """Collapse stuttered phrases and drop sentences seen before."""
+    seen: set[str] = set()
+    unique = []
+    for sentence in sentences:
+        sentence = REPEATED_PHRASE.sub(r"\1", sentence)
+        key = _normalize(sentence)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(sentence)
+    return unique
+
+
+def _select_sentences(sentences: list[str], budget: int) -> str:
+    """Greedily keep the best scoring sentences that fit the budget."""
+    weights = _word_weights(sentences)
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda index: _score(sentences[index], weights),
+        reverse=True,
+    )
+    chosen: list[int] = []
+    used = 0
+    for index in ranked:
+        cost = count_tokens(sentences[index]) + 1
+        if used + cost <= budget:
+            chosen.append(index)
+            used += cost
+    return " ".join(sentences[index] for index in sorted(chosen))
+
+
+def _truncate(text: str, budget: int) -> str:
+    """Keep the first ``budget`` tokens of the text."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:budget * CHARS_PER_TOKEN_ESTIMATE]
+    tokens = encoding.encode(text, disallowed_special=())[:budget]
+    # A cut inside a multi-byte character decodes to a replacement char.
+    return encoding.decode(tokens).rstrip("\ufffd")
+
+
+def _word_weights(sentences: list[str]) -> dict[str, float]:
+    """Weight content words by TF-IDF, treating sentences as documents.
+
+    Frequent topic words rank high, while boilerplate that appears in
+    almost every sentence is damped by its low inverse frequency.
+    """
+    term_counts: Counter = Counter()
+    sentence_counts: Counter = Counter()
+    for sentence in sentences:
+        words = _content_words(sentence)
+        term_counts.update(words)
+        sentence_counts.update(set(words))
+    total = len(sentences)
+    return {
+        word: count * math.log(total / sentence_counts[word])
+        for word, count in term_counts.items()
+    }
+
+
+def _score(sentence: str, weights: dict[str, float]) -> float:
+    """Score a sentence by the weight of its content words."""
+    words = _content_words(sentence)
+    if not words:
+        return 0.0
+    return sum(weights[word] for word in words) / math.sqrt(len(words))
+
+
+def _content_words(sentence: str) -> list[str]:
+    """Return lowercase words that carry meaning for ranking."""
+    return [
+        word
+        for word in re.findall(r"\w+", sentence.lower())
+        if len(word) > 3 and word not in STOPWORDS
+    ]
+
+
+def _normalize(sentence: str) -> str:
+    """Reduce a sentence to lowercase words for duplicate detection."""
+    return " ".join(re.findall(r"\w+", sentence.lower()))
@@ -2,13 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import os
-from typing import Any, Dict
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
 
+import httpx
+from django.conf import settings
 from google import genai
+from google.genai import errors, types
+
+from quiz_app.utils.condensation import condense_transcript
+from quiz_app.utils.quiz_stream import QuizStreamParser
+from quiz_app.utils.resilience import (
+    acall_with_retries,
+    call_with_retries,
+    get_breaker,
+)
+
+logger = logging.getLogger(__name__)
 
 GEMINI_MODEL = "gemini-2.5-flash"
+GEMINI_BREAKER = "Gemini"
 
 PROMPT_TEMPLATE = """
 Based on the following transcript, generate a quiz in valid JSON format.
@@ -38,13 +57,83 @@ Transcript:
 """.strip()
 
 
+_CLIENTS: dict[tuple[str, Optional[str]], genai.Client] = {}
+_CLIENTS_LOCK = threading.Lock()
+_CALL_SLOTS: dict[int, threading.BoundedSemaphore] = {}
+_CALL_SLOTS_LOCK = threading.Lock()
+_ASYNC_CALL_SLOTS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+class GeminiBusyError(RuntimeError):
+    """Raised when no Gemini call slot frees up in time."""
+
+
 def get_gemini_client() -> genai.Client:
-    """Create a Gemini client from environment API key."""
+    """Return the shared Gemini client for the configured API key.
+
+    Clients are cached per API key and base URL, so every call reuses the
+    same pooled keep-alive HTTP connections instead of opening new ones.
+    """
     api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
     if not api_key:
         msg = "GOOGLE_API_KEY or GEMINI_API_KEY is not set."
         raise RuntimeError(msg)
-    return genai.Client(api_key=api_key)
+    key = (api_key, settings.GEMINI_BASE_URL or None)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = _CLIENTS[key] = _build_gemini_client(*key)
+    return client
+
+
+def _build_gemini_client(api_key: str, base_url: Optional[str]) -> genai.Client:
+    """Create a client whose HTTP pools keep connections alive."""
+    limits = httpx.Limits(
+        max_connections=settings.GEMINI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.GEMINI_MAX_CONNECTIONS,
+        keepalive_expiry=settings.GEMINI_KEEPALIVE_SECONDS,
+    )
+    http_options = types.HttpOptions(
+        base_url=base_url,
+        timeout=int(settings.GEMINI_TIMEOUT_SECONDS * 1000),
+        client_args={"limits": limits},
+        async_client_args={"limits": limits},
+    )
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+
+@contextmanager
+def gemini_call_slot() -> Iterator[None]:
+    """Limit the number of in-flight Gemini calls in this process."""
+    limit = settings.GEMINI_MAX_CONCURRENT_CALLS
+    with _CALL_SLOTS_LOCK:
+        slots = _CALL_SLOTS.setdefault(limit, threading.BoundedSemaphore(limit))
+    if not slots.acquire(timeout=settings.GEMINI_SLOT_TIMEOUT):
+        msg = "Too many quiz generations in progress. Please try again later."
+        raise GeminiBusyError(msg)
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+@asynccontextmanager
+async def agemini_call_slot() -> AsyncIterator[None]:
+    """Async variant of gemini_call_slot for the running event loop."""
+    loop = asyncio.get_running_loop()
+    slots = _ASYNC_CALL_SLOTS.get(loop)
+    if slots is None:
+        slots = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENT_CALLS)
+        _ASYNC_CALL_SLOTS[loop] = slots
+    try:
+        await asyncio.wait_for(slots.acquire(), settings.GEMINI_SLOT_TIMEOUT)
+    except asyncio.TimeoutError as exc:
+        msg = "Too many quiz generations in progress. Please try again later."
+        raise GeminiBusyError(msg) from exc
+    try:
+        yield
+    finally:
+        slots.release()
 
 
 def build_quiz_prompt(transcript: str) -> str:
@@ -74,13 +163,113 @@ def parse_quiz_json(raw: str) -> Dict[str, Any]:
         raise ValueError(msg) from exc
 
 
+def build_condensed_prompt(transcript: str) -> str:
+    """Condense the transcript to the token budget and build the prompt."""
+    condensed = condense_transcript(
+        transcript,
+        settings.GEMINI_TRANSCRIPT_TOKEN_BUDGET,
+    )
+    logger.info(
+        "Transcript condensed from %d to %d tokens (%d saved)",
+        condensed.original_tokens,
+        condensed.tokens,
+        condensed.tokens_saved,
+    )
+    return build_quiz_prompt(condensed.text)
+
+
 def generate_quiz_from_transcript(transcript: str) -> Dict[str, Any]:
     """Call Gemini with the transcript and parse quiz JSON."""
+    return generate_quiz_from_prompt(build_condensed_prompt(transcript))
+
+
+def generate_quiz_from_prompt(prompt: str) -> Dict[str, Any]:
+    """Call Gemini with a prepared prompt and parse quiz JSON."""
     client = get_gemini_client()
-    prompt = build_quiz_prompt(transcript)
-    response = client.models.generate_content(
-        model=GEMINI_MODEL,
-        contents=prompt,
+
+    def call():
+        with gemini_call_slot():
+            return client.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=prompt,
+            )
+
+    response = call_with_retries(
+        get_breaker(GEMINI_BREAKER),
+        call,
+        is_transient=is_transient_gemini_error,
+        attempts=settings.GEMINI_RETRY_ATTEMPTS,
+        max_wait=settings.GEMINI_RETRY_MAX_WAIT,
     )
     text = response.text or ""
-    return parse_quiz_json(text)
\ No newline at end of file
+    return parse_quiz_json(text)
+
+
+def stream_quiz_from_prompt(
+    prompt: str,
+    on_question: Callable[[Dict[str, Any], Dict[str, Any]], None],
+) -> Dict[str, Any]:
+    """Stream a quiz from Gemini, reporting each question once complete.
+
+    ``on_question`` receives the question and the top-level fields seen
+    so far. Only opening the stream is retried; an error after the first
+    chunk propagates, since questions may already have been reported.
+    """
+    client = get_gemini_client()
+    parser = QuizStreamParser()
+
+    def open_stream():
+        stream = client.models.generate_content_stream(
+            model=GEMINI_MODEL,
+            contents=prompt,
+        )
+        return next(stream, None), stream
+
+    with gemini_call_slot():
+        first, stream = call_with_retries(
+            get_breaker(GEMINI_BREAKER),
+            open_stream,
+            is_transient=is_transient_gemini_error,
+            attempts=settings.GEMINI_RETRY_ATTEMPTS,
+            max_wait=settings.GEMINI_RETRY_MAX_WAIT,
+        )
+        chunks = stream if first is None else _prepend(first, stream)
+        for chunk in chunks:
+            for question in parser.feed(chunk.text or ""):
+                on_question(question, parser.fields)
+    return parse_quiz_json(parser.text)
+
+
+def _prepend(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    """Yield an already fetched item before the remaining ones."""
+    yield first
+    yield from rest
+
+
+async def agenerate_quiz_from_prompt(prompt: str) -> Dict[str, Any]:
+    """Call Gemini through the SDK's async client and parse quiz JSON."""
+    client = get_gemini_client()
+
+    async def call():
+        async with agemini_call_slot():
+            return await client.aio.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=prompt,
+            )
+
+    response = await acall_with_retries(
+        get_breaker(GEMINI_BREAKER),
+        call,
+        is_transient=is_transient_gemini_error,
+        attempts=settings.GEMINI_RETRY_ATTEMPTS,
+        max_wait=settings.GEMINI_RETRY_MAX_WAIT,
+    )
+    text = response.text or ""
+    return parse_quiz_json(text)
+
+
+def is_transient_gemini_error(error: BaseException) -> bool:
+    """Return True for rate limits, server errors, timeouts and I/O errors."""
+    if isinstance(error, errors.APIError):
+        return error.code == 429 or error.code >= 500
+    return isinstance(error, httpx.TransportError)
@@ -0,0 +1,102 @@
+"""Store quiz job progress events and stream them as server-sent events."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from quiz_app.models import QuizJob, QuizJobEvent
+
+FINISHED_STATUSES = (QuizJob.STATUS_SUCCEEDED, QuizJob.STATUS_FAILED)
+
+
+def record_job_event(job_id: int, stage: str, **data: Any) -> QuizJobEvent:
+    """Persist one progress event for a job."""
+    return QuizJobEvent.objects.create(job_id=job_id, stage=stage, data=data)
+
+
+def format_sse(event_id: int | None, event: str, data: Any) -> str:
+    """Encode one message in the text/event-stream format."""
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def iter_job_events(job_id: int, last_event_id: int = 0) -> Iterator[str]:
+    """Yield stored and new events of a job until it has finished.
+
+    The database is polled every QUIZ_JOB_EVENTS_POLL_SECONDS, so events
+    written by worker processes arrive as well. Idle streams get a comment
+    line as heartbeat, and after QUIZ_JOB_EVENTS_TIMEOUT the stream ends;
+    clients reconnect with Last-Event-ID and resume where they left off.
+    """
+    stream = _EventStream(job_id, last_event_id)
+    yield stream.preamble()
+    while True:
+        yield from stream.poll()
+        if stream.done:
+            return
+        time.sleep(settings.QUIZ_JOB_EVENTS_POLL_SECONDS)
+
+
+async def aiter_job_events(
+    job_id: int,
+    last_event_id: int = 0,
+) -> AsyncIterator[str]:
+    """Async iter_job_events for ASGI servers.
+
+    Polls run in a thread and the waits between them on the event loop,
+    so each message reaches the client as soon as it is stored.
+    """
+    stream = _EventStream(job_id, last_event_id)
+    poll = sync_to_async(stream.poll)
+    yield stream.preamble()
+    while True:
+        for message in await poll():
+            yield message
+        if stream.done:
+            return
+        await asyncio.sleep(settings.QUIZ_JOB_EVENTS_POLL_SECONDS)
+
+
+class _EventStream:
+    """Polling state shared by the sync and async event streams."""
+
+    def __init__(self, job_id: int, last_event_id: int) -> None:
+        self.job_id = job_id
+        self.last_event_id = last_event_id
+        self.deadline = time.monotonic() + settings.QUIZ_JOB_EVENTS_TIMEOUT
+        self.last_sent = time.monotonic()
+        self.done = False
+
+    def preamble(self) -> str:
+        """Tell the client how long to wait before reconnecting."""
+        return f"retry: {settings.QUIZ_JOB_EVENTS_RETRY_MS}\n\n"
+
+    def poll(self) -> list[str]:
+        """Return the messages due now and set ``done`` once the stream ends."""
+        finished = QuizJob.objects.filter(
+            pk=self.job_id,
+            status__in=FINISHED_STATUSES,
+        ).exists()
+        events = QuizJobEvent.objects.filter(
+            job_id=self.job_id, id__gt=self.last_event_id
+        )
+        messages = []
+        for event in events.order_by("id"):
+            self.last_event_id = event.pk
+            self.last_sent = time.monotonic()
+            messages.append(format_sse(event.pk, event.stage, event.data))
+        now = time.monotonic()
+        if finished or now >= self.deadline:
+            self.done = True
+        elif now - self.last_sent >= settings.QUIZ_JOB_EVENTS_HEARTBEAT_SECONDS:
+            self.last_sent = now
+            messages.append(": keep-alive\n\n")
+        return messages
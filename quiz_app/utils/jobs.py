@@ -0,0 +1,434 @@
+"""Background job queue that runs the quiz pipeline outside the request."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from quiz_app.models import Quiz, QuizJob
+from quiz_app.utils.job_events import record_job_event
+from quiz_app.utils.progress import STAGE_QUIZ_CREATED
+from quiz_app.utils.quiz_pipeline import create_quiz_from_youtube_url
+from quiz_app.utils.resilience import CircuitOpenError
+from quiz_app.utils.response_cache import invalidate_user_quizzes
+
+logger = logging.getLogger(__name__)
+
+JOB_MODE_THREAD = "thread"
+JOB_MODE_EAGER = "eager"
+JOB_MODE_EXTERNAL = "external"
+
+GENERIC_JOB_ERROR = "Quiz generation failed. Please try again later."
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_job_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used for in-process jobs."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=settings.QUIZ_JOB_WORKERS,
+                thread_name_prefix="quiz-job",
+            )
+    return _EXECUTOR
+
+
+def enqueue_quiz_job(url: str, user) -> QuizJob:
+    """Persist a pending job and dispatch it once the row is committed."""
+    job = QuizJob.objects.create(user=user, url=url)
+    record_job_event(job.pk, QuizJob.STATUS_PENDING)
+    transaction.on_commit(lambda: dispatch_job(job.pk))
+    return job
+
+
+def dispatch_job(job_id: int) -> None:
+    """Hand a pending job to the configured execution mode."""
+    mode = settings.QUIZ_JOB_MODE
+    if mode == JOB_MODE_EAGER:
+        run_job(job_id)
+    elif mode == JOB_MODE_THREAD:
+        # Workers always take the next job in claim order, so a user's
+        # batch cannot jump ahead of jobs queued by other users.
+        get_job_executor().submit(_drain_jobs_in_thread)
+    # JOB_MODE_EXTERNAL: the run_quiz_worker command polls the table.
+
+
+def claim_job(job_id: int) -> bool:
+    """Atomically move a pending job to running; False if already taken.
+
+    Also False while the job's user already has QUIZ_JOB_MAX_PER_USER
+    jobs running; the job stays pending until one of them finishes.
+    """
+    pending = QuizJob.objects.filter(pk=job_id, status=QuizJob.STATUS_PENDING)
+    with transaction.atomic():
+        user_id = pending.values_list("user_id", flat=True).first()
+        if user_id is None:
+            return False
+        _lock_user(user_id)
+        now = timezone.now()
+        updated = _below_user_limit(pending).update(
+            status=QuizJob.STATUS_RUNNING,
+            started_at=now,
+            updated_at=now,
+        )
+    return updated == 1
+
+
+def start_inline_job(url: str, user) -> Optional[QuizJob]:
+    """Create a running job for a caller that runs the pipeline itself.
+
+    Returns None while the user is at QUIZ_JOB_MAX_PER_USER, using the
+    same lock and count as claim_job. The caller keeps the job alive with
+    job_heartbeat and ends it with finish_inline_job.
+    """
+    with transaction.atomic():
+        _lock_user(user.pk)
+        if not _has_free_slot(user.pk):
+            return None
+        job = QuizJob.objects.create(
+            user=user,
+            url=url,
+            status=QuizJob.STATUS_RUNNING,
+            started_at=timezone.now(),
+        )
+        record_job_event(job.pk, QuizJob.STATUS_RUNNING)
+    return job
+
+
+def finish_inline_job(
+    job: QuizJob,
+    *,
+    quiz: Optional[Quiz] = None,
+    error: str = "",
+) -> None:
+    """Mark a job from start_inline_job as succeeded (with quiz) or failed."""
+    status = QuizJob.STATUS_SUCCEEDED if quiz is not None else QuizJob.STATUS_FAILED
+    _finish_job(job, status, quiz=quiz, error=error)
+
+
+def claim_next_job(user_id: Optional[int] = None) -> Optional[int]:
+    """Claim the next pending job (of ``user_id``, if given), or None.
+
+    Jobs of users with the fewest running jobs go first, oldest first
+    among those, so one user's batch does not hold up everyone else.
+    Stale running jobs are requeued first; jobs of users at their
+    parallelism limit are skipped.
+    """
+    requeue_stale_jobs()
+    pending = QuizJob.objects.filter(status=QuizJob.STATUS_PENDING)
+    if user_id is not None:
+        pending = pending.filter(user_id=user_id)
+    pending = (
+        _below_user_limit(pending)
+        .order_by("running", "created_at", "id")
+        .values_list("id", flat=True)
+    )
+    for job_id in pending[:10]:
+        if claim_job(job_id):
+            return job_id
+    return None
+
+
+def run_job(job_id: int) -> None:
+    """Claim and execute a job, then any jobs the limit held back."""
+    if not claim_job(job_id):
+        return
+    execute_job(job_id)
+    while (job_id := claim_next_job()) is not None:
+        execute_job(job_id)
+
+
+def requeue_stale_jobs() -> int:
+    """Put running jobs without a recent heartbeat back to pending.
+
+    Their worker is gone (crash, restart), so a partial quiz they attached
+    is deleted and the job runs again from the start.
+    """
+    stale = QuizJob.objects.filter(
+        status=QuizJob.STATUS_RUNNING,
+        updated_at__lt=_stale_cutoff(),
+    )
+    requeued = 0
+    for job_id, user_id, quiz_id in stale.values_list("id", "user_id", "quiz_id"):
+        with transaction.atomic():
+            updated = stale.filter(pk=job_id).update(
+                status=QuizJob.STATUS_PENDING,
+                quiz=None,
+                started_at=None,
+                updated_at=timezone.now(),
+            )
+            if not updated:
+                continue
+            record_job_event(job_id, QuizJob.STATUS_PENDING, requeued=True)
+            if quiz_id is not None:
+                Quiz.objects.filter(pk=quiz_id).delete()
+        if quiz_id is not None:
+            invalidate_user_quizzes(user_id)
+        logger.warning("Requeued stale quiz job %s", job_id)
+        requeued += 1
+    return requeued
+
+
+def recover_jobs() -> None:
+    """Requeue stale jobs and hand pending ones to the in-process pool."""
+    requeue_stale_jobs()
+    if QuizJob.objects.filter(status=QuizJob.STATUS_PENDING).exists():
+        for _ in range(settings.QUIZ_JOB_WORKERS):
+            get_job_executor().submit(_drain_jobs_in_thread)
+
+
+def start_job_recovery(interval: float) -> threading.Thread:
+    """Run recover_jobs now and every ``interval`` seconds in a daemon thread.
+
+    In thread mode this picks up jobs whose process died, whether they
+    were running or still pending.
+    """
+
+    def run() -> None:
+        while True:
+            close_old_connections()
+            try:
+                recover_jobs()
+            except Exception:
+                logger.exception("Recovering quiz jobs failed")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="quiz-job-recovery", daemon=True)
+    thread.start()
+    return thread
+
+
+def _stale_cutoff() -> datetime:
+    """Running jobs last updated before this have lost their worker."""
+    return timezone.now() - timedelta(seconds=settings.QUIZ_JOB_STALE_SECONDS)
+
+
+def _lock_user(user_id: int) -> None:
+    """Lock the user row until the transaction ends.
+
+    Claims of one user's jobs queue up on it, so a running count and the
+    update that relies on it cannot interleave with another claim.
+    """
+    list(
+        get_user_model()
+        .objects.select_for_update()
+        .filter(pk=user_id)
+        .values_list("pk", flat=True)
+    )
+
+
+def _fresh_running_jobs():
+    """Running jobs that still send heartbeats."""
+    return QuizJob.objects.filter(
+        status=QuizJob.STATUS_RUNNING,
+        updated_at__gte=_stale_cutoff(),
+    )
+
+
+def _has_free_slot(user_id: int) -> bool:
+    """Return True if the user runs fewer than QUIZ_JOB_MAX_PER_USER jobs."""
+    limit = settings.QUIZ_JOB_MAX_PER_USER
+    if limit <= 0:
+        return True
+    return _fresh_running_jobs().filter(user_id=user_id).count() < limit
+
+
+def _below_user_limit(jobs):
+    """Keep only jobs whose user runs fewer than QUIZ_JOB_MAX_PER_USER jobs.
+
+    Adds the user's running job count as the ``running`` alias; stale
+    running jobs do not count towards it.
+    """
+    running = (
+        _fresh_running_jobs()
+        .filter(user_id=OuterRef("user_id"))
+        .order_by()
+        .values("user_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    jobs = jobs.alias(running=Coalesce(Subquery(running), 0))
+    limit = settings.QUIZ_JOB_MAX_PER_USER
+    if limit <= 0:
+        return jobs
+    return jobs.filter(running__lt=limit)
+
+
+def execute_job(job_id: int) -> None:
+    """Run the quiz pipeline for an already claimed job."""
+    job = QuizJob.objects.select_related("user").get(pk=job_id)
+    record_job_event(job_id, QuizJob.STATUS_RUNNING)
+    try:
+        with job_heartbeat(job_id):
+            quiz = create_quiz_from_youtube_url(
+                job.url,
+                job.user,
+                progress=JobProgress(job),
+            )
+    except (ValueError, CircuitOpenError) as error:
+        _finish_job(job, QuizJob.STATUS_FAILED, error=str(error))
+    except Exception:
+        logger.exception("Quiz job %s failed", job_id)
+        _finish_job(job, QuizJob.STATUS_FAILED, error=GENERIC_JOB_ERROR)
+    else:
+        _finish_job(job, QuizJob.STATUS_SUCCEEDED, quiz=quiz)
+
+
+@contextmanager
+def job_heartbeat(job_id: int) -> Iterator[None]:
+    """Touch the running job every QUIZ_JOB_HEARTBEAT_SECONDS meanwhile."""
+    stop = threading.Event()
+
+    def beat() -> None:
+        try:
+            while not stop.wait(settings.QUIZ_JOB_HEARTBEAT_SECONDS):
+                try:
+                    touch_job(job_id)
+                except Exception:
+                    logger.exception("Heartbeat of quiz job %s failed", job_id)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(
+        target=beat, name=f"quiz-job-{job_id}-heartbeat", daemon=True
+    )
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+@asynccontextmanager
+async def ajob_heartbeat(job_id: int) -> AsyncIterator[None]:
+    """Async job_heartbeat that beats from a task on the event loop."""
+    task = asyncio.create_task(_abeat(job_id))
+    try:
+        yield
+    finally:
+        task.cancel()
+
+
+def touch_job(job_id: int) -> None:
+    """Mark a running job as alive so recovery does not requeue it."""
+    QuizJob.objects.filter(pk=job_id, status=QuizJob.STATUS_RUNNING).update(
+        updated_at=timezone.now()
+    )
+
+
+async def _abeat(job_id: int) -> None:
+    """Touch the job every QUIZ_JOB_HEARTBEAT_SECONDS until cancelled."""
+    touch = sync_to_async(touch_job)
+    while True:
+        await asyncio.sleep(settings.QUIZ_JOB_HEARTBEAT_SECONDS)
+        try:
+            await touch(job_id)
+        except Exception:
+            logger.exception("Heartbeat of quiz job %s failed", job_id)
+
+
+class JobProgress:
+    """Pipeline progress callback that stores events for a job.
+
+    Percent and seconds updates of a stage are written at most every
+    QUIZ_JOB_PROGRESS_INTERVAL seconds; first and final values always are.
+    """
+
+    def __init__(self, job: QuizJob) -> None:
+        self.job = job
+        self._last_written: dict[str, float] = {}
+
+    def __call__(self, stage: str, **data) -> None:
+        """Record one pipeline stage update."""
+        if stage == STAGE_QUIZ_CREATED:
+            quiz = data.pop("quiz")
+            _attach_quiz(self.job, quiz)
+            data["quiz_id"] = quiz.pk
+        elif self._throttled(stage, data):
+            return
+        record_job_event(self.job.pk, stage, **data)
+
+    def _throttled(self, stage: str, data: dict) -> bool:
+        """Return True for intermediate updates that come too quickly."""
+        if data.get("percent") in (None, 0.0, 100.0) and "seconds" not in data:
+            return False
+        now = time.monotonic()
+        last = self._last_written.get(stage)
+        if last is not None and now - last < settings.QUIZ_JOB_PROGRESS_INTERVAL:
+            return True
+        self._last_written[stage] = now
+        return False
+
+
+def _attach_quiz(job: QuizJob, quiz: Quiz) -> None:
+    """Link a quiz that is still being filled so pollers can read it."""
+    job.quiz = quiz
+    job.save(update_fields=["quiz", "updated_at"])
+
+
+def _finish_job(
+    job: QuizJob,
+    status: str,
+    *,
+    quiz: Optional[Quiz] = None,
+    error: str = "",
+) -> None:
+    """Store the final status, result and error message of a job.
+
+    Nothing is stored if the job was requeued as stale meanwhile; its
+    quiz is dropped since the rerun creates a new one.
+    """
+    job.status = status
+    job.quiz = quiz
+    job.error = error
+    job.finished_at = timezone.now()
+    data = {"quiz_id": quiz.pk} if quiz is not None else {"error": error}
+    with transaction.atomic():
+        updated = QuizJob.objects.filter(
+            pk=job.pk,
+            status=QuizJob.STATUS_RUNNING,
+            started_at=job.started_at,
+        ).update(
+            status=status,
+            quiz=quiz,
+            error=error,
+            finished_at=job.finished_at,
+            updated_at=job.finished_at,
+        )
+        if updated:
+            record_job_event(job.pk, status, **data)
+            return
+    logger.warning("Quiz job %s was requeued while running", job.pk)
+    if quiz is not None:
+        quiz.delete()
+        invalidate_user_quizzes(job.user_id)
+
+
+def _drain_jobs_in_thread() -> None:
+    """Executor entry point that runs pending jobs until none is claimable."""
+    close_old_connections()
+    try:
+        while (job_id := claim_next_job()) is not None:
+            execute_job(job_id)
+    except Exception:
+        logger.exception("Unhandled error while draining quiz jobs")
+    finally:
+        connection.close()
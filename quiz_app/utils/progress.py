@@ -0,0 +1,30 @@
+"""Progress hooks that let callers follow the quiz pipeline stages."""
+
+from __future__ import annotations
+
+import functools
+from typing import Any, Callable, Optional
+
+ProgressCallback = Callable[..., None]
+
+STAGE_DOWNLOADING = "downloading"
+STAGE_TRANSCRIBING = "transcribing"
+STAGE_GENERATING = "generating"
+STAGE_QUIZ_CREATED = "quiz_created"
+STAGE_QUESTION_SAVED = "question_saved"
+
+
+def report(progress: Optional[ProgressCallback], stage: str, **data: Any) -> None:
+    """Call ``progress(stage, **data)`` if a callback was given."""
+    if progress is not None:
+        progress(stage, **data)
+
+
+def stage_callback(
+    progress: Optional[ProgressCallback],
+    stage: str,
+) -> Optional[Callable[..., None]]:
+    """Bind a stage to the callback, or return None without a callback."""
+    if progress is None:
+        return None
+    return functools.partial(progress, stage)
@@ -0,0 +1,91 @@
+"""Content-addressed cache of generated quiz JSON with TTL and LRU eviction."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from quiz_app.models import GeneratedQuiz
+from quiz_app.utils.gemini_client import GEMINI_MODEL
+
+logger = logging.getLogger(__name__)
+
+_STATS: Counter = Counter()
+_STATS_LOCK = threading.Lock()
+
+
+def quiz_cache_key(prompt: str) -> str:
+    """Hash the Gemini model and full prompt (template plus transcript)."""
+    digest = hashlib.sha256()
+    digest.update(GEMINI_MODEL.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_cached_quiz(key: str, *, record: bool = True) -> Optional[GeneratedQuiz]:
+    """Return a live cache entry and mark it as used, or None."""
+    now = timezone.now()
+    entry = (
+        GeneratedQuiz.objects.filter(key=key, expires_at__gt=now).first()
+    )
+    if record:
+        _record("hits" if entry is not None else "misses")
+    if entry is not None:
+        GeneratedQuiz.objects.filter(pk=entry.pk).update(
+            last_accessed_at=now,
+            hit_count=F("hit_count") + 1,
+        )
+    return entry
+
+
+def store_cached_quiz(key: str, quiz_data: Dict[str, Any]) -> GeneratedQuiz:
+    """Store generated quiz JSON and evict expired or surplus entries."""
+    now = timezone.now()
+    entry, _ = GeneratedQuiz.objects.update_or_create(
+        key=key,
+        defaults={
+            "quiz_data": quiz_data,
+            "expires_at": now + timedelta(seconds=settings.QUIZ_CACHE_TTL_SECONDS),
+            "last_accessed_at": now,
+        },
+    )
+    evict_cached_quizzes()
+    return entry
+
+
+def evict_cached_quizzes(max_entries: Optional[int] = None) -> int:
+    """Delete expired entries, then the least recently used surplus."""
+    if max_entries is None:
+        max_entries = settings.QUIZ_CACHE_MAX_ENTRIES
+    deleted, _ = GeneratedQuiz.objects.filter(expires_at__lte=timezone.now()).delete()
+    surplus_ids = list(
+        GeneratedQuiz.objects.order_by("-last_accessed_at", "-id").values_list(
+            "id", flat=True
+        )[max_entries:]
+    )
+    if surplus_ids:
+        deleted += GeneratedQuiz.objects.filter(id__in=surplus_ids).delete()[0]
+    return deleted
+
+
+def quiz_cache_stats() -> Dict[str, int]:
+    """Return hit and miss counters of this process."""
+    with _STATS_LOCK:
+        return {"hits": _STATS["hits"], "misses": _STATS["misses"]}
+
+
+def _record(outcome: str) -> None:
+    """Increment a counter and log the running totals."""
+    with _STATS_LOCK:
+        _STATS[outcome] += 1
+        hits, misses = _STATS["hits"], _STATS["misses"]
+    logger.info("Quiz cache %s (hits=%d, misses=%d)", outcome[:-1], hits, misses)
@@ -1,20 +1,203 @@
 """High-level helper functions to build quizzes from YouTube videos."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from quiz_app.models import Quiz, Question
-from quiz_app.utils.youtube import download_youtube_audio
-from quiz_app.utils.transcription import transcribe_audio
-from quiz_app.utils.gemini_client import generate_quiz_from_transcript
+from django.conf import settings
 
+from quiz_app.models import GeneratedQuiz, Quiz, Question
+from quiz_app.utils.audio_preprocessing import preprocess_audio
+from quiz_app.utils.audio_stream import open_youtube_pcm_stream
+from quiz_app.utils.youtube import (
+    build_canonical_youtube_url,
+    download_youtube_audio,
+    extract_youtube_video_id,
+)
+from quiz_app.utils.progress import (
+    STAGE_DOWNLOADING,
+    STAGE_GENERATING,
+    STAGE_QUESTION_SAVED,
+    STAGE_QUIZ_CREATED,
+    STAGE_TRANSCRIBING,
+    ProgressCallback,
+    report,
+    stage_callback,
+)
+from quiz_app.utils.response_cache import invalidate_user_quizzes
+from quiz_app.utils.single_flight import single_flight
+from quiz_app.utils.transcription import transcribe_audio, transcribe_pcm_stream
+from quiz_app.utils.transcript_cache import (
+    get_cached_transcript,
+    store_transcript,
+)
+from quiz_app.utils.gemini_client import (
+    build_condensed_prompt,
+    generate_quiz_from_prompt,
+    stream_quiz_from_prompt,
+)
+from quiz_app.utils.quiz_cache import (
+    get_cached_quiz,
+    quiz_cache_key,
+    store_cached_quiz,
+)
 
-def create_quiz_from_youtube_url(url: str, user) -> Quiz:
-    """Create and persist a quiz for the given user and YouTube URL."""
-    audio_path, canonical_url = download_youtube_audio(url)
-    transcript = transcribe_audio(str(audio_path))
-    quiz_data = generate_quiz_from_transcript(transcript)
-    video_url = str(canonical_url)
-    return _create_quiz_with_questions(quiz_data, video_url, user)
+
+def create_quiz_from_youtube_url(
+    url: str,
+    user,
+    progress: Optional[ProgressCallback] = None,
+) -> Quiz:
+    """Create and persist a quiz for the given user and YouTube URL.
+
+    ``progress`` is called as ``progress(stage, **data)`` for each stage in
+    quiz_app.utils.progress. With GEMINI_STREAMING the quiz row is created
+    as soon as the first question arrives and reported as ``quiz_created``
+    with ``quiz=``, so it can be read while the rest is still generated.
+    """
+    video_id = extract_youtube_video_id(url)
+    transcript = get_transcript_for_video(video_id, progress)
+    video_url = build_canonical_youtube_url(video_id)
+    prompt = build_condensed_prompt(transcript)
+    key = quiz_cache_key(prompt)
+    report(progress, STAGE_GENERATING)
+    entry = get_cached_quiz(key)
+    streamed: list[Quiz] = []
+    if entry is None:
+        entry = single_flight(
+            f"quiz-{key}",
+            lambda: _load_or_generate_quiz(
+                key, prompt, video_url, user, progress, streamed
+            ),
+        )
+    if streamed:
+        return streamed[0]
+    return create_quiz_from_cache_entry(entry, video_url, user)
+
+
+def get_transcript_for_video(
+    video_id: str,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    """Return a cached transcript or download and transcribe the video."""
+    transcript = get_cached_transcript(video_id)
+    if transcript is not None:
+        return transcript
+    return single_flight(
+        f"transcript-{settings.WHISPER_MODEL_NAME}-{video_id}",
+        lambda: _load_or_transcribe_video(video_id, progress),
+    )
+
+
+def _load_or_transcribe_video(
+    video_id: str,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    """Transcribe a video unless a concurrent leader already cached it."""
+    transcript = get_cached_transcript(video_id)
+    if transcript is not None:
+        return transcript
+    canonical_url = build_canonical_youtube_url(video_id)
+    transcript = _transcribe_video(canonical_url, progress)
+    store_transcript(video_id, transcript)
+    return transcript
+
+
+def _load_or_generate_quiz(
+    key: str,
+    prompt: str,
+    video_url: str,
+    user,
+    progress: Optional[ProgressCallback],
+    streamed: list[Quiz],
+) -> GeneratedQuiz:
+    """Generate quiz JSON unless a concurrent leader already cached it.
+
+    In streaming mode the leader's own quiz is built while generating and
+    appended to ``streamed``; followers build theirs from the entry.
+    """
+    entry = get_cached_quiz(key, record=False)
+    if entry is not None:
+        return entry
+    if not settings.GEMINI_STREAMING:
+        return store_cached_quiz(key, generate_quiz_from_prompt(prompt))
+    quiz, quiz_data = _stream_quiz_into_db(prompt, video_url, user, progress)
+    streamed.append(quiz)
+    return store_cached_quiz(key, quiz_data)
+
+
+def _stream_quiz_into_db(
+    prompt: str,
+    video_url: str,
+    user,
+    progress: Optional[ProgressCallback],
+) -> tuple[Quiz, Dict[str, Any]]:
+    """Save each streamed question right away; drop the quiz on failure."""
+    created: list[Quiz] = []
+    saved: list[Dict[str, Any]] = []
+
+    def save_question(question: Dict[str, Any], fields: Dict[str, Any]) -> None:
+        if not created:
+            created.append(_create_quiz_instance(_quiz_header(fields), video_url, user))
+            report(progress, STAGE_QUIZ_CREATED, quiz=created[0])
+        _create_questions_for_quiz(created[0], [question])
+        invalidate_user_quizzes(user.pk)
+        saved.append(question)
+        report(progress, STAGE_QUESTION_SAVED, number=len(saved))
+
+    try:
+        quiz_data = stream_quiz_from_prompt(prompt, save_question)
+        if not created:
+            return _create_quiz_with_questions(quiz_data, video_url, user), quiz_data
+    except Exception:
+        if created:
+            created[0].delete()
+            invalidate_user_quizzes(user.pk)
+        raise
+    quiz = created[0]
+    header = _quiz_header(quiz_data)
+    if (quiz.title, quiz.description) != (header["title"], header["description"]):
+        quiz.title = header["title"]
+        quiz.description = header["description"]
+        quiz.save(update_fields=["title", "description", "updated_at"])
+        invalidate_user_quizzes(user.pk)
+    return quiz, quiz_data
+
+
+def _quiz_header(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Return title and description, empty while not generated yet."""
+    return {
+        "title": fields.get("title", ""),
+        "description": fields.get("description", ""),
+    }
+
+
+def create_quiz_from_cache_entry(
+    entry: GeneratedQuiz,
+    video_url: str,
+    user,
+) -> Quiz:
+    """Build the user's own copy of the cached quiz JSON.
+
+    The copy comes from the stored snapshot, never from another user's
+    quiz, so later edits by that user do not leak into it.
+    """
+    return _create_quiz_with_questions(entry.quiz_data, video_url, user)
+
+
+def _transcribe_video(
+    canonical_url: str,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    """Transcribe a video either from a streamed or a downloaded file."""
+    on_transcribing = stage_callback(progress, STAGE_TRANSCRIBING)
+    if settings.STREAMING_TRANSCRIPTION:
+        report(progress, STAGE_DOWNLOADING)
+        with open_youtube_pcm_stream(canonical_url) as stream:
+            return transcribe_pcm_stream(stream, on_transcribing)
+    report(progress, STAGE_DOWNLOADING, percent=0.0)
+    on_downloading = stage_callback(progress, STAGE_DOWNLOADING)
+    audio_path, _ = download_youtube_audio(canonical_url, on_downloading)
+    report(progress, STAGE_TRANSCRIBING, percent=0.0)
+    return transcribe_audio(preprocess_audio(audio_path), on_transcribing)
 
 
 def _create_quiz_with_questions(
@@ -25,6 +208,7 @@ def _create_quiz_with_questions(
     """Create a Quiz and its Question objects from AI output."""
     quiz = _create_quiz_instance(quiz_data, video_url, user)
     _create_questions_for_quiz(quiz, quiz_data["questions"])
+    invalidate_user_quizzes(user.pk)
     return quiz
 
 
@@ -54,4 +238,4 @@ def _create_questions_for_quiz(quiz: Quiz, questions: list[Dict[str, Any]]) -> N
             )
             for item in questions
         ]
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,111 @@
+"""Incremental parser that yields quiz questions from partial Gemini output."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+QUESTIONS_KEY = "questions"
+
+
+class _Frame:
+    """One open JSON object or array on the parser stack."""
+
+    __slots__ = ("kind", "name", "key", "expect_key")
+
+    def __init__(self, kind: str, name: Optional[str]) -> None:
+        self.kind = kind
+        self.name = name
+        self.key: Optional[str] = None
+        self.expect_key = kind == "{"
+
+
+class QuizStreamParser:
+    """Scan streamed quiz JSON and emit each question once it is complete.
+
+    Text before the root object (such as a ```json fence) and after it is
+    ignored. Top-level string fields like ``title`` are collected in
+    ``fields`` as soon as their closing quote arrives.
+    """
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._question_start = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume more text and return the questions completed by it."""
+        self._text += chunk
+        questions: List[Dict[str, Any]] = []
+        text = self._text
+        while self._pos < len(text) and not self.done:
+            char = text[self._pos]
+            if self._in_string:
+                self._scan_string(char)
+            elif not self._stack:
+                if char == "{":
+                    self._stack.append(_Frame("{", None))
+            else:
+                question = self._scan_structure(char)
+                if question is not None:
+                    questions.append(question)
+            self._pos += 1
+        return questions
+
+    @property
+    def text(self) -> str:
+        """Return all text received so far."""
+        return self._text
+
+    def _scan_string(self, char: str) -> None:
+        """Track escapes and record top-level strings when they close."""
+        if self._escaped:
+            self._escaped = False
+        elif char == "\\":
+            self._escaped = True
+        elif char == '"':
+            self._in_string = False
+            if len(self._stack) == 1:
+                value = json.loads(self._text[self._string_start:self._pos + 1])
+                frame = self._stack[0]
+                if frame.expect_key:
+                    frame.key = value
+                else:
+                    self.fields[frame.key] = value
+
+    def _scan_structure(self, char: str) -> Optional[Dict[str, Any]]:
+        """Handle a character outside strings; return a finished question."""
+        frame = self._stack[-1]
+        if char == '"':
+            self._in_string = True
+            self._string_start = self._pos
+        elif char in "{[":
+            if char == "{" and self._inside_questions():
+                self._question_start = self._pos
+            name = frame.key if frame.kind == "{" else None
+            self._stack.append(_Frame(char, name))
+        elif char in "}]":
+            self._stack.pop()
+            if not self._stack:
+                self.done = True
+            elif char == "}" and self._inside_questions():
+                return json.loads(self._text[self._question_start:self._pos + 1])
+        elif frame.kind == "{" and char == ":":
+            frame.expect_key = False
+        elif frame.kind == "{" and char == ",":
+            frame.expect_key = True
+        return None
+
+    def _inside_questions(self) -> bool:
+        """Return True if the innermost container is the questions array."""
+        return (
+            len(self._stack) == 2
+            and self._stack[1].kind == "["
+            and self._stack[1].name == QUESTIONS_KEY
+        )
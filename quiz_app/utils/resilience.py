@@ -0,0 +1,256 @@
+"""Retries with backoff and circuit breakers for outbound service calls."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from django.conf import settings
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half-open"
+
+_BREAKERS: dict[str, "CircuitBreaker"] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a service whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Fail fast once the recent error rate of a service gets too high.
+
+    Outcomes of the last ``window_seconds`` are kept. When at least
+    ``min_calls`` were recorded and the share of failures reaches
+    ``failure_rate``, the circuit opens for ``recovery_seconds``. After
+    that a single trial call is let through (half-open): success closes
+    the circuit again, failure reopens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window_seconds: float = 60,
+        recovery_seconds: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.recovery_seconds = recovery_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half-open without reserving a trial call."""
+        with self._lock:
+            return self._state()
+
+    def is_open(self) -> bool:
+        """Return True while calls would be rejected."""
+        return self.state == STATE_OPEN
+
+    def before_call(self) -> None:
+        """Reserve a call or raise CircuitOpenError."""
+        with self._lock:
+            state = self._state()
+            if state == STATE_CLOSED:
+                return
+            if state == STATE_HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+        msg = f"{self.name} is temporarily unavailable. Please try again later."
+        raise CircuitOpenError(msg)
+
+    def record_success(self) -> None:
+        """Record a successful call and close a half-open circuit."""
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Circuit %s closed", self.name)
+                self._opened_at = None
+                self._outcomes.clear()
+            self._trial_running = False
+            self._append(False)
+
+    def record_failure(self) -> None:
+        """Record a failed call and open the circuit if the rate is too high."""
+        with self._lock:
+            now = self._clock()
+            if self._opened_at is not None:
+                self._opened_at = now
+                self._trial_running = False
+                return
+            self._append(True)
+            failures = sum(1 for _, failed in self._outcomes if failed)
+            total = len(self._outcomes)
+            if total >= self.min_calls and failures / total >= self.failure_rate:
+                logger.warning(
+                    "Circuit %s opened after %d of %d calls failed",
+                    self.name,
+                    failures,
+                    total,
+                )
+                self._opened_at = now
+
+    def reset(self) -> None:
+        """Forget all recorded outcomes and close the circuit."""
+        with self._lock:
+            self._outcomes.clear()
+            self._opened_at = None
+            self._trial_running = False
+
+    def _state(self) -> str:
+        """Compute the state; the caller must hold the lock."""
+        if self._opened_at is None:
+            return STATE_CLOSED
+        if self._clock() - self._opened_at < self.recovery_seconds:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    def _append(self, failed: bool) -> None:
+        """Store an outcome and drop those older than the window."""
+        now = self._clock()
+        self._outcomes.append((now, failed))
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a service."""
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(name)
+        if breaker is None:
+            breaker = _BREAKERS[name] = CircuitBreaker(
+                name,
+                failure_rate=settings.CIRCUIT_BREAKER_FAILURE_RATE,
+                min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+                window_seconds=settings.CIRCUIT_BREAKER_WINDOW_SECONDS,
+                recovery_seconds=settings.CIRCUIT_BREAKER_RECOVERY_SECONDS,
+            )
+    return breaker
+
+
+def open_circuits() -> list[str]:
+    """Return the names of all services whose circuit is currently open."""
+    with _BREAKERS_LOCK:
+        breakers = list(_BREAKERS.values())
+    return [breaker.name for breaker in breakers if breaker.is_open()]
+
+
+def call_with_retries(
+    breaker: CircuitBreaker,
+    fn: Callable[[], T],
+    *,
+    is_transient: Callable[[BaseException], bool],
+    attempts: int,
+    max_wait: float,
+) -> T:
+    """Call ``fn`` through the breaker, retrying transient errors.
+
+    Waits between attempts grow exponentially with full jitter and are
+    capped by ``max_wait``. Only transient errors count as breaker
+    failures; other exceptions propagate immediately.
+    """
+    retrying = Retrying(
+        stop=stop_after_attempt(attempts),
+        wait=wait_random_exponential(multiplier=0.5, max=max_wait),
+        retry=retry_if_exception(is_transient),
+        before_sleep=_log_retry(breaker.name),
+        reraise=True,
+    )
+    return retrying(_guarded_call, breaker, fn, is_transient)
+
+
+async def acall_with_retries(
+    breaker: CircuitBreaker,
+    fn: Callable[[], Awaitable[T]],
+    *,
+    is_transient: Callable[[BaseException], bool],
+    attempts: int,
+    max_wait: float,
+) -> T:
+    """Async variant of call_with_retries for coroutine functions."""
+    retrying = AsyncRetrying(
+        stop=stop_after_attempt(attempts),
+        wait=wait_random_exponential(multiplier=0.5, max=max_wait),
+        retry=retry_if_exception(is_transient),
+        before_sleep=_log_retry(breaker.name),
+        reraise=True,
+    )
+    async for attempt in retrying:
+        with attempt:
+            breaker.before_call()
+            try:
+                result = await fn()
+            except BaseException as error:
+                _record_error(breaker, error, is_transient)
+                raise
+            breaker.record_success()
+    return result
+
+
+def _guarded_call(
+    breaker: CircuitBreaker,
+    fn: Callable[[], T],
+    is_transient: Callable[[BaseException], bool],
+) -> T:
+    """Run one attempt and report its outcome to the breaker."""
+    breaker.before_call()
+    try:
+        result = fn()
+    except BaseException as error:
+        _record_error(breaker, error, is_transient)
+        raise
+    breaker.record_success()
+    return result
+
+
+def _record_error(
+    breaker: CircuitBreaker,
+    error: BaseException,
+    is_transient: Callable[[BaseException], bool],
+) -> None:
+    """Count transient errors as failures; others prove the service is up."""
+    if is_transient(error):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def _log_retry(name: str) -> Callable:
+    """Build a tenacity hook that logs each retry of a service call."""
+
+    def log(retry_state) -> None:
+        logger.warning(
+            "%s call failed (%s), retry %d in %.1fs",
+            name,
+            retry_state.outcome.exception(),
+            retry_state.attempt_number,
+            retry_state.next_action.sleep,
+        )
+
+    return log
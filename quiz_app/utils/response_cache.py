@@ -0,0 +1,96 @@
+"""Per-user cache of quiz read responses with version-stamped keys.
+
+Every user has a version token. Cache keys and ETags embed it, so bumping
+the token after any write makes all cached list and detail responses of
+that user unreachable at once; stale entries simply expire.
+
+Version tokens expire after QUIZ_RESPONSE_CACHE_TTL like the entries do.
+The default file backend is shared per host; with a per-process backend,
+a process that missed another process's bump serves stale responses and
+304s for at most that long.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import uuid
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+CACHE_ALIAS = "quiz_responses"
+
+
+def get_cache():
+    """Return the configured response cache backend."""
+    return caches[CACHE_ALIAS]
+
+
+def get_user_version(user_id: int) -> str:
+    """Return the user's current version token, creating one if missing."""
+    cache = get_cache()
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, settings.QUIZ_RESPONSE_CACHE_TTL)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_user_quizzes(user_id: int) -> None:
+    """Bump the user's version now and again after the transaction commits.
+
+    The second bump discards responses that were cached from the old
+    rows while the write was still uncommitted.
+    """
+    _bump_version(user_id)
+    transaction.on_commit(lambda: _bump_version(user_id))
+
+
+def response_cache_key(user_id: int, uri: str) -> str:
+    """Build the cache key of one request URI for a user."""
+    digest = hashlib.sha256(uri.encode("utf-8")).hexdigest()[:32]
+    return f"quiz-response:{user_id}:{get_user_version(user_id)}:{digest}"
+
+
+def make_etag(cache_key: str) -> str:
+    """Derive a weak ETag from a version-stamped cache key."""
+    return f'W/"{hashlib.sha256(cache_key.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return True if an If-None-Match header covers the ETag."""
+    if not if_none_match:
+        return False
+    candidates = {value.strip() for value in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+
+def get_cached_response(cache_key: str) -> Optional[dict[str, Any]]:
+    """Return a cached response entry with ``data`` and ``headers``."""
+    return get_cache().get(cache_key)
+
+
+def store_response(cache_key: str, data: Any, headers: dict[str, str]) -> None:
+    """Store serialized response data and extra headers."""
+    get_cache().set(
+        cache_key,
+        {"data": data, "headers": headers},
+        settings.QUIZ_RESPONSE_CACHE_TTL,
+    )
+
+
+def _version_key(user_id: int) -> str:
+    """Return the cache key of a user's version token."""
+    return f"quiz-response-version:{user_id}"
+
+
+def _bump_version(user_id: int) -> None:
+    """Replace the user's version token with a fresh one."""
+    get_cache().set(
+        _version_key(user_id),
+        uuid.uuid4().hex,
+        settings.QUIZ_RESPONSE_CACHE_TTL,
+    )
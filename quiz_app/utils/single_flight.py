@@ -0,0 +1,88 @@
+"""Share one in-flight computation between concurrent callers of a key."""
+
+from __future__ import annotations
+
+import re
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar
+
+from django.conf import settings
+from filelock import FileLock, Timeout
+
+T = TypeVar("T")
+
+
+class _Call:
+    """State of one in-flight computation shared by its waiters."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+_CALLS: dict[str, _Call] = {}
+_CALLS_LOCK = threading.Lock()
+
+
+def single_flight(
+    key: str,
+    fn: Callable[[], T],
+    *,
+    cross_process: bool = True,
+) -> T:
+    """Run fn once per key; concurrent callers wait for and share the result.
+
+    With ``cross_process`` the leader additionally holds a file lock, so
+    other processes on the same host serialize on the key. ``fn`` should
+    re-check any shared cache before doing expensive work.
+    """
+    with _CALLS_LOCK:
+        call = _CALLS.get(key)
+        is_leader = call is None
+        if is_leader:
+            call = _CALLS[key] = _Call()
+    if not is_leader:
+        return _wait_for(call, key)
+    try:
+        lock = _file_lock(key) if cross_process else nullcontext()
+        with lock:
+            call.result = fn()
+    except BaseException as error:
+        call.error = error
+        raise
+    finally:
+        with _CALLS_LOCK:
+            _CALLS.pop(key, None)
+        call.done.set()
+    return call.result
+
+
+def _wait_for(call: _Call, key: str):
+    """Block until the leader finishes and return or raise its outcome."""
+    if not call.done.wait(settings.SINGLE_FLIGHT_TIMEOUT):
+        msg = f"Timed out waiting for in-flight work on {key}."
+        raise TimeoutError(msg)
+    if call.error is not None:
+        raise call.error
+    return call.result
+
+
+@contextmanager
+def _file_lock(key: str) -> Iterator[None]:
+    """Hold an exclusive per-key lock file shared by all local processes."""
+    lock_dir = Path(settings.SINGLE_FLIGHT_LOCK_DIR)
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    safe_key = re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+    lock = FileLock(str(lock_dir / f"{safe_key}.lock"))
+    try:
+        lock.acquire(timeout=settings.SINGLE_FLIGHT_TIMEOUT)
+    except Timeout as exc:
+        msg = f"Timed out waiting for lock on {key}."
+        raise TimeoutError(msg) from exc
+    try:
+        yield
+    finally:
+        lock.release()
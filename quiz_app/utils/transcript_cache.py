@@ -0,0 +1,68 @@
+"""Persistent per-video transcript cache with size-based LRU eviction.
+
+Entries are keyed by video ID and WHISPER_MODEL_NAME, so switching the
+model transcribes videos again instead of serving the old model's text.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from quiz_app.models import Transcript
+
+
+def get_cached_transcript(video_id: str) -> Optional[str]:
+    """Return the cached transcript for a video and mark it as used."""
+    entry = (
+        Transcript.objects.filter(
+            video_id=video_id,
+            model_name=settings.WHISPER_MODEL_NAME,
+        )
+        .only("text")
+        .first()
+    )
+    if entry is None:
+        return None
+    Transcript.objects.filter(pk=entry.pk).update(
+        last_accessed_at=timezone.now(),
+        hit_count=F("hit_count") + 1,
+    )
+    return entry.text
+
+
+def store_transcript(video_id: str, text: str) -> None:
+    """Save a transcript and evict old entries beyond the size limit."""
+    if not text:
+        return
+    Transcript.objects.update_or_create(
+        video_id=video_id,
+        model_name=settings.WHISPER_MODEL_NAME,
+        defaults={
+            "text": text,
+            "size_bytes": len(text.encode("utf-8")),
+            "last_accessed_at": timezone.now(),
+        },
+    )
+    evict_transcripts()
+
+
+def evict_transcripts(max_bytes: Optional[int] = None) -> int:
+    """Delete least recently used transcripts until under the limit."""
+    if max_bytes is None:
+        max_bytes = settings.TRANSCRIPT_CACHE_MAX_BYTES
+    total = Transcript.objects.aggregate(total=Sum("size_bytes"))["total"] or 0
+    if total <= max_bytes:
+        return 0
+    stale_ids = []
+    entries = Transcript.objects.order_by("last_accessed_at", "id")
+    for entry_id, size in entries.values_list("id", "size_bytes").iterator():
+        if total <= max_bytes:
+            break
+        stale_ids.append(entry_id)
+        total -= size
+    deleted, _ = Transcript.objects.filter(id__in=stale_ids).delete()
+    return deleted
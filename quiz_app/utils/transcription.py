@@ -2,24 +2,220 @@
 
 from __future__ import annotations
 
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Callable, Optional
 
-import whisper
+import numpy as np
+from django.conf import settings
+from whisper.audio import SAMPLE_RATE
 
-_MODEL: Optional[whisper.Whisper] = None
+from quiz_app.utils.audio_preprocessing import trim_silence_with_settings
+from quiz_app.utils.audio_stream import iter_pcm_chunks
+from quiz_app.utils.transcription_backends import get_transcription_backend
 
+_END_OF_STREAM = object()
+PROMPT_TAIL_CHARS = 200
+STITCH_WINDOW_WORDS = 60
+STITCH_MIN_MATCH_WORDS = 3
 
-def get_whisper_model() -> whisper.Whisper:
-    """Lazily load and cache the Whisper model instance."""
-    global _MODEL
-    if _MODEL is None:
-        _MODEL = whisper.load_model("tiny")
-    return _MODEL
 
+def transcribe_audio(
+    audio: str | Path | np.ndarray,
+    on_progress: Optional[Callable[..., None]] = None,
+) -> str:
+    """Transcribe a file or 16 kHz waveform with the configured backend.
 
-def transcribe_audio(audio_path: str | Path) -> str:
-    """Transcribe an audio file into text using Whisper."""
-    model = get_whisper_model()
-    result = model.transcribe(str(audio_path))
-    return result.get("text", "").strip()
\ No newline at end of file
+    ``on_progress`` is called with ``percent=`` in the calling thread.
+    """
+    if isinstance(audio, np.ndarray):
+        window = settings.TRANSCRIPTION_WINDOW_SECONDS * SAMPLE_RATE
+        if audio.size > window * 1.5:
+            return transcribe_long_audio(audio, on_progress)
+        text = get_transcription_backend().transcribe(audio) if audio.size else ""
+    else:
+        text = get_transcription_backend().transcribe(str(audio))
+    if on_progress is not None:
+        on_progress(percent=100.0)
+    return text
+
+
+def transcribe_long_audio(
+    samples: np.ndarray,
+    on_progress: Optional[Callable[..., None]] = None,
+) -> str:
+    """Transcribe overlapping windows concurrently and stitch the text.
+
+    The number of concurrent windows per job is capped by
+    TRANSCRIPTION_MAX_WORKERS_PER_JOB and by the backend's capacity
+    (WHISPER_POOL_SIZE or TRANSCRIPTION_WORKERS). The job already runs,
+    so its windows wait for a model or slot without a timeout.
+    """
+    windows = split_into_windows(
+        samples,
+        settings.TRANSCRIPTION_WINDOW_SECONDS,
+        settings.TRANSCRIPTION_WINDOW_OVERLAP_SECONDS,
+    )
+    backend = get_transcription_backend()
+    workers = max(
+        1,
+        min(
+            settings.TRANSCRIPTION_MAX_WORKERS_PER_JOB,
+            backend.capacity,
+            len(windows),
+        ),
+    )
+    executor = ThreadPoolExecutor(
+        max_workers=workers,
+        thread_name_prefix="whisper-window",
+    )
+    texts = [""] * len(windows)
+    with executor:
+        futures = {
+            executor.submit(backend.transcribe, window, wait=True): index
+            for index, window in enumerate(windows)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            texts[futures[future]] = future.result()
+            if on_progress is not None:
+                on_progress(percent=round(100 * done / len(windows), 1))
+    return stitch_transcripts(texts)
+
+
+def split_into_windows(
+    samples: np.ndarray,
+    window_seconds: float,
+    overlap_seconds: float,
+) -> list[np.ndarray]:
+    """Cut audio into windows that overlap by ``overlap_seconds``."""
+    window = int(window_seconds * SAMPLE_RATE)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    starts = range(0, max(1, samples.size - overlap), window - overlap)
+    return [samples[start:start + window] for start in starts]
+
+
+def stitch_transcripts(texts: list[str]) -> str:
+    """Join window transcripts, dropping words repeated in the overlap."""
+    words: list[str] = []
+    for text in texts:
+        words = _merge_overlap(words, text.split())
+    return " ".join(words)
+
+
+def _merge_overlap(left: list[str], right: list[str]) -> list[str]:
+    """Merge two word lists at the longest common run near their seam."""
+    tail = left[-STITCH_WINDOW_WORDS:]
+    head = right[:STITCH_WINDOW_WORDS]
+    matcher = SequenceMatcher(
+        None,
+        [_normalize_word(word) for word in tail],
+        [_normalize_word(word) for word in head],
+        autojunk=False,
+    )
+    match = matcher.find_longest_match(0, len(tail), 0, len(head))
+    if match.size < STITCH_MIN_MATCH_WORDS:
+        return left + right
+    cut = len(left) - len(tail) + match.a
+    return left[:cut] + right[match.b:]
+
+
+def _normalize_word(word: str) -> str:
+    """Compare words case-insensitively and without punctuation."""
+    return re.sub(r"\W", "", word.lower())
+
+
+def transcribe_pcm_stream(
+    stream: BinaryIO,
+    on_progress: Optional[Callable[..., None]] = None,
+) -> str:
+    """Transcribe PCM audio chunk by chunk while the stream is still read.
+
+    A reader thread keeps draining the stream into a bounded queue, so
+    network I/O and decoding continue while Whisper works on a chunk.
+    The total length is unknown up front, so ``on_progress`` receives
+    the ``seconds=`` of audio transcribed so far.
+    """
+    chunks: queue.Queue = queue.Queue(
+        maxsize=settings.STREAMING_MAX_BUFFERED_CHUNKS
+    )
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=_read_chunks,
+        args=(stream, chunks, stop),
+        name="pcm-reader",
+        daemon=True,
+    )
+    reader.start()
+    try:
+        return _transcribe_chunks(chunks, on_progress)
+    except BaseException:
+        # The reader may be blocked on a stalled download; aborting the
+        # source (PcmStream kills FFmpeg) turns that read into EOF.
+        abort = getattr(stream, "abort", None)
+        if abort is not None:
+            abort()
+        raise
+    finally:
+        stop.set()
+        reader.join()
+
+
+def _read_chunks(stream: BinaryIO, chunks: queue.Queue, stop: threading.Event) -> None:
+    """Producer loop that pushes PCM chunks, then an end marker or error."""
+    try:
+        chunk_seconds = settings.STREAMING_CHUNK_SECONDS
+        for chunk in iter_pcm_chunks(stream, chunk_seconds):
+            if not _put_unless_stopped(chunks, chunk, stop):
+                return
+        item = _END_OF_STREAM
+    except Exception as error:
+        item = error
+    _put_unless_stopped(chunks, item, stop)
+
+
+def _put_unless_stopped(chunks: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put an item without blocking forever once the consumer gave up."""
+    while not stop.is_set():
+        try:
+            chunks.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _transcribe_chunks(
+    chunks: queue.Queue,
+    on_progress: Optional[Callable[..., None]] = None,
+) -> str:
+    """Consume queued chunks and join their transcripts in order."""
+    texts: list[str] = []
+    seconds = 0.0
+    while True:
+        item = chunks.get()
+        if item is _END_OF_STREAM:
+            break
+        if isinstance(item, Exception):
+            raise item
+        text = _transcribe_chunk(item, texts[-1] if texts else "")
+        if text:
+            texts.append(text)
+        seconds += item.size / SAMPLE_RATE
+        if on_progress is not None:
+            on_progress(seconds=round(seconds, 1))
+    return " ".join(texts)
+
+
+def _transcribe_chunk(samples: np.ndarray, previous: str) -> str:
+    """Transcribe one chunk, priming Whisper with the preceding text."""
+    if settings.AUDIO_VAD_ENABLED:
+        samples = trim_silence_with_settings(samples)
+    if not samples.size:
+        return ""
+    prompt = previous[-PROMPT_TAIL_CHARS:] or None
+    backend = get_transcription_backend()
+    return backend.transcribe(samples, initial_prompt=prompt)
@@ -0,0 +1,193 @@
+"""Pluggable backends that run Whisper inference for the pipeline."""
+
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+import numpy as np
+import torch
+import whisper
+from django.conf import settings
+
+from quiz_app.utils.whisper_pool import default_threads_per_model, get_model_pool
+
+AudioInput = str | np.ndarray
+
+
+class TranscriptionError(RuntimeError):
+    """Base class for failures of a transcription backend."""
+
+
+class TranscriptionBusyError(TranscriptionError):
+    """Raised when the submission queue stays full for too long."""
+
+
+class TranscriptionTimeoutError(TranscriptionError):
+    """Raised when a transcription does not finish within its deadline."""
+
+
+class InlineTranscriptionBackend:
+    """Run Whisper in the calling thread with a model from the pool."""
+
+    @property
+    def capacity(self) -> int:
+        """Number of transcriptions that can run at the same time."""
+        return get_model_pool().size
+
+    def transcribe(
+        self,
+        audio: AudioInput,
+        *,
+        wait: bool = False,
+        **options: Any,
+    ) -> str:
+        """Transcribe audio with a pooled model and return plain text.
+
+        With ``wait`` the call waits for a model without
+        WHISPER_CHECKOUT_TIMEOUT, e.g. for windows of a running job.
+        """
+        timeout = None if wait else settings.WHISPER_CHECKOUT_TIMEOUT
+        with get_model_pool().model(timeout) as model:
+            result = model.transcribe(audio, **options)
+        return result.get("text", "").strip()
+
+
+class ProcessPoolTranscriptionBackend:
+    """Run Whisper in worker processes that each hold their own model."""
+
+    def __init__(
+        self,
+        workers: int,
+        max_pending: int,
+        timeout: float,
+        submit_timeout: float,
+        executor_factory: Optional[Callable[[], Executor]] = None,
+    ) -> None:
+        self.capacity = workers
+        self.timeout = timeout
+        self.submit_timeout = submit_timeout
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._new_executor = executor_factory or functools.partial(
+            ProcessPoolExecutor,
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                settings.WHISPER_MODEL_NAME,
+                default_threads_per_model(workers),
+            ),
+        )
+        self._executor = self._new_executor()
+        self._executor_lock = threading.Lock()
+
+    def transcribe(
+        self,
+        audio: AudioInput,
+        *,
+        wait: bool = False,
+        **options: Any,
+    ) -> str:
+        """Submit audio to the pool, waiting for a free slot and the result.
+
+        With ``wait`` the call waits for a slot without the submit
+        timeout, e.g. for windows of a running job. If a worker process
+        dies, the pool is replaced and the audio is submitted once more.
+        """
+        submit_timeout = None if wait else self.submit_timeout
+        for _ in range(2):
+            executor = self._executor
+            try:
+                return self._submit(executor, audio, options, submit_timeout)
+            except BrokenProcessPool as exc:
+                self._replace_executor(executor)
+                error = exc
+        msg = "A transcription worker process died."
+        raise TranscriptionError(msg) from error
+
+    def _submit(
+        self,
+        executor: Executor,
+        audio: AudioInput,
+        options: dict[str, Any],
+        submit_timeout: Optional[float],
+    ) -> str:
+        """Run one submission, holding a slot until the worker is done."""
+        if not self._slots.acquire(timeout=submit_timeout):
+            msg = "Transcription queue is full. Please try again later."
+            raise TranscriptionBusyError(msg)
+        try:
+            future = executor.submit(_transcribe_in_worker, audio, options)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as exc:
+            future.cancel()
+            msg = f"Transcription did not finish within {self.timeout}s."
+            raise TranscriptionTimeoutError(msg) from exc
+
+    def _replace_executor(self, broken: Executor) -> None:
+        """Swap a broken pool for a new one unless another thread did so."""
+        with self._executor_lock:
+            if self._executor is not broken:
+                return
+            self._executor = self._new_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes once running jobs are done."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+TranscriptionBackend = InlineTranscriptionBackend | ProcessPoolTranscriptionBackend
+
+_BACKEND: Optional[TranscriptionBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_transcription_backend() -> TranscriptionBackend:
+    """Return the process-wide backend selected by TRANSCRIPTION_BACKEND."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            _BACKEND = _build_backend(settings.TRANSCRIPTION_BACKEND)
+    return _BACKEND
+
+
+def _build_backend(name: str) -> TranscriptionBackend:
+    """Instantiate a backend by its settings name."""
+    if name == "inline":
+        return InlineTranscriptionBackend()
+    if name == "process":
+        return ProcessPoolTranscriptionBackend(
+            workers=settings.TRANSCRIPTION_WORKERS,
+            max_pending=settings.TRANSCRIPTION_MAX_PENDING,
+            timeout=settings.TRANSCRIPTION_TIMEOUT,
+            submit_timeout=settings.TRANSCRIPTION_SUBMIT_TIMEOUT,
+        )
+    msg = f"Unknown TRANSCRIPTION_BACKEND {name!r}."
+    raise ValueError(msg)
+
+
+_WORKER_MODEL: Optional[whisper.Whisper] = None
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    """Load the model once per worker process and cap its torch threads."""
+    global _WORKER_MODEL
+    torch.set_num_threads(threads)
+    _WORKER_MODEL = whisper.load_model(model_name)
+
+
+def _transcribe_in_worker(audio: AudioInput, options: dict[str, Any]) -> str:
+    """Worker-side entry point; runs inside a pool process."""
+    result = _WORKER_MODEL.transcribe(audio, **options)
+    return result.get("text", "").strip()
@@ -0,0 +1,127 @@
+"""Pool of preloaded Whisper models shared by transcription threads."""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import torch
+import whisper
+from django.conf import settings
+
+
+class WhisperModelPool:
+    """Hand out up to ``size`` Whisper models, one per concurrent caller."""
+
+    def __init__(
+        self,
+        model_name: str,
+        size: int,
+        threads_per_model: int,
+        loader: Callable[[str], whisper.Whisper] = whisper.load_model,
+    ) -> None:
+        self.model_name = model_name
+        self.size = max(1, size)
+        self.threads_per_model = threads_per_model
+        self._loader = loader
+        self._idle: deque = deque()
+        self._waiters: deque = deque()
+        self._created = 0
+        self._lock = threading.Condition()
+
+    def warm_up(self) -> None:
+        """Load every missing instance now instead of on first use."""
+        while self._reserve_slot():
+            self.release(self._load())
+
+    def checkout(self, timeout: Optional[float] = None) -> whisper.Whisper:
+        """Take an idle model, loading a new one while below pool size.
+
+        Callers are served in arrival order: a thread returning a model
+        cannot take it back while others are already waiting.
+        """
+        ticket = object()
+        with self._lock:
+            self._waiters.append(ticket)
+            try:
+                available = self._lock.wait_for(
+                    lambda: self._waiters[0] is ticket
+                    and (self._idle or self._created < self.size),
+                    timeout,
+                )
+                if not available:
+                    msg = "No Whisper model became available in time."
+                    raise TimeoutError(msg)
+                if self._idle:
+                    return self._idle.popleft()
+                self._created += 1
+            finally:
+                self._waiters.remove(ticket)
+                self._lock.notify_all()
+        return self._load()
+
+    def release(self, model: whisper.Whisper) -> None:
+        """Return a model obtained from checkout to the pool."""
+        with self._lock:
+            self._idle.append(model)
+            self._lock.notify_all()
+
+    @contextmanager
+    def model(self, timeout: Optional[float] = None) -> Iterator[whisper.Whisper]:
+        """Check out a model for the duration of a with block."""
+        model = self.checkout(timeout)
+        try:
+            yield model
+        finally:
+            self.release(model)
+
+    def _reserve_slot(self) -> bool:
+        """Claim the right to load one more instance, if any are left."""
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _load(self) -> whisper.Whisper:
+        """Load one model, giving the slot back if loading fails."""
+        try:
+            return self._loader(self.model_name)
+        except BaseException:
+            with self._lock:
+                self._created -= 1
+                self._lock.notify_all()
+            raise
+
+
+_POOL: Optional[WhisperModelPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_model_pool() -> WhisperModelPool:
+    """Return the process-wide pool configured from settings."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            size = settings.WHISPER_POOL_SIZE
+            _POOL = WhisperModelPool(
+                model_name=settings.WHISPER_MODEL_NAME,
+                size=size,
+                threads_per_model=default_threads_per_model(size),
+            )
+            # torch's intra-op thread count is a process-wide setting; every
+            # thread running a forward pass uses that many workers. Set it
+            # once so ``size`` concurrent models together use about all cores.
+            torch.set_num_threads(_POOL.threads_per_model)
+    return _POOL
+
+
+def default_threads_per_model(pool_size: int) -> int:
+    """Split the CPU cores between pool instances unless configured."""
+    configured = settings.WHISPER_THREADS_PER_MODEL
+    if configured > 0:
+        return configured
+    return max(1, (os.cpu_count() or 1) // max(1, pool_size))
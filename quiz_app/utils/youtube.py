@@ -2,10 +2,26 @@
 
 from __future__ import annotations
 
+import logging
+import time
 from pathlib import Path
+from typing import Any, Callable, Optional
 from urllib.parse import parse_qs, urlparse
 
 import yt_dlp
+from django.conf import settings
+from yt_dlp.networking.exceptions import HTTPError, network_exceptions
+from yt_dlp.utils import DownloadCancelled, DownloadError, ExtractorError
+
+from quiz_app.utils.resilience import call_with_retries, get_breaker
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_BREAKER = "YouTube"
+
+
+class YouTubeTimeoutError(DownloadCancelled):
+    """Raised when one yt-dlp call runs longer than YOUTUBE_CALL_TIMEOUT."""
 
 
 def extract_youtube_video_id(raw_url: str) -> str:
@@ -24,13 +40,44 @@ def extract_youtube_video_id(raw_url: str) -> str:
     return video_id
 
 
+def extract_youtube_playlist_id(raw_url: str) -> str:
+    """Extract the ``list`` parameter of a YouTube playlist URL."""
+    parsed = urlparse(raw_url)
+    playlist_id = None
+    if parsed.netloc.lower() in ("www.youtube.com", "youtube.com", "m.youtube.com"):
+        playlist_id = parse_qs(parsed.query).get("list", [None])[0]
+    if not playlist_id:
+        msg = "Could not extract a YouTube playlist ID from the given URL."
+        raise ValueError(msg)
+    return playlist_id
+
+
+def expand_youtube_playlist(raw_url: str, limit: int) -> list[str]:
+    """Return canonical URLs of up to ``limit`` videos of a playlist.
+
+    Uses yt-dlp's flat extraction, so only the playlist page is fetched.
+    """
+    playlist_id = extract_youtube_playlist_id(raw_url)
+    playlist_url = f"https://www.youtube.com/playlist?list={playlist_id}"
+    ydl_opts = {"quiet": True, "extract_flat": "in_playlist", "playlistend": limit}
+    info = extract_video_info(playlist_url, ydl_opts, download=False)
+    entries = [entry for entry in info.get("entries") or [] if entry and entry.get("id")]
+    return [build_canonical_youtube_url(entry["id"]) for entry in entries[:limit]]
+
+
 def build_canonical_youtube_url(video_id: str) -> str:
     """Build the canonical YouTube URL used in the database."""
     return f"https://www.youtube.com/watch?v={video_id}"
 
 
-def download_youtube_audio(raw_url: str) -> tuple[Path, str]:
-    """Download the best audio stream of a YouTube video."""
+def download_youtube_audio(
+    raw_url: str,
+    on_progress: Optional[Callable[..., None]] = None,
+) -> tuple[Path, str]:
+    """Download the best audio stream of a YouTube video.
+
+    ``on_progress`` is called with ``percent=`` while bytes arrive.
+    """
     video_id = extract_youtube_video_id(raw_url)
     canonical_url = build_canonical_youtube_url(video_id)
     tmp_dir = Path("tmp/audio")
@@ -38,7 +85,101 @@ def download_youtube_audio(raw_url: str) -> tuple[Path, str]:
     tmp_filename = str(tmp_dir / f"{video_id}.%(ext)s")
     ydl_opts = {"format": "bestaudio/best", "outtmpl": tmp_filename,
                 "quiet": True, "noplaylist": True}
+    if on_progress is not None:
+        ydl_opts["progress_hooks"] = [_download_progress_hook(on_progress)]
+    info = extract_video_info(canonical_url, ydl_opts, download=True)
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(canonical_url, download=True)
         audio_file = Path(ydl.prepare_filename(info))
-    return audio_file, canonical_url
\ No newline at end of file
+    return audio_file, canonical_url
+
+
+def _download_progress_hook(on_progress: Callable[..., None]) -> Callable:
+    """Translate yt-dlp progress dicts into percent callbacks."""
+
+    def hook(status: dict[str, Any]) -> None:
+        total = status.get("total_bytes") or status.get("total_bytes_estimate")
+        if status.get("status") == "finished":
+            on_progress(percent=100.0)
+        elif status.get("status") == "downloading" and total:
+            done = status.get("downloaded_bytes") or 0
+            on_progress(percent=round(min(100.0, 100 * done / total), 1))
+
+    return hook
+
+
+def extract_video_info(
+    url: str,
+    ydl_opts: dict[str, Any],
+    *,
+    download: bool,
+) -> dict[str, Any]:
+    """Run yt-dlp with socket and call timeouts, retries and the breaker.
+
+    Each attempt is aborted after YOUTUBE_CALL_TIMEOUT seconds; that
+    counts as a transient failure like a network error.
+    """
+    options = {"socket_timeout": settings.YOUTUBE_SOCKET_TIMEOUT, **ydl_opts}
+
+    def call():
+        deadline = _CallDeadline(settings.YOUTUBE_CALL_TIMEOUT, options.get("logger"))
+        hooks = [*options.get("progress_hooks", []), deadline.check]
+        attempt_options = {**options, "logger": deadline, "progress_hooks": hooks}
+        with yt_dlp.YoutubeDL(attempt_options) as ydl:
+            return ydl.extract_info(url, download=download)
+
+    return call_with_retries(
+        get_breaker(YOUTUBE_BREAKER),
+        call,
+        is_transient=is_transient_youtube_error,
+        attempts=settings.YOUTUBE_RETRY_ATTEMPTS,
+        max_wait=settings.YOUTUBE_RETRY_MAX_WAIT,
+    )
+
+
+class _CallDeadline:
+    """yt-dlp logger and progress hook that abort a call past its deadline.
+
+    yt-dlp logs throughout extraction and calls progress hooks while
+    downloading, so one of them runs often enough to stop a slow call.
+    Messages go to ``output`` if given, else to this module's logger.
+    """
+
+    def __init__(self, seconds: float, output=None) -> None:
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.output = output or logger
+
+    def check(self, *args) -> None:
+        """Raise YouTubeTimeoutError once the deadline has passed."""
+        if time.monotonic() >= self.expires_at:
+            msg = f"yt-dlp call exceeded {self.seconds:g} seconds."
+            raise YouTubeTimeoutError(msg)
+
+    def debug(self, msg: str) -> None:
+        self.check()
+        self.output.debug(msg)
+
+    def info(self, msg: str) -> None:
+        self.check()
+        self.output.info(msg)
+
+    def warning(self, msg: str) -> None:
+        self.check()
+        self.output.warning(msg)
+
+    def error(self, msg: str) -> None:
+        self.output.error(msg)
+
+
+def is_transient_youtube_error(error: BaseException) -> bool:
+    """Return True for timeouts, network errors, rate limits, server errors."""
+    if isinstance(error, YouTubeTimeoutError):
+        return True
+    if not isinstance(error, DownloadError) or not error.exc_info:
+        return False
+    cause = error.exc_info[1]
+    while isinstance(cause, ExtractorError) and cause.cause is not None:
+        cause = cause.cause
+    if isinstance(cause, HTTPError):
+        return cause.status == 429 or cause.status >= 500
+    return isinstance(cause, (*network_exceptions, OSError))
\ No newline at end of file